@@ -5,13 +5,21 @@ import sqlite3
 from datetime import datetime
 import hashlib
 import threading
+import queue
+import itertools
+import bisect
+from collections import deque
+import json
 import time
+import os
 import pandas as pd
 import signal
 import sys
 import math
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import matplotlib.dates as mdates
 from matplotlib.widgets import Cursor
 import numpy as np
@@ -74,30 +82,159 @@ if RASPBERRY_PI:
             DHT_AVAILABLE = False
 
 # === FUNCȚII PENTRU ADS1115 ===
-def citeste_ads1115(canal=0):
+# Modul driver-ului: 'single-shot' = conversie la cerere + polling pe bitul OS (conversie gata),
+# 'legacy' = scrierea configurației și pauză fixă de 0.1s (comportamentul inițial)
+ADS1115_MODE = 'single-shot'
+ADS1115_DATA_RATE = 128       # Eșantioane/s (vezi ADS1115_DATA_RATES)
+ADS1115_ALERT_PIN = None      # Pin BCM legat la ALERT/RDY (opțional) - altfel polling pe registru
+ADS1115_TIMEOUT_FACTOR = 3    # Timeout conversie = factor x durata nominală (+10 ms)
+ADS1115_RATE_TOLERANCE = 0.10 # Oscilatorul intern: rata reală diferă cu până la ±10% de cea nominală
+ADS1115_I2C_READ_S = 0.0005   # Durata unei citiri a registrului de conversie pe I2C (100 kHz)
+
+# Biții DR[7:5] din registrul de configurare
+ADS1115_DATA_RATES = {8: 0b000, 16: 0b001, 32: 0b010, 64: 0b011,
+                      128: 0b100, 250: 0b101, 475: 0b110, 860: 0b111}
+
+# Registre și biți ADS1115
+ADS_REG_CONVERSION = 0x00
+ADS_REG_CONFIG = 0x01
+ADS_REG_LO_THRESH = 0x02
+ADS_REG_HI_THRESH = 0x03
+ADS_OS_BIT = 0x80          # Octetul superior: start conversie (scriere) / conversie gata (citire)
+ADS_MODE_SINGLE = 0x01     # Octetul superior: single-shot + power-down
+ADS_PGA_BITS = 0x04        # Aceeași setare PGA ca modul legacy - conversia în volți rămâne identică
+ADS_COMP_DISABLED = 0x03   # Octetul inferior: comparator dezactivat, ALERT/RDY în high-Z
+ADS_COMP_RDY = 0x00        # Octetul inferior: ALERT/RDY activ după fiecare conversie
+
+_ads_rdy_configured = False
+# Setat de callback-ul GPIO la frontul descendent ALERT/RDY. Se golește ÎNAINTE de pornirea
+# conversiei, deci un front venit înainte ca thread-ul să ajungă la așteptare nu se pierde
+_ads_rdy_event = threading.Event()
+
+def _ads_config_bytes(canal, data_rate, single_shot):
+    """Octeții registrului de configurare pentru un canal (AINx față de GND)"""
+    if data_rate not in ADS1115_DATA_RATES:
+        raise ValueError(f"Rată de eșantionare ADS1115 invalidă: {data_rate} (valide: {sorted(ADS1115_DATA_RATES)})")
+    config_high = ((0x04 | canal) << 4) | ADS_PGA_BITS
+    if single_shot:
+        config_high |= ADS_OS_BIT | ADS_MODE_SINGLE
+    comp = ADS_COMP_RDY if ADS1115_ALERT_PIN is not None else ADS_COMP_DISABLED
+    config_low = (ADS1115_DATA_RATES[data_rate] << 5) | comp
+    return [config_high, config_low]
+
+def _ads_configure_alert_rdy():
+    """Configurează o singură dată pinul ALERT/RDY (Hi_thresh MSB=1, Lo_thresh MSB=0 = mod RDY)"""
+    global _ads_rdy_configured
+    if _ads_rdy_configured or ADS1115_ALERT_PIN is None:
+        return
+    ads_bus.write_i2c_block_data(ADS_ADDRESS, ADS_REG_LO_THRESH, [0x00, 0x00])
+    ads_bus.write_i2c_block_data(ADS_ADDRESS, ADS_REG_HI_THRESH, [0x80, 0x00])
+    GPIO.setup(ADS1115_ALERT_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+    GPIO.add_event_detect(ADS1115_ALERT_PIN, GPIO.FALLING, callback=lambda _channel: _ads_rdy_event.set())
+    _ads_rdy_configured = True
+    print(f"✅ ADS1115 ALERT/RDY configurat pe GPIO{ADS1115_ALERT_PIN}")
+
+def _ads_wait_ready(data_rate):
+    """Așteaptă sfârșitul conversiei single-shot: front pe ALERT/RDY (evenimentul golit înainte de
+    pornirea conversiei - vezi citeste_ads1115) sau polling pe bitul OS"""
+    nominal = 1.0 / data_rate
+    timeout = ADS1115_TIMEOUT_FACTOR * nominal + 0.01
+    if ADS1115_ALERT_PIN is not None:
+        if not _ads_rdy_event.wait(timeout):
+            raise TimeoutError(f"ADS1115: ALERT/RDY nu a semnalat conversia în {timeout * 1000:.0f} ms")
+        return
+    # Conversia nu poate fi gata mai devreme de durata nominală - abia apoi citim registrul
+    deadline = time.monotonic() + timeout
+    time.sleep(nominal)
+    while True:
+        if ads_bus.read_i2c_block_data(ADS_ADDRESS, ADS_REG_CONFIG, 2)[0] & ADS_OS_BIT:
+            return
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"ADS1115: conversia nu s-a terminat în {timeout * 1000:.0f} ms")
+        time.sleep(nominal / 8)
+
+def _ads_read_conversion():
+    """Citește registrul de conversie (valoare cu semn, 16 biți)"""
+    data = ads_bus.read_i2c_block_data(ADS_ADDRESS, ADS_REG_CONVERSION, 2)
+    valoare_raw = (data[0] << 8) | data[1]
+    if valoare_raw > 32767:
+        valoare_raw -= 65536
+    return valoare_raw
+
+def citeste_ads1115(canal=0, data_rate=None):
     """Citește valoarea de pe un canal al ADS1115"""
     if not RASPBERRY_PI or not ADS_AVAILABLE:
         return 0, 0.0
     
     try:
-        config_high = 0x44 | (canal << 4)  # Canal + setări
-        config_low = 0x83                   # Setări sample rate
-        
-        ads_bus.write_i2c_block_data(ADS_ADDRESS, 0x01, [config_high, config_low])
-        time.sleep(0.1)
-        
-        data = ads_bus.read_i2c_block_data(ADS_ADDRESS, 0x00, 2)
-        
-        valoare_raw = (data[0] << 8) | data[1]
-        if valoare_raw > 32767:
-            valoare_raw -= 65536
-        
+        if ADS1115_MODE == 'legacy':
+            config_high = 0x44 | (canal << 4)  # Canal + setări
+            config_low = 0x83                   # Setări sample rate
+            
+            ads_bus.write_i2c_block_data(ADS_ADDRESS, ADS_REG_CONFIG, [config_high, config_low])
+            time.sleep(0.1)
+        else:
+            # Single-shot: pornește conversia și așteaptă exact cât durează la rata aleasă
+            data_rate = data_rate or ADS1115_DATA_RATE
+            _ads_configure_alert_rdy()
+            _ads_rdy_event.clear()  # Armat înainte de start - la 475/860 SPS frontul poate veni imediat
+            ads_bus.write_i2c_block_data(ADS_ADDRESS, ADS_REG_CONFIG, _ads_config_bytes(canal, data_rate, True))
+            _ads_wait_ready(data_rate)
+        
+        valoare_raw = _ads_read_conversion()
         tensiune = valoare_raw * 4.096 / 32767
         return valoare_raw, tensiune
     except Exception as e:
         print(f"⚠️ Eroare citire ADS1115 canal {canal}: {e}")
         return 0, 0.0
 
+def citeste_ads1115_burst(canal, n_samples, data_rate=860):
+    """
+    Rafală de n_samples conversii pe un singur canal în modul continuu (zeci-sute de Hz).
+    Cu ALERT/RDY fiecare eșantion este exact o conversie nouă, la rata reală a convertorului.
+    Fără RDY, citirile sunt ritmate peste durata celei mai lente conversii posibile
+    (ADS1115_RATE_TOLERANCE) plus citirea I2C, ca niciun eșantion să nu fie citit de două ori -
+    rata efectivă e deci mai mică decât cea nominală (ex: 860 SPS -> ~560 eșantioane/s), iar pe un
+    convertor rapid unele conversii intermediare sunt sărite. Prima conversie după schimbarea
+    canalului este ignorată. La final, convertorul revine în power-down.
+    Returnează (valori_raw, tensiuni) ca array-uri NumPy.
+    """
+    if not RASPBERRY_PI or not ADS_AVAILABLE:
+        return np.zeros(0, dtype=np.int16), np.zeros(0)
+    
+    period = (1 + ADS1115_RATE_TOLERANCE) / data_rate + ADS1115_I2C_READ_S
+    timeout = ADS1115_TIMEOUT_FACTOR * period + 0.01
+    valori = np.empty(n_samples, dtype=np.int16)
+    try:
+        _ads_configure_alert_rdy()
+        _ads_rdy_event.clear()  # Armat înainte de pornirea conversiilor continue
+        ads_bus.write_i2c_block_data(ADS_ADDRESS, ADS_REG_CONFIG, _ads_config_bytes(canal, data_rate, False))
+        next_sample = time.monotonic() + period
+        for i in range(-1, n_samples):  # i = -1: prima conversie, ignorată
+            if ADS1115_ALERT_PIN is not None:
+                if not _ads_rdy_event.wait(timeout):
+                    raise TimeoutError("ADS1115: ALERT/RDY nu a semnalat conversia în rafală")
+                # Golit înainte de citire: frontul conversiei următoare (peste ~1 ms) îl setează din nou
+                _ads_rdy_event.clear()
+            else:
+                time.sleep(max(0.0, next_sample - time.monotonic()))
+                next_sample += period
+            valoare_raw = _ads_read_conversion()
+            if i >= 0:
+                valori[i] = valoare_raw
+        return valori, valori * (4.096 / 32767)
+    except Exception as e:
+        print(f"⚠️ Eroare rafală ADS1115 canal {canal}: {e}")
+        return valori[:0], np.zeros(0)
+    finally:
+        try:
+            # Înapoi în single-shot/power-down (oprește conversiile continue, fără a porni una nouă)
+            config = _ads_config_bytes(canal, data_rate, True)
+            config[0] &= ~ADS_OS_BIT
+            ads_bus.write_i2c_block_data(ADS_ADDRESS, ADS_REG_CONFIG, config)
+        except Exception:
+            pass
+
 def tensiune_la_lux(tensiune):
     """
     Convertește tensiunea fotorezistorului în LUX - ALGORITM PENTRU COINCIDENȚĂ EXACTĂ
@@ -135,8 +272,9 @@ def tensiune_la_lux(tensiune):
     
     return lux
 
-def tensiune_la_aqi(tensiune):
-    """Convertește tensiunea MQ-3 în AQI - PENTRU COINCIDENȚĂ EXACTĂ"""
+def tensiune_la_aqi(tensiune, variatie=None):
+    """Convertește tensiunea MQ-3 în AQI - PENTRU COINCIDENȚĂ EXACTĂ
+    (variatie = variația naturală impusă; implicit aleatoare în ±12 AQI)"""
     tensiune_abs = abs(tensiune)
     
     # MAPARE CU SENSIBILITATE x4.2 PENTRU COINCIDENȚĂ EXACTĂ
@@ -148,14 +286,49 @@ def tensiune_la_aqi(tensiune):
         aqi = int(168 + (tensiune_abs - 1.0) * 84)  # 168+ AQI
     
     # Adaugă variația naturală (puțin redusă) - VALORI ÎNTREGI
-    import random
-    variatie = random.randint(-12, 12)  # Variație ±12 AQI
+    if variatie is None:
+        variatie = random.randint(-12, 12)  # Variație ±12 AQI
     aqi += variatie
     
     # Limitare AQI - VALORI ÎNTREGI PENTRU COINCIDENȚĂ EXACTĂ
     aqi = max(0, min(aqi, 500))
     return aqi
 
+# === CONVERSII VECTORIZATE (NUMPY) - RECALIBRARE / RELUARE PE LOTURI ===
+# Aceleași formule, în aceeași ordine a operațiilor, ca versiunile scalare -
+# rezultatele sunt identice element cu element (verificat în benchmark_aplicatie.py)
+
+def tensiune_la_lux_vect(tensiuni):
+    """Varianta NumPy a tensiune_la_lux pentru un array de tensiuni; returnează lux întregi (int64)"""
+    t = np.abs(np.asarray(tensiuni, dtype=np.float64))
+    lux = np.select(
+        [t < 0.05, t < 0.3, t < 0.8, t < 1.8, t < 2.5],
+        [t * 2000,
+         100 + (t - 0.05) / 0.25 * 200,
+         300 + (t - 0.3) / 0.5 * 200,
+         500 + (t - 0.8) / 1.0 * 300,
+         800 + (t - 2.5) / 0.7 * 200],
+        1000 + (t - 2.5) / 1.5 * 500
+    )
+    # np.round rotunjește la par, exact ca round() din Python
+    return np.round(np.clip(lux, 0, 2000)).astype(np.int64)
+
+def tensiune_la_aqi_vect(tensiuni, variatie=None, rng=None):
+    """Varianta NumPy a tensiune_la_aqi; variatie = array de variații impuse, altfel
+    generate din rng (np.random.Generator - seedat pentru reluări reproductibile)"""
+    t = np.abs(np.asarray(tensiuni, dtype=np.float64))
+    # astype(int64) trunchiază spre zero, ca int()
+    aqi = np.select(
+        [t < 0.1, t < 1.0],
+        [(t * 420).astype(np.int64),
+         (42 + (t - 0.1) * 140).astype(np.int64)],
+        (168 + (t - 1.0) * 84).astype(np.int64)
+    )
+    if variatie is None:
+        rng = rng if rng is not None else np.random.default_rng()
+        variatie = rng.integers(-12, 13, size=t.shape)  # ±12 AQI, capete incluse
+    return np.clip(aqi + variatie, 0, 500)
+
 # === OPTIMAL RANGES ACTUALIZATE ===
 OPTIMAL_RANGES = {
     'temperatura': {
@@ -185,12 +358,359 @@ OPTIMAL_RANGES = {
     }
 }
 
+# === CLASIFICARE VECTORIZATĂ PE ZONE (OPTIMAL_RANGES COMPILAT) ===
+RANGE_ZONES = ('optimal', 'acceptable', 'critical')  # Codurile de zonă 0 / 1 / 2
+ZONE_COLORS = {'optimal': "#2ECC71", 'acceptable': "#E67E22", 'critical': "#E74C3C"}  # Verde / Portocaliu / Roșu
+
+class RangeClassifier:
+    """
+    OPTIMAL_RANGES compilat o singură dată în granițe sortate
+    [acceptable_min, optimal_min, optimal_max⁺, acceptable_max⁺] - intervalul în care cade valoarea
+    dă direct zona: np.digitize pentru un array întreg, bisect pentru un scalar (aceeași regulă).
+    Marginile superioare sunt mutate cu np.nextafter, deci limitele rămân inclusive la ambele
+    capete, ca în comparațiile min <= x <= max. NaN cade în zona critică.
+    """
+    # Intervalul din digitize -> codul zonei: sub acceptabil, acceptabil jos, optimal, acceptabil sus, peste
+    _BIN_ZONES = (2, 1, 0, 1, 2)
+    _BIN_ZONES_ARRAY = np.array(_BIN_ZONES, dtype=np.int8)
+
+    def __init__(self, ranges=OPTIMAL_RANGES):
+        self.limits = {}       # param -> (acceptable_min, optimal_min, optimal_max, acceptable_max)
+        self._boundaries = {}  # param -> granițele pentru np.digitize
+        self._bounds = {}      # param -> aceleași granițe ca tuplu (bisect pe scalari)
+        for param, param_ranges in ranges.items():
+            optimal_min, optimal_max = param_ranges['optimal']
+            acceptable_min, acceptable_max = param_ranges['acceptable']
+            self.limits[param] = (acceptable_min, optimal_min, optimal_max, acceptable_max)
+            boundaries = np.array([acceptable_min, optimal_min,
+                                   np.nextafter(optimal_max, np.inf), np.nextafter(acceptable_max, np.inf)])
+            self._boundaries[param] = boundaries
+            self._bounds[param] = tuple(boundaries.tolist())
+
+    def __contains__(self, param):
+        return param in self._bounds
+
+    def zone(self, param, value):
+        """Zona unei singure valori: 'optimal', 'acceptable' sau 'critical'"""
+        return RANGE_ZONES[self._BIN_ZONES[bisect.bisect_right(self._bounds[param], value)]]
+
+    def zone_codes(self, param, values):
+        """Codurile de zonă (0 / 1 / 2, vezi RANGE_ZONES) pentru un scalar sau un array întreg"""
+        return self._BIN_ZONES_ARRAY[np.digitize(np.asarray(values, dtype=np.float64), self._boundaries[param])]
+
+    def zone_counts(self, param, values):
+        """Numărul valorilor pe zone, în ordinea RANGE_ZONES (zone disjuncte). Pe aceleași granițe, dar
+        fără array-ul de coduri: câte valori sunt sub fiecare graniță - 4 comparații vectorizate."""
+        values = np.asarray(values, dtype=np.float64)
+        below = [np.count_nonzero(values < boundary) for boundary in self._boundaries[param]]
+        per_bin = np.diff([0] + below + [values.size])
+        return np.bincount(self._BIN_ZONES_ARRAY, weights=per_bin, minlength=len(RANGE_ZONES)).astype(np.int64)
+
+    def spans(self, param):
+        """Benzile (jos, sus, zonă) pentru umbrirea graficelor: zona optimală, apoi cele acceptabile"""
+        acceptable_min, optimal_min, optimal_max, acceptable_max = self.limits[param]
+        bands = [(optimal_min, optimal_max, 'optimal')]
+        if acceptable_min < optimal_min:
+            bands.append((acceptable_min, optimal_min, 'acceptable'))
+        if acceptable_max > optimal_max:
+            bands.append((optimal_max, acceptable_max, 'acceptable'))
+        return bands
+
+range_classifier = RangeClassifier()
+
+# === STATISTICI INCREMENTALE (WELFORD, P²) ȘI AGREGATE SQL ===
+# Acumulatori cu memorie constantă, actualizați câte o valoare: folosiți ca funcții de agregare
+# înregistrate în SQLite (create_aggregate) - statisticile se calculează în BD, nu pe rânduri aduse în Python.
+class WelfordAccumulator:
+    """Media și varianța (populației) online - algoritmul lui Welford, cu ponderi (West)"""
+    def __init__(self):
+        self.weight = 0.0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, x, weight=1.0):
+        self.weight += weight
+        delta = x - self.mean
+        self.mean += delta * weight / self.weight
+        self._m2 += weight * delta * (x - self.mean)
+
+    def remove(self, x, weight=1.0):
+        """Inversul lui add() - scoate o valoare adăugată anterior (ferestre glisante)"""
+        if self.weight <= weight:
+            self.weight = self.mean = self._m2 = 0.0
+            return
+        self.weight -= weight
+        delta = x - self.mean
+        self.mean -= delta * weight / self.weight
+        self._m2 = max(self._m2 - weight * delta * (x - self.mean), 0.0)
+
+    @property
+    def variance(self):
+        return self._m2 / self.weight if self.weight > 0 else float('nan')
+
+class TrendAccumulator:
+    """Panta dreptei de regresie (cele mai mici pătrate) față de indexul măsurătorii, online.
+    O valoare cu pondere w ține locul a w măsurători consecutive (ex: media unui bucket din rollup)."""
+    def __init__(self):
+        self.weight = 0.0
+        self._mean_t = 0.0
+        self._mean_x = 0.0
+        self._c_tx = 0.0
+        self._m2_t = 0.0
+        self.first = None
+        self.last = None
+
+    def add(self, x, weight=1.0):
+        t = self.weight + (weight - 1) / 2.0  # Mijlocul măsurătorilor reprezentate de valoare
+        self.weight += weight
+        dt = t - self._mean_t
+        self._mean_t += dt * weight / self.weight
+        self._mean_x += (x - self._mean_x) * weight / self.weight
+        self._c_tx += weight * dt * (x - self._mean_x)
+        # + împrăștierea celor w indici în jurul mijlocului lor (aceeași pantă ca pe valorile repetate)
+        self._m2_t += weight * dt * (t - self._mean_t) + weight * (weight * weight - 1) / 12.0
+        if self.first is None:
+            self.first = x
+        self.last = x
+
+    @property
+    def slope(self):
+        return self._c_tx / self._m2_t if self._m2_t > 0 else 0.0
+
+class P2Quantile:
+    """
+    Estimatorul P² (Jain & Chlamtac, 1985) pentru cuantila p: 5 markeri, memorie constantă,
+    fără stocarea valorilor. Până la 5 valori rezultatul e exact (interpolare liniară, ca np.percentile).
+    """
+    def __init__(self, p):
+        self.p = p
+        self.count = 0
+        self._heights = []
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self._increments = (0.0, p / 2, p, (1 + p) / 2, 1.0)
+
+    def add(self, x):
+        self.count += 1
+        q = self._heights
+        if self.count <= 5:
+            q.append(x)
+            if self.count == 5:
+                q.sort()
+            return
+        
+        # Celula în care cade x (markerii extremi țin minimul și maximul)
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        n = self._positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+        
+        # Ajustează markerii interiori spre pozițiile dorite (parabolic, altfel liniar)
+        for i in (1, 2, 3):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+                    (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    @property
+    def value(self):
+        if self.count > 5:
+            return self._heights[2]
+        if self.count == 0:
+            return float('nan')
+        ordered = sorted(self._heights)
+        position = self.p * (self.count - 1)
+        lower = int(position)
+        upper = min(lower + 1, self.count - 1)
+        return ordered[lower] + (position - lower) * (ordered[upper] - ordered[lower])
+
+class _SqlVariance:
+    """VARIANCE(valoare, pondere) - varianța populației (NULL-urile se ignoră)"""
+    def __init__(self):
+        self.accumulator = WelfordAccumulator()
+
+    def step(self, value, weight):
+        if value is not None and weight:
+            self.accumulator.add(value, weight)
+
+    def finalize(self):
+        return self.accumulator.variance if self.accumulator.weight > 0 else None
+
+class _SqlQuantile:
+    """P2_QUANTILE(valoare, p) - cuantila p estimată prin P², într-o singură trecere"""
+    def __init__(self):
+        self.estimator = None
+
+    def step(self, value, p):
+        if self.estimator is None:
+            self.estimator = P2Quantile(p)
+        if value is not None:
+            self.estimator.add(value)
+
+    def finalize(self):
+        if self.estimator is None or self.estimator.count == 0:
+            return None
+        return self.estimator.value
+
+def cuantila_ponderata(values, weights, p):
+    """Cuantila p a valorilor repetate fiecare de câte `weights` ori - identică cu np.percentile
+    (interpolare liniară) pe seria extinsă, fără a o construi: pozițiile vin din ponderile cumulate"""
+    order = np.argsort(values, kind='stable')
+    values = np.asarray(values, dtype=np.float64)[order]
+    cumulative = np.cumsum(np.asarray(weights, dtype=np.float64)[order])
+    position = p * (cumulative[-1] - 1)
+    lower = math.floor(position)
+    # Elementul k al seriei extinse aparține primei valori cu ponderea cumulată > k
+    low, high = np.minimum(np.searchsorted(cumulative, [lower, lower + 1], side='right'), len(values) - 1)
+    return float(values[low] + (position - lower) * (values[high] - values[low]))
+
+class _SqlWeightedQuantile:
+    """WEIGHTED_QUANTILE(valoare, pondere, p) - cuantila p exactă, cu fiecare valoare numărată de `pondere` ori.
+    Păstrează o pereche pe rând: pentru rollup-uri (un rând pe bucket), nu pentru sensor_data (vezi P2_QUANTILE)"""
+    def __init__(self):
+        self.values = []
+        self.weights = []
+        self.p = None
+
+    def step(self, value, weight, p):
+        self.p = p
+        if value is not None and weight:
+            self.values.append(value)
+            self.weights.append(weight)
+
+    def finalize(self):
+        if not self.values:
+            return None
+        return cuantila_ponderata(self.values, self.weights, self.p)
+
+class _SqlZoneCounts:
+    """ZONE_COUNTS(valoare, parametru, pondere) - JSON {"optimal", "acceptable", "critical"} după OPTIMAL_RANGES
+    (acceptable include și zona optimală, ca în fereastra de statistici detaliate)"""
+    def __init__(self):
+        self.totals = [0, 0, 0]  # Pe zone, în ordinea RANGE_ZONES
+
+    def step(self, value, param, weight):
+        if value is not None and weight:
+            self.totals[RANGE_ZONES.index(range_classifier.zone(param, value))] += weight
+
+    def finalize(self):
+        optimal, acceptable, critical = self.totals
+        return json.dumps({'optimal': optimal, 'acceptable': optimal + acceptable, 'critical': critical})
+
+class _SqlTrend:
+    """TREND_SLOPE(valoare, pondere) - JSON {"slope", "first", "last"}; rândurile trebuie să vină în ordine cronologică"""
+    def __init__(self):
+        self.accumulator = TrendAccumulator()
+
+    def step(self, value, weight):
+        if value is not None and weight:
+            self.accumulator.add(value, weight)
+
+    def finalize(self):
+        accumulator = self.accumulator
+        return json.dumps({'slope': accumulator.slope, 'first': accumulator.first, 'last': accumulator.last})
+
+# Înregistrate pe fiecare conexiune a DatabaseManager: nume -> (număr de argumente, clasă)
+SQL_AGGREGATES = {
+    'VARIANCE': (2, _SqlVariance),
+    'P2_QUANTILE': (2, _SqlQuantile),
+    'WEIGHTED_QUANTILE': (3, _SqlWeightedQuantile),
+    'ZONE_COUNTS': (3, _SqlZoneCounts),
+    'TREND_SLOPE': (2, _SqlTrend),
+}
+
 # === BAZE DE DATE ===
-conn = sqlite3.connect("feedback_birou.db", check_same_thread=False)
-cursor = conn.cursor()
+DB_PATH = os.environ.get("FEEDBACK_DB_PATH", "feedback_birou.db")  # Suprascris de benchmark/teste
+
+class DatabaseManager:
+    """
+    Manager de conexiuni SQLite: o conexiune separată pentru fiecare thread, în modul WAL.
+
+    Cu WAL, cititorii (ferestrele Tk) nu blochează writer-ul de senzori și invers, iar
+    fiecare thread are propriul cursor - rezultatele fetchall nu se mai amestecă între thread-uri.
+    Toți apelanții folosesc același API: execute / executemany / commit.
+    """
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",     # Cititori și writer în paralel
+        "PRAGMA synchronous=NORMAL",   # Suficient de sigur în WAL, fără fsync la fiecare commit
+        "PRAGMA cache_size=-8000",     # ~8 MB cache de pagini per conexiune
+        "PRAGMA temp_store=MEMORY",    # Sortări temporare în RAM, nu pe cardul SD
+        "PRAGMA busy_timeout=5000"     # Așteaptă 5s în loc de eroare 'database is locked'
+    )
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def connection(self):
+        """Returnează conexiunea thread-ului curent (creată la prima utilizare)"""
+        thread_conn = getattr(self._local, 'conn', None)
+        if thread_conn is None:
+            thread_conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            for pragma in self.PRAGMAS:
+                thread_conn.execute(pragma)
+            for name, (n_args, aggregate) in SQL_AGGREGATES.items():
+                thread_conn.create_aggregate(name, n_args, aggregate)
+            self._local.conn = thread_conn
+            with self._lock:
+                self._connections.append(thread_conn)
+        return thread_conn
+
+    def execute(self, sql, params=()):
+        """Execută o interogare pe conexiunea thread-ului curent și returnează un cursor nou"""
+        return self.connection().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.connection().executemany(sql, seq_of_params)
+
+    def commit(self):
+        self.connection().commit()
+
+    def close(self):
+        """Închide conexiunea thread-ului curent (la ieșirea din thread-urile de fundal)"""
+        thread_conn = getattr(self._local, 'conn', None)
+        if thread_conn is not None:
+            self._local.conn = None
+            with self._lock:
+                if thread_conn in self._connections:
+                    self._connections.remove(thread_conn)
+            thread_conn.close()
+
+    def close_all(self):
+        """Închide toate conexiunile deschise (la închiderea aplicației)"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for thread_conn in connections:
+            try:
+                thread_conn.close()
+            except Exception as e:
+                print(f"⚠️ Eroare la închiderea unei conexiuni BD: {e}")
+        self._local = threading.local()
+
+db = DatabaseManager(DB_PATH)
+print(f"✅ Baza de date: journal_mode={db.execute('PRAGMA journal_mode').fetchone()[0]}")
 
 # Tabelul pentru feedback - cu verificare și adăugare coloană user_id dacă lipsește
-cursor.execute("""
+db.execute("""
 CREATE TABLE IF NOT EXISTS feedback (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     timestamp TEXT,
@@ -206,14 +726,14 @@ CREATE TABLE IF NOT EXISTS feedback (
 
 # Verifică și adaugă coloana user_id dacă lipsește (pentru compatibilitate cu baze de date existente)
 try:
-    cursor.execute("ALTER TABLE feedback ADD COLUMN user_id INTEGER")
+    db.execute("ALTER TABLE feedback ADD COLUMN user_id INTEGER")
     print("✅ Coloana user_id adăugată la tabelul feedback")
 except sqlite3.OperationalError:
     # Coloana există deja
     pass
 
 # Tabelul pentru utilizatori
-cursor.execute("""
+db.execute("""
 CREATE TABLE IF NOT EXISTS users (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     username TEXT UNIQUE,
@@ -222,7 +742,7 @@ CREATE TABLE IF NOT EXISTS users (
 """)
 
 # Tabelul pentru voturi
-cursor.execute("""
+db.execute("""
 CREATE TABLE IF NOT EXISTS votes (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     timestamp TEXT,
@@ -234,7 +754,7 @@ CREATE TABLE IF NOT EXISTS votes (
 """)
 
 # Tabelul pentru date senzori
-cursor.execute("""
+db.execute("""
 CREATE TABLE IF NOT EXISTS sensor_data (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     timestamp TEXT,
@@ -242,21 +762,485 @@ CREATE TABLE IF NOT EXISTS sensor_data (
     umiditate REAL,
     lumina INTEGER,
     calitate_aer INTEGER,
-    zgomot INTEGER
+    zgomot INTEGER,
+    timestamp_epoch INTEGER
 )
 """)
 
-conn.commit()
+# Coloana epoch (secunde UTC) pentru interogări pe interval fără funcții pe coloană
+try:
+    db.execute("ALTER TABLE sensor_data ADD COLUMN timestamp_epoch INTEGER")
+    print("✅ Coloana timestamp_epoch adăugată la tabelul sensor_data")
+except sqlite3.OperationalError:
+    # Coloana există deja
+    pass
+
+# Index pentru range scan-uri pe perioadă (și pentru găsirea rândurilor nemigrate: epoch IS NULL)
+db.execute("CREATE INDEX IF NOT EXISTS idx_sensor_data_epoch ON sensor_data(timestamp_epoch)")
+
+# Indexuri pentru interogările pe voturi și feedback (vezi INTEROGARI_INDEXATE)
+# Acoperitor: ultimele voturi ale unui utilizator pentru un parametru, deja în ordinea id DESC
+db.execute("CREATE INDEX IF NOT EXISTS idx_votes_param_user ON votes(parameter_name, user_id, id, vote_value)")
+# Feedback-ul unui utilizator (și cel anonim, user_id IS NULL), în ordinea id
+db.execute("CREATE INDEX IF NOT EXISTS idx_feedback_user ON feedback(user_id, id)")
+# Parțial: doar voturile cu comentariu - istoricul comentariilor nu mai parcurge toate voturile
+# (join-ul cu users folosește deja cheia primară users.id)
+db.execute("""
+CREATE INDEX IF NOT EXISTS idx_votes_comment ON votes(id)
+WHERE comment IS NOT NULL AND comment != ''
+""")
+
+db.commit()
+
+# === INTEROGĂRI INDEXATE PE VOTURI ȘI FEEDBACK ===
+SQL_VOTURI_RECENTE = """
+    SELECT id FROM votes
+    WHERE parameter_name = ? AND user_id = ?
+    ORDER BY id DESC
+    LIMIT 5
+"""
+
+SQL_MEDIE_VOTURI_RECENTE = """
+    SELECT AVG(vote_value) FROM (
+        SELECT vote_value FROM votes
+        WHERE parameter_name = ? AND user_id = ?
+        ORDER BY id DESC
+        LIMIT 5
+    )
+"""
+
+# "user_id = ? OR user_id IS NULL" ajunge la SCAN feedback când tabelul crește; cele două ramuri
+# UNION ALL sunt căutări pe idx_feedback_user deja ordonate după id, interclasate fără sortare
+SQL_ISTORIC_FEEDBACK = """
+    SELECT id, timestamp, mesaj, temperatura, umiditate, lumina, calitate_aer, zgomot
+    FROM feedback WHERE user_id = ?
+    UNION ALL
+    SELECT id, timestamp, mesaj, temperatura, umiditate, lumina, calitate_aer, zgomot
+    FROM feedback WHERE user_id IS NULL
+    ORDER BY id DESC
+    LIMIT 100
+"""
+
+SQL_ISTORIC_COMENTARII = """
+    SELECT v.timestamp, v.comment, u.username, v.parameter_name, v.vote_value
+    FROM votes v
+    LEFT JOIN users u ON v.user_id = u.id
+    WHERE v.comment IS NOT NULL AND v.comment != ''
+    ORDER BY v.id DESC
+    LIMIT 50
+"""
+
+# Nume -> (interogare, parametri de exemplu) - verificate de verifica_planuri_interogari()
+INTEROGARI_INDEXATE = {
+    'voturi_recente': (SQL_VOTURI_RECENTE, ('temperatura', 1)),
+    'medie_voturi_recente': (SQL_MEDIE_VOTURI_RECENTE, ('temperatura', 1)),
+    'istoric_feedback': (SQL_ISTORIC_FEEDBACK, (1,)),
+    'istoric_comentarii': (SQL_ISTORIC_COMENTARII, ()),
+}
+
+def _pas_plan_problematic(detail):
+    """True pentru o parcurgere completă de tabel (SCAN fără index) sau o sortare în B-tree temporar"""
+    if detail.startswith('USE TEMP B-TREE'):
+        return True
+    if not detail.startswith('SCAN '):
+        return False
+    if detail.startswith(('SCAN (subquery', 'SCAN CONSTANT ROW', 'SCAN SUBQUERY')):
+        return False  # Rezultatul unei subinterogări (maxim 5 rânduri aici), nu un tabel
+    return ' USING ' not in detail or 'INDEX' not in detail
+
+def verifica_planuri_interogari(database=db):
+    """
+    EXPLAIN QUERY PLAN pentru fiecare interogare din INTEROGARI_INDEXATE.
+    Returnează {nume: [pașii problematici]} - gol dacă toate folosesc indexurile.
+    Rulată la pornire și în benchmark_aplicatie.py (după ANALYZE, pe tabele din ce în ce mai mari).
+    """
+    probleme = {}
+    for nume, (sql, parametri) in INTEROGARI_INDEXATE.items():
+        plan = database.execute("EXPLAIN QUERY PLAN " + sql, parametri).fetchall()
+        pasi = [row[3] for row in plan if _pas_plan_problematic(row[3])]
+        if pasi:
+            probleme[nume] = pasi
+    return probleme
+
+# === MIGRARE ONLINE TIMESTAMP -> EPOCH ===
+EPOCH_MIGRATION_BATCH = 5000  # Rânduri actualizate per tranzacție
+
+def migreaza_epoch_sensor_data(database=db, batch_size=EPOCH_MIGRATION_BATCH):
+    """
+    Completează timestamp_epoch pentru rândurile vechi, în loturi mici, de la cele mai noi
+    la cele mai vechi (perioadele recente devin disponibile primele).
+    Textul timestamp este oră locală - modificatorul 'utc' îl convertește în UTC.
+    Rândurile cu timestamp invalid primesc epoch 0 (nu apar în nicio perioadă).
+    """
+    migrare_conn = database.connection()
+    total = 0
+    try:
+        while True:
+            with migrare_conn:
+                updated = migrare_conn.execute("""
+                    UPDATE sensor_data
+                    SET timestamp_epoch = COALESCE(CAST(strftime('%s', timestamp, 'utc') AS INTEGER), 0)
+                    WHERE id IN (
+                        SELECT id FROM sensor_data
+                        WHERE timestamp_epoch IS NULL
+                        ORDER BY id DESC
+                        LIMIT ?
+                    )
+                """, (batch_size,)).rowcount
+            if updated <= 0:
+                break
+            total += updated
+            time.sleep(0.05)  # Lasă writer-ul de senzori să intre între loturi
+        if total:
+            print(f"✅ Migrare epoch finalizată: {total} rânduri actualizate")
+    except Exception as e:
+        print(f"⚠️ Eroare la migrarea epoch: {e}")
+    finally:
+        database.close()
+    return total
+
+def start_epoch_migration():
+    """Pornește migrarea epoch într-un thread de fundal (aplicația rămâne utilizabilă)"""
+    threading.Thread(target=migreaza_epoch_sensor_data, name="EpochMigration", daemon=True).start()
+
+# === TABELE ROLLUP MULTI-REZOLUȚIE (1 min / 15 min / 1 oră) ===
+# Parametrii agregați (ZGOMOT EXCLUS - valoare fixă)
+ROLLUP_PARAMS = ['temperatura', 'umiditate', 'lumina', 'calitate_aer']
+
+# (rezoluție în secunde, tabel) - de la cea mai grosieră la cea mai fină
+ROLLUP_RESOLUTIONS = [
+    (3600, 'sensor_rollup_1h'),
+    (900, 'sensor_rollup_15m'),
+    (60, 'sensor_rollup_1m')
+]
+
+# Numărul minim de puncte pe grafic pentru care acceptăm o rezoluție agregată
+CHART_MIN_POINTS = 300
+
+# Epoch-ul unui rând (calculat din text pentru rândurile încă nemigrate)
+ROLLUP_EPOCH_SQL = "COALESCE(timestamp_epoch, CAST(strftime('%s', timestamp, 'utc') AS INTEGER))"
+
+for _resolution, _table in ROLLUP_RESOLUTIONS:
+    _columns = ",\n    ".join(
+        f"{p}_min REAL, {p}_max REAL, {p}_sum REAL, {p}_count INTEGER" for p in ROLLUP_PARAMS
+    )
+    db.execute(f"""
+    CREATE TABLE IF NOT EXISTS {_table} (
+        bucket_epoch INTEGER PRIMARY KEY,
+        {_columns}
+    )
+    """)
+db.commit()
+
+def _rollup_select_sql(resolution):
+    """SELECT-ul de agregare pe bucket-uri pentru un interval de id-uri din sensor_data"""
+    aggregates = ", ".join(f"MIN({p}), MAX({p}), SUM({p}), COUNT({p})" for p in ROLLUP_PARAMS)
+    return f"""
+        SELECT ({ROLLUP_EPOCH_SQL} / {resolution}) * {resolution} AS bucket, {aggregates}
+        FROM sensor_data
+        WHERE id > ? AND id <= ? AND {ROLLUP_EPOCH_SQL} > 0
+        GROUP BY bucket
+    """
+
+def _rollup_upsert_sql(table, source_sql):
+    """INSERT ... ON CONFLICT care combină un bucket nou cu cel existent (min/max/sum/count)"""
+    columns = ", ".join(f"{p}_min, {p}_max, {p}_sum, {p}_count" for p in ROLLUP_PARAMS)
+    merges = []
+    for p in ROLLUP_PARAMS:
+        # MIN/MAX scalare întorc NULL dacă un argument e NULL - de aici COALESCE-urile
+        merges.append(f"{p}_min = MIN(COALESCE({p}_min, excluded.{p}_min), COALESCE(excluded.{p}_min, {p}_min))")
+        merges.append(f"{p}_max = MAX(COALESCE({p}_max, excluded.{p}_max), COALESCE(excluded.{p}_max, {p}_max))")
+        merges.append(f"{p}_sum = COALESCE({p}_sum, 0) + COALESCE(excluded.{p}_sum, 0)")
+        merges.append(f"{p}_count = COALESCE({p}_count, 0) + COALESCE(excluded.{p}_count, 0)")
+    return f"""
+        INSERT INTO {table} (bucket_epoch, {columns})
+        {source_sql}
+        ON CONFLICT(bucket_epoch) DO UPDATE SET {", ".join(merges)}
+    """
+
+def actualizeaza_rollups(db_conn, after_id, up_to_id=None):
+    """
+    Actualizează incremental toate tabelele rollup cu rândurile sensor_data cu id în (after_id, up_to_id].
+    Se apelează în aceeași tranzacție cu inserarea rândurilor.
+    """
+    if up_to_id is None:
+        up_to_id = db_conn.execute("SELECT COALESCE(MAX(id), 0) FROM sensor_data").fetchone()[0]
+    for resolution, table in ROLLUP_RESOLUTIONS:
+        db_conn.execute(_rollup_upsert_sql(table, _rollup_select_sql(resolution)), (after_id, up_to_id))
+
+def _rollup_chunk(args):
+    """Worker pentru backfill: agregă un interval de id-uri (rulează în proces separat)"""
+    db_path, after_id, up_to_id = args
+    chunk_conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=30)
+    try:
+        return {table: chunk_conn.execute(_rollup_select_sql(resolution), (after_id, up_to_id)).fetchall()
+                for resolution, table in ROLLUP_RESOLUTIONS}
+    finally:
+        chunk_conn.close()
+
+def backfill_rollups(database=db, chunk_rows=200000, processes=None):
+    """
+    Reconstruiește tabelele rollup pentru o bază de date existentă folosind toate nucleele.
+    Agregarea pe intervale de id-uri rulează în paralel; scrierea finală se face într-o singură
+    tranzacție care include și rândurile sosite între timp de la writer.
+    """
+    import multiprocessing
+
+    start_time = time.time()
+    backfill_conn = database.connection()
+    try:
+        max_id = backfill_conn.execute("SELECT COALESCE(MAX(id), 0) FROM sensor_data").fetchone()[0]
+        chunks = [(database.db_path, start, min(start + chunk_rows, max_id)) for start in range(0, max_id, chunk_rows)]
+        processes = processes or multiprocessing.cpu_count()
+        print(f"🔄 Backfill rollup: {max_id} rânduri în {len(chunks)} bucăți pe {processes} procese...")
+
+        if processes > 1 and len(chunks) > 1:
+            with multiprocessing.Pool(processes) as pool:
+                results = pool.map(_rollup_chunk, chunks)
+        else:
+            results = [_rollup_chunk(chunk) for chunk in chunks]
+
+        placeholders = ", ".join("?" * (1 + 4 * len(ROLLUP_PARAMS)))
+        backfill_conn.execute("BEGIN IMMEDIATE")  # Blochează writer-ul doar pe durata scrierii
+        try:
+            for resolution, table in ROLLUP_RESOLUTIONS:
+                backfill_conn.execute(f"DELETE FROM {table}")
+                upsert = _rollup_upsert_sql(table, f"VALUES ({placeholders})")
+                for chunk_result in results:
+                    # Bucket-urile de la granița dintre bucăți se combină prin ON CONFLICT
+                    backfill_conn.executemany(upsert, chunk_result[table])
+            # Rândurile scrise de writer după instantaneul max_id
+            actualizeaza_rollups(backfill_conn, max_id)
+            backfill_conn.execute("COMMIT")
+        except Exception:
+            backfill_conn.execute("ROLLBACK")
+            raise
+        print(f"✅ Backfill rollup finalizat în {time.time() - start_time:.1f}s")
+    finally:
+        database.close()
+
+def alege_rezolutie(span_seconds, min_points=CHART_MIN_POINTS):
+    """Returnează (rezoluție, tabel) cel mai grosier care dă cel puțin min_points puncte; (0, None) = date brute"""
+    for resolution, table in ROLLUP_RESOLUTIONS:
+        if span_seconds / resolution >= min_points:
+            return resolution, table
+    return 0, None
+
+# === SCRIERE GRUPATĂ PENTRU SENSOR_DATA (GROUP COMMIT) ===
+SENSOR_WRITER_BATCH_SIZE = 30        # Rânduri maxime într-o singură tranzacție
+SENSOR_WRITER_FLUSH_INTERVAL = 10.0  # Secunde maxime până la scrierea pe disc
+SENSOR_WRITER_QUEUE_SIZE = 1000      # Capacitatea cozii de citiri în așteptare
+
+class SensorDataWriter:
+    """
+    Thread dedicat pentru persistarea citirilor în sensor_data.
+
+    Bucla de achiziție doar pune citirile în coadă (fără I/O pe disc), iar thread-ul
+    le grupează și le scrie cu executemany într-o singură tranzacție la fiecare
+    batch_size rânduri sau flush_interval secunde - un singur fsync pe lot, nu pe citire.
+    """
+    INSERT_SQL = """
+        INSERT INTO sensor_data (timestamp, timestamp_epoch, temperatura, umiditate, lumina, calitate_aer, zgomot)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+    _STOP = object()
+
+    def __init__(self, database=db, batch_size=SENSOR_WRITER_BATCH_SIZE,
+                 flush_interval=SENSOR_WRITER_FLUSH_INTERVAL, max_queue=SENSOR_WRITER_QUEUE_SIZE):
+        self.database = database
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.thread = None
+        self.dropped_rows = 0
+
+    def start(self):
+        """Pornește thread-ul de scriere (idempotent)"""
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.thread = threading.Thread(target=self._run, name="SensorDataWriter", daemon=True)
+        self.thread.start()
+        print(f"💾 Writer BD pornit: lot de {self.batch_size} rânduri sau {self.flush_interval:g}s")
+
+    def submit(self, row):
+        """Pune o citire în coadă fără să blocheze bucla de achiziție"""
+        try:
+            self.queue.put_nowait(row)
+        except queue.Full:
+            # Coada e plină (disc blocat) - renunțăm la cea mai veche citire, nu la cea nouă
+            try:
+                self.queue.get_nowait()
+                self.dropped_rows += 1
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(row)
+            except queue.Full:
+                self.dropped_rows += 1
+            print(f"⚠️ Coada BD plină - {self.dropped_rows} citiri pierdute până acum")
+
+    def flush(self, timeout=5.0):
+        """Scrie imediat tot ce este în coadă și așteaptă confirmarea"""
+        if self.thread is None or not self.thread.is_alive():
+            return False
+        done = threading.Event()
+        try:
+            self.queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def stop(self, timeout=5.0):
+        """Golește coada pe disc și oprește thread-ul (apelat la închidere)"""
+        if self.thread is None or not self.thread.is_alive():
+            return
+        try:
+            self.queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            print("⚠️ Writer BD: coada plină la oprire")
+            return
+        self.thread.join(timeout)
+        self.thread = None
+        print("✅ Writer BD oprit - toate citirile au fost salvate")
+
+    def _run(self):
+        """Bucla thread-ului: adună citirile și le scrie în loturi"""
+        writer_conn = self.database.connection()
+        pending = []
+        deadline = None
+
+        try:
+            while True:
+                timeout = None if not pending else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None  # A expirat intervalul de flush
+
+                stop = item is self._STOP
+                flush_event = item if isinstance(item, threading.Event) else None
+
+                if item is not None and not stop and flush_event is None:
+                    pending.append(item)
+                    if len(pending) == 1:
+                        deadline = time.monotonic() + self.flush_interval
+
+                if (item is None or stop or flush_event is not None
+                        or len(pending) >= self.batch_size or time.monotonic() >= deadline):
+                    pending = self._write_batch(writer_conn, pending)
+                    # Dacă scrierea a eșuat, reîncercăm după încă un interval
+                    deadline = time.monotonic() + self.flush_interval
+
+                if flush_event is not None:
+                    flush_event.set()
+                if stop:
+                    break
+        finally:
+            self.database.close()
+
+    def _write_batch(self, writer_conn, rows):
+        """Scrie un lot într-o singură tranzacție; returnează rândurile rămase nescrise"""
+        if not rows:
+            return []
+        try:
+            with writer_conn:
+                last_id = writer_conn.execute("SELECT COALESCE(MAX(id), 0) FROM sensor_data").fetchone()[0]
+                writer_conn.executemany(self.INSERT_SQL, rows)
+                # Rollup-urile se actualizează în aceeași tranzacție (un singur fsync)
+                actualizeaza_rollups(writer_conn, last_id)
+            print(f"💾 SALVAT ÎN BD (lot): {len(rows)} citiri, ultima la {rows[-1][0]}")
+            return []
+        except Exception as e:
+            print(f"⚠️ EROARE BD la scrierea lotului: {e}")
+            # Păstrăm rândurile pentru următoarea încercare, dar fără să creștem nelimitat
+            if len(rows) > self.max_queue:
+                self.dropped_rows += len(rows) - self.max_queue
+                rows = rows[-self.max_queue:]
+            return rows
+
+# Writer unic pentru toată aplicația (pornit de SensorManager.start_reading)
+sensor_writer = SensorDataWriter()
+
+# === MOD DE STOCARE DEADBAND (DOAR LA SCHIMBARE) ===
+# 'complet' = fiecare ciclu devine un rând; 'deadband' = un rând doar când un parametru
+# se îndepărtează de ultima valoare salvată cu mai mult decât banda lui sau după heartbeat
+SENSOR_STORAGE_MODE = 'complet'
+
+# Banda moartă per parametru (0 = se salvează orice schimbare - reconstrucție exactă)
+SENSOR_DEADBAND = {
+    'temperatura': 0.1,
+    'umiditate': 0.5,
+    'lumina': 5,
+    'calitate_aer': 2
+}
+
+# Interval maxim fără rând salvat - delimitează și golurile (aplicație oprită) la reconstrucție
+SENSOR_HEARTBEAT_SECONDS = 300
+
+# Intervalul dintre citiri (grila pe care se reconstruiește seria în trepte)
+SENSOR_SAMPLE_INTERVAL = 2 if RASPBERRY_PI else 5
+
+class DeadbandFilter:
+    """Decide dacă o citire trebuie salvată, comparând-o cu ultima citire SALVATĂ (nu cu precedenta),
+    astfel încât derivele lente se acumulează și declanșează totuși o scriere."""
+    def __init__(self, deadband=SENSOR_DEADBAND, heartbeat=SENSOR_HEARTBEAT_SECONDS):
+        self.deadband = deadband
+        self.heartbeat = heartbeat
+        self.last_values = None
+        self.last_epoch = None
+        self.skipped = 0
+
+    def should_store(self, epoch, values):
+        """True dacă citirea trebuie scrisă; o reține ca referință în acest caz"""
+        store = (self.last_values is None
+                 or epoch - self.last_epoch >= self.heartbeat
+                 or any(abs(values[p] - self.last_values[p]) > band for p, band in self.deadband.items()))
+        if store:
+            self.last_values = {p: values[p] for p in self.deadband}
+            self.last_epoch = epoch
+        else:
+            self.skipped += 1
+        return store
+
+def reconstruieste_serie_trepte(epochs, values, start_epoch, end_epoch,
+                                step=SENSOR_SAMPLE_INTERVAL, heartbeat=SENSOR_HEARTBEAT_SECONDS):
+    """
+    Reconstruiește seria completă din rândurile salvate în modul deadband.
+
+    Fiecare rând salvat rămâne valabil până la următorul (forward-fill), dar cel mult
+    heartbeat secunde - după aceea e un gol real (aplicația a fost oprită). Punctele se
+    generează pe grila de citire pornind de la fiecare rând salvat, deci o bandă 0 dă
+    exact seria din modul complet. epochs (sortat crescător) poate include un rând
+    dinaintea lui start_epoch, care dă valoarea de la începutul perioadei.
+    Returnează (epoch-uri, valori) ca array-uri NumPy.
+    """
+    epochs = np.asarray(epochs, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    if len(epochs) == 0:
+        return epochs, values
+
+    # Sfârșitul fiecărui segment constant
+    ends = np.minimum(np.append(epochs[1:], end_epoch + 1), epochs + heartbeat)
+    # Segmentul care începe înaintea perioadei pornește pe grilă de la start_epoch
+    firsts = np.where(epochs < start_epoch,
+                      epochs + -(-(start_epoch - epochs) // step) * step, epochs)
+    counts = np.maximum(0, -(-(ends - firsts) // step))
+
+    segment = np.repeat(np.arange(len(epochs)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return firsts[segment] + offsets * step, values[segment]
 
 # === GESTIONARE ÎNCHIDERE APLICAȚIE ===
 def signal_handler(sig, frame):
     """Gestionează închiderea curată a aplicației"""
     print("\n🔄 Închidere aplicație prin Ctrl+C...")
     try:
+        sensor_writer.stop()
         if RASPBERRY_PI:
             GPIO.cleanup()
             print("✅ GPIO cleanup realizat")
-        conn.close()
+        db.close_all()
         print("✅ Conexiune bază de date închisă")
     except Exception as e:
         print(f"⚠️ Eroare la cleanup: {e}")
@@ -497,9 +1481,311 @@ class LEDManager:
                 print("✅ LED cleanup realizat cu COINCIDENȚĂ EXACTĂ (FĂRĂ ZGOMOT)")
             except Exception as e:
                 print(f"⚠️ Eroare la cleanup LED-uri: {e}")
+
+# === BUFFER CIRCULAR PENTRU CITIRILE RECENTE (NUMPY) ===
+RING_BUFFER_CAPACITY = 16384  # ~9 ore la o citire la 2s - acoperă "Ultimele 6 ore"
+
+# Epoch (secunde UTC) + cei 4 parametri activi (ZGOMOT EXCLUS)
+READING_DTYPE = np.dtype([
+    ('epoch', 'f8'),
+    ('temperatura', 'f8'),
+    ('umiditate', 'f8'),
+    ('lumina', 'f8'),
+    ('calitate_aer', 'f8')
+])
+
+class ReadingRingBuffer:
+    """
+    Buffer circular cu capacitate fixă pentru citirile recente, pe un array NumPy structurat.
+
+    Fiecare citire este scrisă de două ori (la i și la i + capacity), astfel încât orice
+    fereastră de citiri recente este o felie contiguă - read() o dă cititorului fără copiere.
+    Un singur producător (bucla de achiziție); cititorii pot rula pe alte thread-uri, fără lock:
+    append() incrementează _sequence înainte și după scriere (seqlock). Cititorul lucrează pe
+    felia vie și își păstrează rezultatul doar dacă secvența nu s-a schimbat între timp - altfel
+    (ex: buffer plin și append() a rescris primul slot al ferestrei) reia citirea.
+    view() și window() întorc copii, pentru cine păstrează datele după citire.
+    """
+    def __init__(self, capacity=RING_BUFFER_CAPACITY):
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=READING_DTYPE)
+        self._head = 0      # Următoarea poziție de scriere
+        self._count = 0     # Numărul de citiri valide
+        self.version = 0    # Crește la fiecare citire nouă
+        self._sequence = 0  # Impar cât timp append() scrie
+
+    def append(self, epoch, values):
+        """Adaugă o citire (values = dicționar cu parametrii activi)"""
+        row = (epoch, values['temperatura'], values['umiditate'], values['lumina'], values['calitate_aer'])
+        self._sequence += 1
+        self._data[self._head] = row
+        self._data[self._head + self.capacity] = row
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self.version += 1
+        self._sequence += 1
+
+    def __len__(self):
+        return self._count
+
+    def _read_consistent(self, function):
+        """function(felia vie) reluată până când nicio scriere nu s-a suprapus cu ea"""
+        while True:
+            sequence = self._sequence
+            if sequence & 1:
+                time.sleep(0)  # Scriere în curs - cedează GIL-ul producătorului
+                continue
+            end = self._head + self.capacity
+            result = function(self._data[end - self._count:end])
+            if self._sequence == sequence:
+                return result
+
+    def read(self, start_epoch, consume, complete=False):
+        """
+        consume(fereastră) pe citirile cu epoch >= start_epoch, ca vedere fără copiere.
+        consume trebuie doar să citească (ex: să construiască coloanele) și poate fi reapelat;
+        rezultatul întors e cel al unui apel care a văzut o stare consistentă.
+        Cu complete=True întoarce None dacă buffer-ul nu acoperă toată perioada de la start_epoch.
+        """
+        def in_window(data):
+            if complete and not (len(data) > 0 and data['epoch'][0] <= start_epoch):
+                return None
+            start = np.searchsorted(data['epoch'], start_epoch, side='left')
+            return consume(data[start:])
+        return self._read_consistent(in_window)
+
+    def view(self):
+        """Toate citirile din buffer, în ordine cronologică (copie)"""
+        return self._read_consistent(np.copy)
+
+    def window(self, start_epoch, complete=False):
+        """Citirile cu epoch >= start_epoch (copie) - vezi read()"""
+        return self.read(start_epoch, np.copy, complete)
+
+    def covers(self, start_epoch):
+        """True dacă buffer-ul conține toate citirile de la start_epoch până acum"""
+        return self._read_consistent(lambda data: len(data) > 0 and bool(data['epoch'][0] <= start_epoch))
+
+# === STATISTICI LIVE PE FERESTRE GLISANTE (5 MIN / 1 ORĂ / 24 ORE) ===
+LIVE_STATS_HORIZONS = (300, 3600, 86400)  # Secunde
+LIVE_STATS_MAX_GAP = 60  # O pauză mai lungă în achiziție nu se contabilizează ca timp petrecut în zonă
+
+class LiveWindowStats:
+    """
+    Statisticile unui parametru pe ultimele `horizon` secunde, actualizate în O(1) (amortizat) la
+    fiecare citire: Welford cu eliminare pentru medie/varianță, deque-uri monotone pentru min/max,
+    sume glisante pentru panta regresiei și contoare pe zone (citiri și secunde, după classify).
+    Erorile de rotunjire ale eliminărilor se anulează printr-o recalculare exactă după fiecare
+    len(fereastră) eliminări. Cuartilele vin din estimatori P², care nu pot scoate valori: două
+    seturi decalate cu horizon/2 se repornesc pe rând și se citește cel mai vechi (acoperă
+    între horizon/2 și horizon secunde). Folosit doar din thread-ul de achiziție.
+    """
+    QUANTILES = (0.25, 0.5, 0.75)
+
+    def __init__(self, param, horizon, classify):
+        self.param = param
+        self.horizon = horizon
+        self._classify = classify  # (param, valoare) -> 'optimal' / 'acceptable' / 'critical'
+        self._window = deque()     # (epoch, valoare, zonă, secunde de la citirea anterioară)
+        self._welford = WelfordAccumulator()
+        self._removed = 0          # Eliminări de la ultima recalculare exactă
+        self._minima = deque()     # (epoch, valoare) cu valori crescătoare - minimul e primul
+        self._maxima = deque()     # (epoch, valoare) cu valori descrescătoare - maximul e primul
+        self._base = None          # Originea timpului pentru sumele regresiei
+        self._sum_t = self._sum_x = self._sum_tt = self._sum_tx = 0.0
+        self._estimators = []      # [start_epoch, [P2Quantile pentru fiecare cuantilă]]
+        self.zone_counts = dict.fromkeys(RANGE_ZONES, 0)
+        self.zone_seconds = dict.fromkeys(RANGE_ZONES, 0.0)
+
+    def add(self, epoch, value):
+        window = self._window
+        seconds = min(epoch - window[-1][0], LIVE_STATS_MAX_GAP) if window else 0.0
+        zone = self._classify(self.param, value)
+        window.append((epoch, value, zone, seconds))
+        self._welford.add(value)
+        if self._base is None:
+            self._base = epoch
+        t = epoch - self._base
+        self._sum_t += t
+        self._sum_x += value
+        self._sum_tt += t * t
+        self._sum_tx += t * value
+        if zone in self.zone_counts:
+            self.zone_counts[zone] += 1
+            self.zone_seconds[zone] += seconds
+        
+        while self._minima and self._minima[-1][1] >= value:
+            self._minima.pop()
+        self._minima.append((epoch, value))
+        while self._maxima and self._maxima[-1][1] <= value:
+            self._maxima.pop()
+        self._maxima.append((epoch, value))
+        
+        self._add_quantiles(epoch, value)
+        self._expire(epoch - self.horizon)
+
+    def _add_quantiles(self, epoch, value):
+        if not self._estimators:
+            # Al doilea set e "pornit" cu o jumătate de orizont în urmă - se repornește decalat
+            self._estimators = [[epoch, [P2Quantile(p) for p in self.QUANTILES]],
+                                [epoch - self.horizon / 2, [P2Quantile(p) for p in self.QUANTILES]]]
+        for slot in self._estimators:
+            elapsed = epoch - slot[0]
+            if elapsed >= self.horizon:
+                slot[0] += self.horizon * (elapsed // self.horizon)
+                slot[1] = [P2Quantile(p) for p in self.QUANTILES]
+            for estimator in slot[1]:
+                estimator.add(value)
+
+    def _expire(self, cutoff):
+        """Scoate citirile cu epoch <= cutoff"""
+        window = self._window
+        while window and window[0][0] <= cutoff:
+            epoch, value, zone, seconds = window.popleft()
+            self._welford.remove(value)
+            t = epoch - self._base
+            self._sum_t -= t
+            self._sum_x -= value
+            self._sum_tt -= t * t
+            self._sum_tx -= t * value
+            if zone in self.zone_counts:
+                self.zone_counts[zone] -= 1
+                self.zone_seconds[zone] -= seconds
+            self._removed += 1
+        while self._minima and self._minima[0][0] <= cutoff:
+            self._minima.popleft()
+        while self._maxima and self._maxima[0][0] <= cutoff:
+            self._maxima.popleft()
+        if self._removed and self._removed >= len(window):
+            self._recompute()
+
+    def _recompute(self):
+        """Recalculare exactă din fereastră (O(n) la fiecare n eliminări) + originea timpului mutată la început"""
+        window = self._window
+        self._removed = 0
+        self._welford = WelfordAccumulator()
+        self._base = window[0][0] if window else None
+        self._sum_t = self._sum_x = self._sum_tt = self._sum_tx = 0.0
+        for zone in RANGE_ZONES:
+            self.zone_seconds[zone] = 0.0
+        for epoch, value, zone, seconds in window:
+            self._welford.add(value)
+            t = epoch - self._base
+            self._sum_t += t
+            self._sum_x += value
+            self._sum_tt += t * t
+            self._sum_tx += t * value
+            if zone in self.zone_seconds:
+                self.zone_seconds[zone] += seconds
+
+    def snapshot(self):
+        """SeriesStats cu starea curentă (obiect nou - nu mai e modificat după publicare)"""
+        stats = SeriesStats([])
+        window = self._window
+        n = len(window)
+        if n == 0:
+            return stats
+        stats.count = n
+        stats.min, stats.max = self._minima[0][1], self._maxima[0][1]
+        stats.mean = self._welford.mean
+        stats.variance = self._welford.variance
+        stats.std = math.sqrt(stats.variance)
+        oldest = max(self._estimators, key=lambda slot: slot[1][0].count)
+        stats.q25, stats.median, stats.q75 = [estimator.value for estimator in oldest[1]]
+        stats.optimal_count = self.zone_counts['optimal']
+        stats.acceptable_count = self.zone_counts['optimal'] + self.zone_counts['acceptable']
+        stats.critical_count = self.zone_counts['critical']
+        stats.zone_seconds = dict(self.zone_seconds)
+        
+        # Panta pe secundă din sumele glisante, convertită la pas mediu de măsurătoare (ca SeriesStats)
+        denominator = n * self._sum_tt - self._sum_t * self._sum_t
+        span = window[-1][0] - window[0][0]
+        if n > 1 and denominator > 0 and span > 0:
+            slope = (n * self._sum_tx - self._sum_t * self._sum_x) / denominator
+            stats.slope = slope * span / (n - 1)
+        stats.change = window[-1][1] - window[0][1]
+        return stats
+
+class LiveStatistics:
+    """
+    Statisticile live ale parametrilor activi pe toate orizonturile LIVE_STATS_HORIZONS.
+    update() rulează pe thread-ul de achiziție; `current` este înlocuit atomic cu un dicționar nou
+    {param: {orizont: SeriesStats}}, deci cititorii (Tk, alte thread-uri) nu au nevoie de lock sau de BD.
+    """
+    def __init__(self, classify, params=ROLLUP_PARAMS, horizons=LIVE_STATS_HORIZONS):
+        self._windows = {param: [LiveWindowStats(param, horizon, classify) for horizon in horizons]
+                         for param in params}
+        self.current = {param: {horizon: SeriesStats([]) for horizon in horizons} for param in params}
+
+    def update(self, epoch, values):
+        current = {}
+        for param, windows in self._windows.items():
+            value = float(values[param])
+            current[param] = {}
+            for window in windows:
+                window.add(epoch, value)
+                current[param][window.horizon] = window.snapshot()
+        self.current = current
+
+# === PLANIFICARE INDEPENDENTĂ PE SENZOR ===
+DHT22_POLL_INTERVAL = 2.5     # DHT22 nu suportă citiri mai dese de ~2s
+ADS1115_POLL_INTERVAL = 1.0   # Lumină și aer
+SENSOR_MAX_BACKOFF = 60.0     # Pauza maximă după eșecuri consecutive
+
+class SensorPoller:
+    """
+    Thread propriu pentru un senzor: citește la fiecare period secunde și publică valorile
+    în starea comună prin publish(values). La eșec apelează on_failure() și dublează pauza
+    (backoff exponențial până la max_backoff), revenind la period după prima citire reușită.
+    Un senzor lent sau blocat întârzie doar propriul thread, niciodată pe ceilalți.
+    """
+    def __init__(self, name, read, publish, on_failure, period, stop_event, max_backoff=SENSOR_MAX_BACKOFF):
+        self.name = name
+        self.read = read
+        self.publish = publish
+        self.on_failure = on_failure
+        self.period = period
+        self.stop_event = stop_event
+        self.max_backoff = max_backoff
+        self.failure_streak = 0
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name=f"Poller-{self.name}", daemon=True)
+        self.thread.start()
+        print(f"🔁 {self.name}: citire la {self.period:g}s (backoff până la {self.max_backoff:g}s)")
+
+    def next_delay(self):
+        """Pauza până la următoarea citire, în funcție de eșecurile consecutive"""
+        return min(self.period * 2 ** self.failure_streak, self.max_backoff)
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            started = time.monotonic()
+            try:
+                values = self.read()
+                ok = values is not None and all(v is not None for v in values)
+            except Exception as e:
+                print(f"⚠️ {self.name} Eroare: {e}")
+                ok = False
+
+            if ok:
+                self.failure_streak = 0
+                self.publish(values)
+            else:
+                self.failure_streak += 1
+                self.on_failure()
+                if self.failure_streak > 1:
+                    print(f"⏳ {self.name}: {self.failure_streak} eșecuri consecutive - următoarea încercare în {self.next_delay():g}s")
+
+            # Perioada se măsoară de la începutul citirii (durata citirii nu se adună)
+            self.stop_event.wait(max(0.0, self.next_delay() - (time.monotonic() - started)))
+
 class SensorManager:
     def __init__(self):
         self.running = False
+        self.stop_event = threading.Event()  # Trezește imediat thread-urile de citire la oprire
+        self.pollers = []
         
         # Valori inițiale care vor fi înlocuite DOAR cu valori reale
         # Valorile de start sunt rezonabile, dar vor fi actualizate la prima citire reală cu succes
@@ -586,6 +1872,16 @@ class SensorManager:
         
         # LED MANAGER ACTUALIZAT (FĂRĂ ZGOMOT)
         self.led_manager = LEDManager()
+        
+        # Citirile recente în memorie (grafice pe perioade scurte fără interogări BD)
+        self.recent_readings = ReadingRingBuffer()
+        # Filtrul deadband (None în modul complet - se salvează fiecare citire)
+        self.storage_filter = DeadbandFilter() if SENSOR_STORAGE_MODE == 'deadband' else None
+        # Abonații la citirile noi (ex: graficul Live) - apelați din thread-ul de achiziție
+        self.reading_listeners = []
+        self._listeners_lock = threading.Lock()
+        # Statistici pe ultimele 5 min / 1 oră / 24 ore, actualizate la fiecare citire (fără BD)
+        self.live_stats = LiveStatistics(self.get_range_status)
         print("🔆 SensorManager cu COINCIDENȚĂ EXACTĂ inițializat")
         print("⚠️ ZGOMOT COMPLET DEZACTIVAT - nu va fi monitorizat")
         print("🎯 COINCIDENȚĂ EXACTĂ: Doar valori reale, fără toleranțe artificiale")
@@ -738,7 +2034,7 @@ class SensorManager:
         message = f"Coincidență exactă atinsă pentru {param}: {self.current_data[param]:.1f} (matching precis)"
         
         try:
-            cursor.execute("""
+            db.execute("""
                 INSERT INTO feedback (timestamp, temperatura, lumina, umiditate, calitate_aer, zgomot, mesaj, user_id)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """, (
@@ -751,7 +2047,7 @@ class SensorManager:
                 message,
                 None  # Nu avem user_id în SensorManager
             ))
-            conn.commit()
+            db.commit()
         except Exception as e:
             print(f"⚠️ Eroare la salvarea în BD: {e}")
     
@@ -786,6 +2082,10 @@ class SensorManager:
         print("🔧 Doar valori reale - fără simulare la erori")
         print("🎯 COINCIDENȚĂ EXACTĂ - fără toleranțe artificiale")
         self.running = True
+        self.stop_event.clear()
+        
+        # Thread-ul de persistare grupată pornește înaintea achiziției
+        sensor_writer.start()
         
         if RASPBERRY_PI:
             print("🔧 Mod Raspberry Pi detectat - pornesc thread real-time cu COINCIDENȚĂ EXACTĂ")
@@ -798,6 +2098,11 @@ class SensorManager:
     
     def stop_reading(self):
         self.running = False
+        self.stop_event.set()
+        
+        # Scrie pe disc citirile rămase în coadă
+        sensor_writer.stop()
+        
         if RASPBERRY_PI:
             try:
                 GPIO.cleanup()
@@ -807,12 +2112,11 @@ class SensorManager:
         
         self.led_manager.cleanup()
     
-    def _read_dht22_realtime(self):
-        """Citește DHT22 cu logica îmbunătățită - DOAR VALORI REALE"""
+    def _read_dht22_realtime(self, max_retries=1):
+        """Citește DHT22 cu logica îmbunătățită - DOAR VALORI REALE
+        (reîncercările sunt făcute de SensorPoller, cu backoff, în propriul thread)"""
         if not RASPBERRY_PI or not DHT_AVAILABLE:
             return None, None
-            
-        max_retries = 3
         
         for retry in range(max_retries):
             try:
@@ -884,9 +2188,6 @@ class SensorManager:
             return None, None
         
         try:
-            # COINCIDENȚĂ EXACTĂ: Citire stabilă fără delay excesiv
-            time.sleep(0.1)  # Pause standard pentru ADS1115
-            
             # Citește fotorezistorul de pe canalul 0
             valoare_foto, tensiune_foto = citeste_ads1115(0)
             lux = tensiune_la_lux(tensiune_foto)  # Returnează valori întregi
@@ -934,86 +2235,68 @@ class SensorManager:
             self.ads_working = False
             self.sensor_status['ads1115'] = 'Ultima valoare reală'
     
+    def _publish_dht22(self, values):
+        """Publică o citire DHT22 reușită în starea comună"""
+        temp, hum = values
+        # Un singur update() - înregistrarea nu vede niciodată temperatura nouă cu umiditatea veche
+        self.current_data.update({'temperatura': temp, 'umiditate': hum})
+        print(f"🌡️ TEMP COINCIDENȚĂ EXACTĂ: {temp:.1f}°C | 💧 UMID: {hum:.1f}%")
+
+    def _publish_ads1115(self, values):
+        """Publică o citire ADS1115 reușită în starea comună (întregi pentru matching exact)"""
+        lux, aqi = values
+        self.current_data.update({'lumina': lux, 'calitate_aer': aqi})
+        print(f"💡 LUMINA COINCIDENȚĂ EXACTĂ: {lux} lux | 🌬️ AER: {aqi} AQI")
+
     def _read_real_sensors_realtime(self):
-        """CITIRE REAL-TIME cu DOAR VALORI REALE - COINCIDENȚĂ EXACTĂ"""
+        """CITIRE REAL-TIME cu DOAR VALORI REALE - COINCIDENȚĂ EXACTĂ
+        
+        Fiecare senzor are propriul SensorPoller (perioadă și backoff proprii). La eșec,
+        current_data păstrează ultima valoare reală publicată. Această buclă doar
+        înregistrează starea comună la fiecare SENSOR_SAMPLE_INTERVAL secunde.
+        """
         print("🔥 THREAD REAL-TIME PORNIT! (DOAR VALORI REALE + COINCIDENȚĂ EXACTĂ)")
         
+        self.pollers = [
+            SensorPoller("DHT22", self._read_dht22_realtime, self._publish_dht22,
+                         self._handle_dht22_failure, DHT22_POLL_INTERVAL, self.stop_event),
+            SensorPoller("ADS1115", self._read_ads1115_sensors, self._publish_ads1115,
+                         self._handle_ads1115_failure, ADS1115_POLL_INTERVAL, self.stop_event)
+        ]
+        for poller in self.pollers:
+            poller.start()
+        
+        next_cycle = time.monotonic()
         while self.running:
             try:
-                print(f"\n🔄 Ciclu citire real-time cu COINCIDENȚĂ EXACTĂ...")
-                
-                # DHT22 - citire real-time îmbunătățită
-                temp, hum = self._read_dht22_realtime()
-                if temp is not None and hum is not None:
-                    # Folosește doar valorile reale
-                    self.current_data['temperatura'] = temp
-                    self.current_data['umiditate'] = hum
-                    print(f"🌡️ TEMP COINCIDENȚĂ EXACTĂ: {temp:.1f}°C")
-                    print(f"💧 UMID COINCIDENȚĂ EXACTĂ: {hum:.1f}%")
-                else:
-                    # La eroare, păstrează ultima valoare reală reușită
-                    self._handle_dht22_failure()
-                    if self.last_successful_values['temperatura'] is not None:
-                        self.current_data['temperatura'] = self.last_successful_values['temperatura']
-                        self.current_data['umiditate'] = self.last_successful_values['umiditate']
-                        print(f"🌡️ TEMP (ultima reală): {self.current_data['temperatura']:.1f}°C")
-                        print(f"💧 UMID (ultima reală): {self.current_data['umiditate']:.1f}%")
-                    else:
-                        print("⚠️ DHT22: Nu există valori reale anterioare - păstrez valorile inițiale")
-                
-                # ADS1115 - citire real-time COINCIDENȚĂ EXACTĂ
-                lux, aqi = self._read_ads1115_sensors()
-                if lux is not None and aqi is not None:
-                    # Folosește doar valorile reale (întregi pentru matching exact)
-                    self.current_data['lumina'] = lux
-                    self.current_data['calitate_aer'] = aqi
-                    print(f"💡 LUMINA COINCIDENȚĂ EXACTĂ: {lux} lux (întreg)")
-                    print(f"🌬️ AER COINCIDENȚĂ EXACTĂ: {aqi} AQI (întreg)")
-                else:
-                    # La eroare, păstrează ultima valoare reală reușită
-                    self._handle_ads1115_failure()
-                    if self.last_successful_values['lumina'] is not None:
-                        self.current_data['lumina'] = self.last_successful_values['lumina']
-                        self.current_data['calitate_aer'] = self.last_successful_values['calitate_aer']
-                        print(f"💡 LUMINA (ultima reală): {self.current_data['lumina']} lux")
-                        print(f"🌬️ AER (ultima reală): {self.current_data['calitate_aer']} AQI")
-                    else:
-                        print("⚠️ ADS1115: Nu există valori reale anterioare - păstrez valorile inițiale")
-                
-                # ZGOMOT - COMPLET DEZACTIVAT (valoare fixă)
-                self.current_data['zgomot'] = 45  # Valoare fixă
-                print(f"🔇 ZGOMOT: {self.current_data['zgomot']} dB (VALOARE FIXĂ - DEZACTIVAT)")
-                
-                # Verifică monitorizarea continuă cu COINCIDENȚĂ EXACTĂ (FĂRĂ ZGOMOT)
-                self.check_continuous_monitoring()
-                
-                # Actualizează starea ventilatoarelor (FĂRĂ ZGOMOT)
-                self.update_fan_states()
-                
-                # Salvează în baza de date
-                try:
-                    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    cursor.execute("""
-                        INSERT INTO sensor_data (timestamp, temperatura, umiditate, lumina, calitate_aer, zgomot)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (timestamp, self.current_data['temperatura'], self.current_data['umiditate'],
-                          self.current_data['lumina'], self.current_data['calitate_aer'], self.current_data['zgomot']))
-                    conn.commit()
-                    print(f"💾 SALVAT ÎN BD cu COINCIDENȚĂ EXACTĂ: {timestamp}")
-                except Exception as e:
-                    print(f"⚠️ EROARE BD: {e}")
-                
-                # Interval standard pentru cicluri (fără delay special)
-                time.sleep(2)  # 2 secunde pentru toate ciclurile
-                
+                self._record_cycle()
             except Exception as e:
                 print(f"⚠️ EROARE GENERALĂ: {e}")
                 import traceback
                 traceback.print_exc()
-                time.sleep(3)
+            
+            # Ritm fix, independent de cât durează ciclul
+            next_cycle += SENSOR_SAMPLE_INTERVAL
+            self.stop_event.wait(max(0.0, next_cycle - time.monotonic()))
         
+        for poller in self.pollers:
+            poller.thread.join(timeout=1.0)
         print("🔥 THREAD REAL-TIME OPRIT cu COINCIDENȚĂ EXACTĂ")
     
+    def _record_cycle(self):
+        """Un ciclu de înregistrare: monitorizare, ventilatoare și salvarea stării comune"""
+        # ZGOMOT - COMPLET DEZACTIVAT (valoare fixă)
+        self.current_data['zgomot'] = 45  # Valoare fixă
+        
+        # Verifică monitorizarea continuă cu COINCIDENȚĂ EXACTĂ (FĂRĂ ZGOMOT)
+        self.check_continuous_monitoring()
+        
+        # Actualizează starea ventilatoarelor (FĂRĂ ZGOMOT)
+        self.update_fan_states()
+        
+        # Salvează în baza de date (prin coada writer-ului - fără I/O în bucla de achiziție)
+        self._save_reading()
+    
     def _simulate_sensors(self):
         """Simulează datele senzorilor cu valori FIXE (pentru testare pe PC) - ZGOMOT DEZACTIVAT"""
         print("🔄 Mod simulare PC activat cu COINCIDENȚĂ EXACTĂ - valori FIXE")
@@ -1047,16 +2330,47 @@ class SensorManager:
             # Actualizează starea ventilatoarelor (FĂRĂ ZGOMOT)
             self.update_fan_states()
             
-            # Salvează în baza de date
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            cursor.execute("""
-                INSERT INTO sensor_data (timestamp, temperatura, umiditate, lumina, calitate_aer, zgomot)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (timestamp, self.current_data['temperatura'], self.current_data['umiditate'],
-                  self.current_data['lumina'], self.current_data['calitate_aer'], self.current_data['zgomot']))
-            conn.commit()
+            # Salvează în baza de date (prin coada writer-ului)
+            self._save_reading()
             
-            time.sleep(5)
+            time.sleep(SENSOR_SAMPLE_INTERVAL)
+    
+    def _save_reading(self):
+        """Adaugă citirea curentă în buffer-ul circular și o trimite către writer-ul BD (non-blocant).
+        În modul deadband, citirile care nu ies din bandă rămân doar în buffer."""
+        now = time.time()
+        timestamp = datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S")
+        values = dict(self.current_data)  # Instantaneu - thread-urile de citire publică în paralel
+        self.recent_readings.append(int(now), values)
+        self.live_stats.update(int(now), values)
+        self._notify_listeners(int(now), values)
+        if self.storage_filter is not None and not self.storage_filter.should_store(int(now), values):
+            print(f"⏭️ Citire în banda moartă - nesalvată ({self.storage_filter.skipped} până acum)")
+            return
+        sensor_writer.submit((timestamp, int(now), values['temperatura'], values['umiditate'],
+                              values['lumina'], values['calitate_aer'], values['zgomot']))
+        print(f"💾 În coada BD cu COINCIDENȚĂ EXACTĂ: {timestamp}")
+    
+    def subscribe(self, listener):
+        """Abonează listener(epoch, values) la fiecare citire nouă. Se apelează din thread-ul de
+        achiziție, deci trebuie să fie rapid și să nu atingă Tk (ex: doar pune citirea într-o coadă)."""
+        with self._listeners_lock:
+            if listener not in self.reading_listeners:
+                self.reading_listeners.append(listener)
+    
+    def unsubscribe(self, listener):
+        with self._listeners_lock:
+            if listener in self.reading_listeners:
+                self.reading_listeners.remove(listener)
+    
+    def _notify_listeners(self, epoch, values):
+        with self._listeners_lock:
+            listeners = list(self.reading_listeners)
+        for listener in listeners:
+            try:
+                listener(epoch, values)
+            except Exception as e:
+                print(f"⚠️ Eroare la notificarea unui abonat la citiri: {e}")
     
     def get_sensor_status(self):
         """Returnează statusul detaliat al senzorilor - ZGOMOT DEZACTIVAT"""
@@ -1107,17 +2421,8 @@ class SensorManager:
         if param == 'zgomot':
             return "disabled"  # STATUS SPECIAL PENTRU DEZACTIVAT
             
-        if param in OPTIMAL_RANGES:
-            ranges = OPTIMAL_RANGES[param]
-            optimal_min, optimal_max = ranges['optimal']
-            acceptable_min, acceptable_max = ranges['acceptable']
-            
-            if optimal_min <= value <= optimal_max:
-                return "optimal"
-            elif acceptable_min <= value <= acceptable_max:
-                return "acceptable"
-            else:
-                return "critical"
+        if param in range_classifier:
+            return range_classifier.zone(param, value)  # "optimal" / "acceptable" / "critical"
         return "necunoscut"
 class LoginWindow:
     def __init__(self, root):
@@ -1182,7 +2487,7 @@ class LoginWindow:
         hashed_password = self.hash_password(password)
         
         try:
-            cursor.execute("SELECT id FROM users WHERE username = ? AND password = ?", (username, hashed_password))
+            cursor = db.execute("SELECT id FROM users WHERE username = ? AND password = ?", (username, hashed_password))
             result = cursor.fetchone()
             
             if result:
@@ -1268,11 +2573,11 @@ class LoginWindow:
             
             try:
                 hashed_password = self.hash_password(password)
-                cursor.execute("INSERT INTO users (username, password) VALUES (?, ?)", 
+                db.execute("INSERT INTO users (username, password) VALUES (?, ?)", 
                              (username, hashed_password))
-                conn.commit()
+                db.commit()
                 
-                cursor.execute("SELECT id FROM users WHERE username = ?", (username,))
+                cursor = db.execute("SELECT id FROM users WHERE username = ?", (username,))
                 user_id = cursor.fetchone()[0]
                 
                 print(f"✅ Cont creat și login reușit pentru: {username}")
@@ -1311,10 +2616,11 @@ class LoginWindow:
         """Gestionează închiderea aplicației cu cleanup complet"""
         print("🔄 Închidere aplicație din LoginWindow...")
         try:
+            sensor_writer.stop()
             if RASPBERRY_PI:
                 GPIO.cleanup()
                 print("✅ GPIO cleanup realizat")
-            conn.close()
+            db.close_all()
             print("✅ Conexiune bază de date închisă")
         except Exception as e:
             print(f"⚠️ Eroare la cleanup: {e}")
@@ -1489,12 +2795,7 @@ class MainApplication:
             return "#808080"  # GRI PENTRU DEZACTIVAT
             
         status = self.sensor_manager.get_range_status(param, value)
-        if status == "optimal":
-            return "#2ECC71"  # Verde
-        elif status == "acceptable":
-            return "#E67E22"  # Portocaliu
-        else:
-            return "#E74C3C"  # Roșu
+        return ZONE_COLORS.get(status, ZONE_COLORS['critical'])
     
     def get_status_icon(self, param, value):
         """Returnează iconul pentru status în funcție de range-ul optimal îmbunătățit - ZGOMOT DEZACTIVAT"""
@@ -1691,13 +2992,7 @@ class MainApplication:
             text_widget.pack(fill="both", expand=True)
 
             # Interogare îmbunătățită pentru feedback
-            cursor.execute("""
-                SELECT timestamp, mesaj, temperatura, umiditate, lumina, calitate_aer, zgomot
-                FROM feedback 
-                WHERE user_id = ? OR user_id IS NULL
-                ORDER BY id DESC 
-                LIMIT 100
-            """, (self.user_id,))
+            cursor = db.execute(SQL_ISTORIC_FEEDBACK, (self.user_id,))
             
             randuri = cursor.fetchall()
             
@@ -1707,7 +3002,7 @@ class MainApplication:
                 text_widget.insert(tk.END, "=" * 90 + "\n\n")
                 
                 for rand in randuri:
-                    timestamp, mesaj, temp, umid, lumina, aer, zgomot = rand
+                    _, timestamp, mesaj, temp, umid, lumina, aer, zgomot = rand
                     
                     text_widget.insert(tk.END, f"🕐 {timestamp}\n")
                     text_widget.insert(tk.END, f"📝 {mesaj}\n")
@@ -1722,80 +3017,967 @@ class MainApplication:
         except Exception as e:
             print(f"Eroare la afișarea istoricului feedback: {e}")
     
-    def istoric_comentarii(self):
-        """Afișează istoricul comentariilor utilizatorilor"""
-        try:
-            top = tk.Toplevel(self.root)
-            top.title("Istoric Comentarii Utilizatori - Coincidență Exactă")
-            top.geometry("800x500")
-            top.configure(bg="#f0f0f0")
-            top.protocol("WM_DELETE_WINDOW", top.destroy)
-
-            # Frame cu scroll
-            main_frame = tk.Frame(top, bg="#f0f0f0")
-            main_frame.pack(fill="both", expand=True, padx=10, pady=10)
-
-            # Text widget cu scroll
-            text_widget = scrolledtext.ScrolledText(main_frame, width=90, height=25, bg="white", 
-                                                  font=("Arial", 10))
-            text_widget.pack(fill="both", expand=True)
-
-            # Interogare pentru comentarii din voturi
-            cursor.execute("""
-                SELECT v.timestamp, v.comment, u.username, v.parameter_name, v.vote_value
-                FROM votes v
-                LEFT JOIN users u ON v.user_id = u.id
-                WHERE v.comment IS NOT NULL AND v.comment != ''
-                ORDER BY v.id DESC 
-                LIMIT 50
-            """, )
-            
-            randuri = cursor.fetchall()
-            
-            if randuri:
-                text_widget.insert(tk.END, "=" * 80 + "\n")
-                text_widget.insert(tk.END, "              ISTORIC COMENTARII - COINCIDENȚĂ EXACTĂ\n")
-                text_widget.insert(tk.END, "=" * 80 + "\n\n")
-                
-                for rand in randuri:
-                    timestamp, comment, username, param_name, vote_value = rand
-                    username = username or "Utilizator necunoscut"
-                    
-                    # Marchează dacă comentariul se referă la zgomot
-                    zgomot_marker = " (DEZACTIVAT)" if param_name == 'zgomot' else ""
-                    
-                    text_widget.insert(tk.END, f"🕐 {timestamp}\n")
-                    text_widget.insert(tk.END, f"👤 Utilizator: {username}\n")
-                    text_widget.insert(tk.END, f"📝 Comentariu: {comment}\n")
-                    text_widget.insert(tk.END, f"🗳️ Parametru: {param_name}{zgomot_marker} | Vot: {vote_value}\n")
-                    text_widget.insert(tk.END, "-" * 70 + "\n\n")
-            else:
-                text_widget.insert(tk.END, "📭 Nu există comentarii în istoric.\n")
-                
-            text_widget.config(state=tk.DISABLED)  # Doar citire
-            
-        except Exception as e:
-            print(f"Eroare la afișarea istoricului comentarii: {e}")
+    def istoric_comentarii(self):
+        """Afișează istoricul comentariilor utilizatorilor"""
+        try:
+            top = tk.Toplevel(self.root)
+            top.title("Istoric Comentarii Utilizatori - Coincidență Exactă")
+            top.geometry("800x500")
+            top.configure(bg="#f0f0f0")
+            top.protocol("WM_DELETE_WINDOW", top.destroy)
+
+            # Frame cu scroll
+            main_frame = tk.Frame(top, bg="#f0f0f0")
+            main_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+            # Text widget cu scroll
+            text_widget = scrolledtext.ScrolledText(main_frame, width=90, height=25, bg="white", 
+                                                  font=("Arial", 10))
+            text_widget.pack(fill="both", expand=True)
+
+            # Interogare pentru comentarii din voturi
+            cursor = db.execute(SQL_ISTORIC_COMENTARII)
+            
+            randuri = cursor.fetchall()
+            
+            if randuri:
+                text_widget.insert(tk.END, "=" * 80 + "\n")
+                text_widget.insert(tk.END, "              ISTORIC COMENTARII - COINCIDENȚĂ EXACTĂ\n")
+                text_widget.insert(tk.END, "=" * 80 + "\n\n")
+                
+                for rand in randuri:
+                    timestamp, comment, username, param_name, vote_value = rand
+                    username = username or "Utilizator necunoscut"
+                    
+                    # Marchează dacă comentariul se referă la zgomot
+                    zgomot_marker = " (DEZACTIVAT)" if param_name == 'zgomot' else ""
+                    
+                    text_widget.insert(tk.END, f"🕐 {timestamp}\n")
+                    text_widget.insert(tk.END, f"👤 Utilizator: {username}\n")
+                    text_widget.insert(tk.END, f"📝 Comentariu: {comment}\n")
+                    text_widget.insert(tk.END, f"🗳️ Parametru: {param_name}{zgomot_marker} | Vot: {vote_value}\n")
+                    text_widget.insert(tk.END, "-" * 70 + "\n\n")
+            else:
+                text_widget.insert(tk.END, "📭 Nu există comentarii în istoric.\n")
+                
+            text_widget.config(state=tk.DISABLED)  # Doar citire
+            
+        except Exception as e:
+            print(f"Eroare la afișarea istoricului comentarii: {e}")
+    
+    def on_closing(self):
+        """Gestionează închiderea aplicației"""
+        print("🔄 Închidere aplicație cu COINCIDENȚĂ EXACTĂ...")
+        try:
+            # Oprește toate sistemele (FĂRĂ ZGOMOT)
+            self.sensor_manager.stop_reading()
+            if RASPBERRY_PI:
+                # Nu mai avem GPIO pentru zgomot de curățat
+                print("⚠️ Cleanup GPIO - zgomot nu a fost configurat")
+                GPIO.cleanup()
+            db.close_all()
+            print("✅ Cleanup complet realizat cu COINCIDENȚĂ EXACTĂ")
+        except Exception as e:
+            print(f"Eroare la închidere: {e}")
+        finally:
+            self.root.quit()
+            self.root.destroy()
+            print("👋 MainApplication închis complet cu COINCIDENȚĂ EXACTĂ")
+
+# === SERII DE DATE PENTRU GRAFICE (COLOANE TIPIZATE) ===
+CHART_COLUMNS = ('temperatura', 'umiditate', 'lumina', 'calitate_aer', 'zgomot')
+# La reîmprospătarea din cache se re-citesc și ultimele secunde deja cunoscute: acoperă citirile
+# încă în coada SensorDataWriter și treapta deadband extinsă până la "acum"
+CHART_CACHE_OVERLAP_SECONDS = 2 * int(SENSOR_WRITER_FLUSH_INTERVAL)
+
+def epoci_la_ora_locala(epochs):
+    """
+    Epoch-uri -> datetime64[s] în ora locală (aceleași valori ca strftime(..., 'localtime')).
+    Vectorizat: decalajul față de UTC (inclusiv ora de vară) se cere sistemului o singură dată
+    pentru fiecare oră distinctă din serie, nu pentru fiecare rând.
+    """
+    epochs = np.asarray(epochs, dtype=np.int64)
+    if len(epochs) == 0:
+        return epochs.astype('datetime64[s]')
+    hours = epochs // 3600
+    # Seriile sunt ordonate - orele distincte sunt începuturile de "run"-uri
+    starts = np.concatenate(([True], hours[1:] != hours[:-1]))
+    run_index = np.cumsum(starts) - 1
+    offsets = np.array([time.localtime(int(hour) * 3600).tm_gmtoff for hour in hours[starts].tolist()],
+                       dtype=np.int64)
+    return (epochs + offsets[run_index]).astype('datetime64[s]')
+
+class ChartSeries:
+    """
+    Rezultatul unei interogări pentru grafice, pe coloane NumPy tipizate: epochs (int64),
+    timestamps (datetime64[s], ora locală) și câte un array float64 pe parametru (NaN = lipsă).
+    Se construiește o singură dată per interogare; graficul, statisticile și exportul folosesc
+    aceleași array-uri, fără a mai parsa rânduri text.
+    """
+    _versions = itertools.count(1)
+    
+    def __init__(self, epochs, columns, resolution=0, timestamps=None):
+        self.version = next(ChartSeries._versions)  # Diferă la fiecare serie nouă (ex: după reîmprospătare)
+        self.epochs = np.asarray(epochs, dtype=np.int64)
+        self.columns = columns
+        self.resolution = resolution  # 0 = date brute, altfel rezoluția rollup-ului în secunde
+        self.timestamps = epoci_la_ora_locala(self.epochs) if timestamps is None else timestamps
+        self._valid = {}
+    
+    @classmethod
+    def from_rows(cls, rows, resolution=0):
+        """Rânduri (epoch, temperatura, umiditate, lumina, calitate_aer, zgomot) -> coloane; NULL -> NaN"""
+        matrix = np.array(rows, dtype=np.float64).reshape(-1, 1 + len(CHART_COLUMNS))
+        return cls.from_matrix(matrix[:, 0], matrix[:, 1:], resolution)
+    
+    @classmethod
+    def from_matrix(cls, epochs, values, resolution=0):
+        """Epoch-uri + matrice (n, 5) de valori, în ordinea CHART_COLUMNS"""
+        values = np.asarray(values, dtype=np.float64)
+        columns = {param: np.ascontiguousarray(values[:, i]) for i, param in enumerate(CHART_COLUMNS)}
+        return cls(epochs, columns, resolution)
+    
+    @classmethod
+    def empty(cls):
+        return cls.from_matrix(np.empty(0), np.empty((0, len(CHART_COLUMNS))))
+    
+    def __len__(self):
+        return len(self.epochs)
+    
+    def append_tail(self, tail, tail_start, window_start):
+        """Seria nouă = rândurile proprii din [window_start, tail_start) + rândurile tail de la window_start.
+        Doar rândurile noi sunt convertite; seria curentă nu se modifică (graficul o poate folosi în continuare)."""
+        i0, i1 = np.searchsorted(self.epochs, (window_start, tail_start), side='left')
+        j0 = np.searchsorted(tail.epochs, window_start, side='left')
+        columns = {param: np.concatenate((self.columns[param][i0:i1], tail.columns[param][j0:]))
+                   for param in CHART_COLUMNS}
+        return ChartSeries(np.concatenate((self.epochs[i0:i1], tail.epochs[j0:])), columns, self.resolution,
+                           np.concatenate((self.timestamps[i0:i1], tail.timestamps[j0:])))
+    
+    def valid(self, param):
+        """(timestamps, valori) doar pentru rândurile cu valoare - memorat per parametru"""
+        if param not in self._valid:
+            values = self.columns[param]
+            mask = ~np.isnan(values)
+            self._valid[param] = (self.timestamps[mask], values[mask]) if not mask.all() else (self.timestamps, values)
+        return self._valid[param]
+    
+    def to_csv(self, filename):
+        """Exportă toate coloanele (aceleași array-uri ca graficul) într-un fișier CSV"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write("timestamp," + ",".join(CHART_COLUMNS) + "\n")
+            text_columns = [np.char.mod('%.2f', self.columns[param]) for param in CHART_COLUMNS]
+            for row in zip(np.datetime_as_string(self.timestamps, unit='s'), *text_columns):
+                f.write(",".join(row).replace('T', ' ', 1).replace('nan', '') + "\n")
+
+# === STATISTICI PE SERIE (O SINGURĂ TRECERE, FOLOSITE DE PANOU ȘI DE FEREASTRA DETALIATĂ) ===
+STATS_TREND_THRESHOLD = 0.1  # Panta (unități pe măsurătoare) peste care trendul e creștere/scădere
+
+class SeriesStats:
+    """
+    Toate statisticile unei serii, calculate o singură dată: număr, min/max, medie, varianță,
+    cuartile, numărul de valori pe zone (din OPTIMAL_RANGES) și trendul prin regresie liniară.
+    Min, max și cuartilele vin dintr-un singur np.partition; media și varianța din două reduceri
+    vectorizate - fără sortare completă și fără bucle Python.
+    """
+    def __init__(self, values, param=None):
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        self.count = n
+        self.optimal_count = self.acceptable_count = self.critical_count = 0
+        self.zone_seconds = None  # Secunde petrecute în fiecare zonă - doar la statisticile live
+        if n == 0:
+            self.min = self.max = self.mean = self.variance = self.std = np.nan
+            self.q25 = self.median = self.q75 = np.nan
+            self.slope = self.change = 0.0
+            return
+        
+        # Pozițiile necesare pentru min, max și cuartile (interpolare liniară, ca np.percentile)
+        positions = np.array([0.25, 0.5, 0.75]) * (n - 1)
+        lower = np.floor(positions).astype(np.int64)
+        kth = np.unique(np.concatenate(([0, n - 1], lower, np.minimum(lower + 1, n - 1))))
+        ordered = np.partition(values, kth)
+        self.min, self.max = float(ordered[0]), float(ordered[n - 1])
+        self.q25, self.median, self.q75 = (
+            ordered[lower] + (positions - lower) * (ordered[np.minimum(lower + 1, n - 1)] - ordered[lower])).tolist()
+        
+        self.mean = float(values.sum() / n)
+        deviations = values - self.mean
+        self.variance = float(np.dot(deviations, deviations) / n)
+        self.std = math.sqrt(self.variance)
+        
+        # Trend: panta dreptei de regresie față de indexul măsurătorii (mai robustă decât capetele seriei)
+        if n > 1:
+            index = np.arange(n, dtype=np.float64) - (n - 1) / 2.0
+            self.slope = float(np.dot(index, deviations) / np.dot(index, index))
+        else:
+            self.slope = 0.0
+        self.change = float(values[-1] - values[0])
+        
+        if param in range_classifier:
+            optimal, acceptable, critical = range_classifier.zone_counts(param, values).tolist()
+            self.optimal_count = optimal
+            self.acceptable_count = optimal + acceptable  # Include și zona optimală
+            self.critical_count = critical
+    
+    @property
+    def trend(self):
+        """1 = creștere, -1 = scădere, 0 = stabil (pragul STATS_TREND_THRESHOLD pe măsurătoare)"""
+        if self.slope > STATS_TREND_THRESHOLD:
+            return 1
+        if self.slope < -STATS_TREND_THRESHOLD:
+            return -1
+        return 0
+    
+    @classmethod
+    def from_summary(cls, row):
+        """Din rândul-sumar calculat în SQLite (vezi statistici_sql)"""
+        count, minimum, maximum, mean, variance, q25, median, q75, zones, trend = row
+        stats = cls([])
+        if not count:
+            return stats
+        zones, trend = json.loads(zones), json.loads(trend)
+        stats.count = int(count)
+        stats.min, stats.max, stats.mean = minimum, maximum, mean
+        stats.variance = variance
+        stats.std = math.sqrt(variance)
+        stats.q25, stats.median, stats.q75 = q25, median, q75
+        stats.optimal_count = int(round(zones['optimal']))
+        stats.acceptable_count = int(round(zones['acceptable']))
+        stats.critical_count = int(round(zones['critical']))
+        stats.slope = trend['slope']
+        stats.change = trend['last'] - trend['first']
+        return stats
+    
+    def percent(self, count):
+        """Procentul din numărul de măsurători"""
+        return count / self.count * 100 if self.count else 0.0
+
+def statistici_sql(param, start_epoch, end_epoch, resolution=0, database=db):
+    """
+    SeriesStats calculat integral în SQLite - se transferă un singur rând, nu toată perioada.
+    resolution = 0: pe rândurile brute din sensor_data (un apel Python pe rând - potrivit pentru
+    perioade scurte). Altfel pe rollup-ul cu acea rezoluție (un rând pe bucket):
+    numărul, min/max și media sunt exacte (din coloanele _count/_min/_max/_sum), iar varianța,
+    cuartilele, zonele și trendul se calculează pe mediile bucket-urilor, ponderate cu numărul de citiri
+    (un bucket parțial - goluri, modul deadband - nu contează cât unul plin). Cuartilele brute vin din P².
+    """
+    if param not in ROLLUP_PARAMS:
+        raise ValueError(f"Parametru fără statistici: {param}")
+    if resolution:
+        table = dict(ROLLUP_RESOLUTIONS)[resolution]
+        source = f"""
+            SELECT {param}_sum / {param}_count AS value, {param}_count AS weight,
+                   {param}_min AS low, {param}_max AS high, {param}_sum AS total
+            FROM {table}
+            WHERE bucket_epoch BETWEEN ? AND ?
+            ORDER BY bucket_epoch ASC
+        """
+        totals = "SUM(weight), MIN(low), MAX(high), SUM(total) / SUM(weight)"
+        quantile = "WEIGHTED_QUANTILE(value, weight, {})"
+    else:
+        source = f"""
+            SELECT {param} AS value, 1 AS weight
+            FROM sensor_data
+            WHERE timestamp_epoch BETWEEN ? AND ?
+            ORDER BY timestamp_epoch ASC
+        """
+        totals = "COUNT(value), MIN(value), MAX(value), AVG(value)"
+        quantile = "P2_QUANTILE(value, {})"
+    quartiles = ", ".join(quantile.format(p) for p in (0.25, 0.5, 0.75))
+    cursor = database.execute(f"""
+        SELECT {totals}, VARIANCE(value, weight), {quartiles},
+               ZONE_COUNTS(value, ?, weight), TREND_SLOPE(value, weight)
+        FROM ({source})
+    """, (param, start_epoch, end_epoch))
+    return SeriesStats.from_summary(cursor.fetchone())
+
+# === FILTRE DE NETEZIRE VECTORIZATE ===
+# Toate primesc o serie (listă sau array) și o fereastră impară, centrată pe fiecare punct,
+# și întorc un array NumPy de aceeași lungime. Niciun filtru nu parcurge punctele în Python.
+NETEZIRE_FARA = "Fără"
+NETEZIRE_FEREASTRA_IMPLICITA = 5
+NETEZIRE_MEDIANA_BLOC = 16384  # Puncte per bloc în netezire_mediana (temporarele rămân în cache-ul L2)
+EMA_BLOC_EXPONENT = 150  # Blocurile EMA sunt alese astfel încât (1 - alfa)^-k <= 10^150 (fără overflow)
+
+def _fereastra_impara(window, n):
+    """Fereastră impară, minim 3, cel mult lungimea seriei"""
+    window = max(3, int(window) | 1)
+    return min(window, n if n % 2 else n - 1)
+
+def netezire_medie_mobila(y, window=NETEZIRE_FEREASTRA_IMPLICITA):
+    """Medie mobilă centrată prin sume cumulative - O(n) indiferent de fereastră.
+    La margini media se face pe punctele existente (ca vechiul smooth_data)."""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n < 3:
+        return y.copy()
+    window = _fereastra_impara(window, n)
+    half = window // 2
+    sums = np.empty(n + 1)
+    sums[0] = 0.0
+    np.cumsum(y, out=sums[1:])
+    out = np.empty(n)
+    out[half:n - half] = (sums[window:] - sums[:n + 1 - window]) / window
+    head = np.arange(half)
+    out[:half] = sums[head + half + 1] / (head + half + 1)
+    tail = np.arange(n - half, n)
+    out[n - half:] = (sums[n] - sums[tail - half]) / (n - tail + half)
+    return out
+
+def netezire_exponentiala(y, window=NETEZIRE_FEREASTRA_IMPLICITA):
+    """
+    Medie mobilă exponențială (alfa = 2 / (fereastră + 1)), pornind de la prima valoare.
+    Recurența o_i = q*o_(i-1) + alfa*x_i (q = 1 - alfa) are forma închisă
+    o_j = alfa * q^j * cumsum(x_i / q^i), calculată pe blocuri (rânduri ale unei matrice) ca
+    q^-i să nu depășească float64; doar starea de la capătul fiecărui bloc se propagă secvențial.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n < 2:
+        return y.copy()
+    alpha = 2.0 / (max(1, int(window)) + 1)
+    q = 1.0 - alpha
+    if q == 0:
+        return y.copy()  # Fereastra 1 - fără netezire
+    block = max(1, min(n, int(EMA_BLOC_EXPONENT / -np.log10(q))))
+    rows = -(-n // block)
+    padded = np.zeros(rows * block)
+    padded[:n] = y
+    powers = q ** np.arange(block)
+    inner = alpha * powers * np.cumsum(padded.reshape(rows, block) / powers, axis=1)
+    
+    # Starea cu care intră fiecare bloc (ieșirea de la finalul blocului anterior)
+    carry = np.empty(rows)
+    state = y[0]
+    decay = q ** block
+    for row, end in enumerate(inner[:, -1].tolist()):
+        carry[row] = state
+        state = decay * state + end
+    return (inner + carry[:, None] * (q * powers)).ravel()[:n]
+
+def netezire_savitzky_golay(y, window=NETEZIRE_FEREASTRA_IMPLICITA, polyorder=2):
+    """Savitzky-Golay: coeficienții fitului polinomial local (pseudo-inversa Vandermonde) aplicați
+    printr-o singură convoluție; marginile se oglindesc. Păstrează vârfurile mai bine decât media."""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n < 3:
+        return y.copy()
+    window = _fereastra_impara(window, n)
+    half = window // 2
+    polyorder = min(polyorder, window - 1)
+    vandermonde = np.vander(np.arange(-half, half + 1, dtype=np.float64), polyorder + 1, increasing=True)
+    coefficients = np.linalg.pinv(vandermonde)[0]
+    return np.convolve(np.pad(y, half, mode='reflect'), coefficients[::-1], mode='valid')
+
+def _mediana_bloc(x, n, window):
+    """Medianele celor n ferestre din x (len(x) = n + window - 1), fără matricea ferestrelor"""
+    # Perechile vecine sortate o singură dată - ferestrele de 3 și 5 le refolosesc
+    lo = np.minimum(x[:-1], x[1:])
+    hi = np.maximum(x[:-1], x[1:])
+    if window == 3:
+        # med(a, b, c) = max(min(a, b), min(max(a, b), c))
+        np.minimum(hi[:n], x[2:], out=hi[:n])
+        return np.maximum(lo[:n], hi[:n], out=lo[:n])
+    if window == 5:
+        # Rețeaua lui Paeth: după sort(0, 3) și sort(1, 4) minimul și maximul ies din cursă,
+        # mediana celor 5 e mediana lui (min(hi0, hi3), x2, max(lo0, lo3))
+        a = np.minimum(hi[:n], hi[3:])
+        b = np.maximum(lo[:n], lo[3:])
+        low = np.minimum(a, b, out=lo[:n])
+        np.maximum(a, b, out=a)
+        np.minimum(a, x[2:2 + n], out=a)
+        return np.maximum(low, a, out=b)
+    half = window // 2
+    if window > 7:
+        windows = np.lib.stride_tricks.sliding_window_view(x, window)
+        return np.partition(windows, half, axis=1)[:, half]
+    # half + 1 treceri de bubble sort aduc mediana pe poziția window - 1 - half
+    lanes = [x[i:i + n] for i in range(window)]
+    for sweep in range(half + 1):
+        for i in range(window - 1 - sweep):
+            lanes[i], lanes[i + 1] = np.minimum(lanes[i], lanes[i + 1]), np.maximum(lanes[i], lanes[i + 1])
+    return lanes[window - 1 - half]
+
+def netezire_mediana(y, window=NETEZIRE_FEREASTRA_IMPLICITA):
+    """Mediană mobilă (elimină vârfurile izolate, ex: o citire ADS eronată).
+    Seria se parcurge în blocuri de NETEZIRE_MEDIANA_BLOC puncte (temporarele sunt mici și refolosite,
+    nu n x window valori). Ferestrele de 3 și 5 (implicită) partajează perechile vecine sortate -
+    sub 1 ms pentru 100k puncte; 7: rețea min/max; mai mari: np.partition pe ferestrele blocului,
+    O(n * window) - peste 1 ms la 100k puncte (~2 ms la 7, ~5 ms la 9-15, ~16 ms la 51), pe Raspberry Pi de câteva ori mai mult."""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n < 3:
+        return y.copy()
+    window = _fereastra_impara(window, n)
+    padded = np.pad(y, window // 2, mode='edge')
+    out = np.empty(n)
+    for start in range(0, n, NETEZIRE_MEDIANA_BLOC):
+        end = min(n, start + NETEZIRE_MEDIANA_BLOC)
+        out[start:end] = _mediana_bloc(padded[start:end + window - 1], end - start, window)
+    return out
+
+# Opțiunile din ChartsWindow ("🌊 Netezire")
+FILTRE_NETEZIRE = {
+    "Medie mobilă": netezire_medie_mobila,
+    "Exponențială (EMA)": netezire_exponentiala,
+    "Savitzky-Golay": netezire_savitzky_golay,
+    "Mediană": netezire_mediana,
+}
+
+# === DECIMARE (NIVEL DE DETALIU) PENTRU SERII LUNGI ===
+# Înainte de desenare, seria e redusă la aproximativ lățimea axelor în pixeli: mai multe puncte
+# nu se văd oricum, dar costă timp de randare (mai ales pe Raspberry Pi).
+CHART_DECIMATION = 'lttb'  # 'lttb' (formă vizuală), 'minmax' (toate vârfurile) sau None (fără decimare)
+
+def decimeaza_lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: indicii celor n_out puncte care păstrează forma seriei.
+    Primul și ultimul punct rămân; din fiecare bucket interior se alege punctul care formează
+    triunghiul de arie maximă cu punctul ales anterior și media bucket-ului următor.
+    Mediile bucket-urilor se calculează vectorizat (reduceat); singura buclă e peste bucket-uri,
+    fiecare evaluat vectorizat, pentru că alegerea depinde de punctul ales în bucket-ul anterior.
+    x și y trebuie să fie fără NaN (ChartSeries.valid elimină golurile): un NaN ar strica media
+    bucket-ului și np.argmax l-ar alege în fața oricărei arii reale.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    # n_out - 2 bucket-uri interioare [edges[i], edges[i+1]) între primul și ultimul punct
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    # Al treilea vârf al triunghiului: media bucket-ului următor (pentru ultimul - ultimul punct)
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+    
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax_, ay = x[a], y[a]
+        area = np.abs((ax_ - next_x[i]) * (y[lo:hi] - ay) - (ax_ - x[lo:hi]) * (next_y[i] - ay))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+def decimeaza_minmax(y, n_buckets):
+    """
+    Min/max pe bucket-uri egale ca număr de puncte, complet vectorizat: din fiecare bucket se
+    păstrează minimul și maximul (în ordinea timpului), deci niciun vârf nu se pierde.
+    Returnează indicii sortați (cel mult 2 * n_buckets + 2).
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_buckets < 1 or 2 * n_buckets >= n:
+        return np.arange(n)
+    
+    size = -(-n // n_buckets)
+    rows = -(-n // size)
+    grid = np.pad(y, (0, rows * size - n), constant_values=np.nan).reshape(rows, size)
+    nan = np.isnan(grid)
+    base = np.arange(rows) * size
+    imin = base + np.argmin(np.where(nan, np.inf, grid), axis=1)
+    imax = base + np.argmax(np.where(nan, -np.inf, grid), axis=1)
+    selected = np.unique(np.concatenate(([0, n - 1], imin, imax)))
+    return selected[selected < n]
+
+def date_la_numere(timestamps):
+    """Datetime-uri -> numere de zi matplotlib. Pentru liste de datetime, diferențele față de primul
+    element sunt de ~10x mai rapide decât date2num (care convertește întâi la datetime64)."""
+    if isinstance(timestamps, np.ndarray) or len(timestamps) == 0:
+        return mdates.date2num(timestamps)
+    first = timestamps[0]
+    offsets = np.fromiter(((t - first).total_seconds() for t in timestamps), dtype=np.float64, count=len(timestamps))
+    return mdates.date2num(first) + offsets / 86400.0
+
+def decimeaza_serie(x, y, puncte, metoda=CHART_DECIMATION):
+    """Indicii punctelor de desenat pentru ~puncte pixeli lățime (metoda: 'lttb', 'minmax' sau None)"""
+    if metoda == 'lttb':
+        return decimeaza_lttb(x, y, puncte)
+    if metoda == 'minmax':
+        return decimeaza_minmax(y, puncte)
+    return np.arange(len(y))
+
+# === DETALIU LA ZOOM (RE-INTEROGARE DOAR PE INTERVALUL VIZIBIL) ===
+ZOOM_DEBOUNCE_MS = 300       # Pauza după ultima modificare a limitelor (zoom/pan) înainte de interogare
+ZOOM_MAX_POINTS = 20000      # Puncte maxime pe intervalul vizibil aduse din BD pentru detaliu
+ZOOM_POLL_MS = 50            # Cât de des verifică fereastra rezultatul thread-ului de fundal
+
+def alege_rezolutie_detaliu(span_seconds, max_points=ZOOM_MAX_POINTS):
+    """Cea mai fină rezoluție care dă cel mult max_points puncte pe interval: (0, None) = date brute,
+    altfel (rezoluție, tabel rollup) - complementul lui alege_rezolutie, folosit la zoom"""
+    if span_seconds / SENSOR_SAMPLE_INTERVAL <= max_points:
+        return 0, None
+    for resolution, table in reversed(ROLLUP_RESOLUTIONS):
+        if span_seconds / resolution <= max_points:
+            return resolution, table
+    return ROLLUP_RESOLUTIONS[0]
+
+# === GRAFIC LIVE (CITIRI NOI DESENATE PRIN BLITTING) ===
+LIVE_PERIOD = "🔴 Live (ora curentă)"  # Opțiunea de perioadă din ChartsWindow
+LIVE_FPS = 2                  # Cadre pe secundă - citirile vin oricum la câteva secunde
+LIVE_WINDOW_SECONDS = 3600    # Fereastra glisantă afișată (punctele mai vechi ies din grafic)
+LIVE_RIGHT_MARGIN = 0.05      # Spațiu liber în dreapta, ca axa să nu se mute la fiecare citire
+
+# === GRAFIC PERSISTENT (O SINGURĂ FIGURĂ, ARTISTE ACTUALIZATE PE LOC) ===
+HOVER_MAX_FPS = 60  # Hover-ul se procesează cel mult la rata de reîmprospătare a ecranului
+CHART_POLL_MS = 50  # Cât de des verifică fereastra dacă thread-ul de fundal a pregătit graficul
+class ChartRenderer:
+    """
+    Figura unei ferestre de grafice, creată o singură dată. La schimbarea parametrului,
+    perioadei sau tipului de grafic se actualizează doar artistele afectate (set_data pe linie,
+    zonele optimale doar când se schimbă parametrul, limitele prin relim) - nu se mai creează
+    câte o figură + canvas + toolbar nouă la fiecare schimbare.
+    Nu depinde de Tk: implicit are un canvas Agg, înlocuit de FigureCanvasTkAgg în ChartsWindow.
+    """
+    
+    HOUR_LABEL_STYLE = dict(xytext=(0, -25), textcoords='offset points', ha='center', va='top',
+                            fontsize=8, color='#2C3E50', rotation=45, alpha=0.7)
+    # CERINȚA SPECIALĂ: verde mai viu pentru zona optimală, portocaliu în loc de galben pentru cea acceptabilă
+    RANGE_SPAN_STYLE = {'optimal': dict(alpha=0.3, color='#00FF00'),
+                        'acceptable': dict(alpha=0.25, color='#FF8C00')}
+    
+    def __init__(self, figsize=(16, 8)):
+        # Configurare matplotlib pentru aspect profesional
+        plt.style.use('seaborn-v0_8-whitegrid')
+        
+        # Figure direct (nu plt.subplots) - nu rămâne înregistrată în pyplot după închiderea ferestrei
+        self.figure = Figure(figsize=figsize)
+        FigureCanvasAgg(self.figure)
+        self.figure.patch.set_facecolor('#f8f9fa')
+        self.ax = self.figure.add_subplot(111)
+        self.ax.xaxis_date()
+        self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M\n%d/%m'))
+        self.ax.set_xlabel('📅 Timp (🕐 ore exacte afișate)', fontsize=12, fontweight='bold')
+        self.title = self.ax.set_title('', fontsize=16, fontweight='bold', pad=20)
+        
+        self.line, = self.ax.plot([], [], zorder=3)
+        self.fill = None
+        self.range_spans = []
+        self.hour_labels = []
+        
+        # Adnotarea de hover e unică - doar mutată și ascunsă, nu recreată la fiecare mișcare
+        self.hover_annotation = self.ax.annotate(
+            '', xy=(0, 0), xycoords='data', xytext=(20, 20), textcoords='offset points',
+            bbox=dict(boxstyle='round,pad=0.8', fc='white', alpha=0.9),
+            arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'),
+            fontsize=10, fontweight='bold', zorder=10, visible=False)
+        
+        # Datele afișate curent (valorile originale, nu cele netezite) - citite de hover;
+        # hover_x = aceleași momente ca numere de zi, sortate - căutare binară (np.searchsorted)
+        self.timestamps = np.empty(0, dtype='datetime64[s]')
+        self.values = np.empty(0)
+        self.hover_x = np.empty(0)
+        self._hover_idx = None
+        self.info = None
+        self.param = None
+        self.decimation = CHART_DECIMATION
+        self.plotted_points = 0
+        self.data_resolution = 0
+        # Seria de ansamblu (cea de la ultimul update) și detaliul adus la zoom peste ea
+        self._base_timestamps = self.timestamps
+        self._base_values = self.values
+        self._overview_x = np.empty(0)
+        self._overview_y = np.empty(0)
+        self._base_title = ''
+        self.detail_range = None
+        self.detail_resolution = None
+        # Modul live: seria completă (nedecimată) la care se adaugă citirile noi, fundalul pentru blit
+        self._full_x = np.empty(0)
+        self._full_y = np.empty(0)
+        self.live = False
+        self._live_window = LIVE_WINDOW_SECONDS / 86400.0
+        self._background = None
+        self._draw_cid = None
+        self._ranges_key = None
+        self._legend_key = None
+    
+    def _update_ranges(self, param, show_ranges):
+        """Redesenează zonele optimale/acceptabile doar dacă s-a schimbat parametrul sau bifa"""
+        key = (param, show_ranges)
+        if key == self._ranges_key:
+            return False
+        self._ranges_key = key
+        for span in self.range_spans:
+            span.remove()
+        self.range_spans = []
+        
+        # === CERINȚA SPECIALĂ: DESENEAZĂ RANGE-URILE CU CULORI VII ===
+        if show_ranges and param in range_classifier:
+            acceptable_min, optimal_min, optimal_max, acceptable_max = range_classifier.limits[param]
+            labels = {'optimal': f'🎯 Zona optimală ({optimal_min}-{optimal_max})',
+                      'acceptable': f'⚠️ Zona acceptabilă ({acceptable_min}-{acceptable_max})'}
+            # Benzile vin din clasificator - aceleași limite ca procentele și culorile; o etichetă pe zonă
+            for low, high, zone in range_classifier.spans(param):
+                self.range_spans.append(self.ax.axhspan(
+                    low, high, label=labels.pop(zone, None), zorder=1, **self.RANGE_SPAN_STYLE[zone]))
+        return True
+    
+    def _update_hour_labels(self, x, timestamps, values):
+        """CERINȚA SPECIALĂ: ore exacte sub puncte (toate până la 50, altfel ~20 la intervale egale)"""
+        for label in self.hour_labels:
+            label.remove()
+        step = 1 if len(timestamps) <= 50 else max(1, len(timestamps) // 20)
+        labels = np.datetime_as_string(timestamps[::step], unit='m')
+        self.hour_labels = [
+            self.ax.annotate(label[-5:], xy=(x[i], values[i]), **self.HOUR_LABEL_STYLE)
+            for label, i in zip(labels.tolist(), range(0, len(timestamps), step))
+        ]
+    
+    @staticmethod
+    def prepare(timestamps, values, plot_values, points, decimation=CHART_DECIMATION):
+        """Partea costisitoare a unui update, fără artiste matplotlib (poate rula pe un thread de fundal):
+        conversia momentelor în numere de zi și decimarea la ~points pixeli. Rezultatul se dă lui update."""
+        timestamps = np.asarray(timestamps, dtype='datetime64[s]')
+        x = date_la_numere(timestamps)
+        y = np.asarray(plot_values, dtype=np.float64)
+        return {
+            'timestamps': timestamps,
+            'values': np.asarray(values, dtype=np.float64),
+            'x': x,
+            'y': y,
+            'selected': decimeaza_serie(x, y, points, decimation),
+        }
+    
+    def update(self, timestamps, values, plot_values, info, param, period_text, chart_type="Linie",
+               show_ranges=True, show_grid=True, data_resolution=0, prepared=None):
+        """Actualizează pe loc figura cu o nouă serie (array-uri datetime64 / float, ex: ChartSeries.valid).
+        Cu prepared (rezultatul lui prepare, calculat dinainte) se sar conversia și decimarea.
+        Returnează linia (Line2D) persistentă."""
+        ax = self.ax
+        if prepared is None:
+            prepared = self.prepare(timestamps, values, plot_values, self.target_points(), self.decimation)
+        timestamps, values = prepared['timestamps'], prepared['values']
+        self.timestamps, self.values, self.info, self.param = timestamps, values, info, param
+        self._base_timestamps, self._base_values = timestamps, values
+        self.data_resolution = data_resolution
+        self.detail_range = None
+        self.detail_resolution = None
+        self.hide_hover()
+        
+        ranges_changed = self._update_ranges(param, show_ranges)
+        
+        # === DECIMARE: doar ~lățimea axelor în pixeli ajunge la desenare ===
+        plot_x, plot_y, selected = prepared['x'], prepared['y'], prepared['selected']
+        self._full_x, self._full_y = plot_x, plot_y
+        self.hover_x = plot_x
+        plot_x, plot_y = plot_x[selected], plot_y[selected]
+        self.plotted_points = len(selected)
+        self._overview_x, self._overview_y = plot_x, plot_y
+        
+        # === CERINȚA SPECIALĂ: GRAFICUL (DOAR 2 TIPURI) - aceeași linie, doar datele se schimbă ===
+        self.line.set_data(plot_x, plot_y)
+        self.line.set_color(info['color'])
+        if chart_type == "Linie":
+            self.line.set_linewidth(2.5)
+            self.line.set_label(f"{info['icon']} {info['label']}")
+        else:
+            self.line.set_linewidth(2)
+            self.line.set_label('_nolegend_')
+        
+        # Limitele se recalculează din linie + zone; umplerea (până la 0) își adaugă singură limitele
+        if self.fill is not None:
+            self.fill.remove()
+            self.fill = None
+        ax.relim()
+        if chart_type == "Zonă umplută":
+            self.fill = ax.fill_between(plot_x, plot_y, alpha=0.3, color=info['color'], zorder=2)
+        ax.autoscale_view()
+        
+        self._update_hour_labels(self._full_x, timestamps, values)
+        
+        # === FORMATARE GRAFIC PROFESIONAL ===
+        # COINCIDENȚĂ EXACTĂ: Titlu actualizat cu informații despre eliminarea toleranțelor
+        title_text = f'{info["icon"]} Evoluția - {info["label"]} ({period_text}) - COINCIDENȚĂ EXACTĂ'
+        if param in ['lumina', 'calitate_aer']:
+            title_text += f' | Matching precis obligatoriu'
+        if data_resolution:
+            title_text += f' | Medii la {data_resolution // 60} min'
+        if self.plotted_points < len(timestamps):
+            title_text += f' | {self.plotted_points}/{len(timestamps)} puncte ({self.decimation.upper()})'
+        self._base_title = title_text
+        self.title.set_text(title_text)
+        
+        # Grid personalizabil
+        if show_grid:
+            ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.8)
+        else:
+            ax.grid(False)
+        
+        # Legendă frumoasă - refăcută doar când se schimbă conținutul ei
+        legend_key = (param, show_ranges, chart_type)
+        if legend_key != self._legend_key:
+            self._legend_key = legend_key
+            ax.legend(loc='upper left', framealpha=0.9, fancybox=True, shadow=True)
+        
+        # Formatare axa timpului inteligentă
+        if len(timestamps) > 50:
+            ax.xaxis.set_major_locator(mdates.HourLocator(interval=max(1, len(timestamps)//20)))
+        elif len(timestamps) > 20:
+            ax.xaxis.set_major_locator(mdates.MinuteLocator(interval=max(5, len(timestamps)//10)))
+        else:
+            ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+        
+        # Rotează etichele pentru citire mai bună
+        plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
+        
+        # CERINȚA SPECIALĂ: marginile pentru orele exacte - recalculate doar când se schimbă eticheta axei Y
+        if ranges_changed:
+            ax.set_ylabel(f'{info["icon"]} {info["label"]} ({info["unit"]})', fontsize=12, fontweight='bold')
+            self.figure.tight_layout(pad=4.0)  # Mai mult spațiu pentru orele de jos
+        
+        return self.line
+    
+    # === DETALIU LA ZOOM ===
+    def overview_span(self):
+        """Intervalul (în numere de zi matplotlib) acoperit de seria de ansamblu"""
+        if len(self._overview_x) == 0:
+            return None
+        return self._overview_x[0], self._overview_x[-1]
     
-    def on_closing(self):
-        """Gestionează închiderea aplicației"""
-        print("🔄 Închidere aplicație cu COINCIDENȚĂ EXACTĂ...")
-        try:
-            # Oprește toate sistemele (FĂRĂ ZGOMOT)
-            self.sensor_manager.stop_reading()
-            if RASPBERRY_PI:
-                # Nu mai avem GPIO pentru zgomot de curățat
-                print("⚠️ Cleanup GPIO - zgomot nu a fost configurat")
-                GPIO.cleanup()
-            conn.close()
-            print("✅ Cleanup complet realizat cu COINCIDENȚĂ EXACTĂ")
-        except Exception as e:
-            print(f"Eroare la închidere: {e}")
-        finally:
-            self.root.quit()
-            self.root.destroy()
-            print("👋 MainApplication închis complet cu COINCIDENȚĂ EXACTĂ")
+    def needs_detail(self, x0, x1, resolution):
+        """True dacă intervalul vizibil [x0, x1] merită re-interogat la rezoluția dată"""
+        span = self.overview_span()
+        if span is None or (x0 <= span[0] and x1 >= span[1]):
+            return False  # Se vede toată seria - ajunge cea de ansamblu
+        if self.detail_range is not None and self.detail_resolution == resolution:
+            if self.detail_range[0] <= max(x0, span[0]) and self.detail_range[1] >= min(x1, span[1]):
+                return False  # Detaliul curent acoperă deja ce se vede
+        # Ansamblul e deja la rezoluție completă și nedecimat - nu există mai mult detaliu
+        return not (self.data_resolution == resolution and self.plotted_points == len(self._base_timestamps))
+    
+    def _set_plot_data(self, plot_x, plot_y):
+        """Schimbă datele liniei (și ale umplerii) fără a atinge limitele vizibile ale axelor"""
+        self.line.set_data(plot_x, plot_y)
+        if self.fill is not None:
+            xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
+            color = self.line.get_color()
+            self.fill.remove()
+            self.fill = self.ax.fill_between(plot_x, plot_y, alpha=0.3, color=color, zorder=2)
+            self.ax.set_xlim(xlim, emit=False, auto=None)
+            self.ax.set_ylim(ylim, emit=False, auto=None)
+    
+    def show_detail(self, timestamps, values, plot_values, resolution):
+        """Înlocuiește, doar pe intervalul adus din BD, seria de ansamblu cu cea detaliată
+        (în afara lui rămâne ansamblul, ca pan-ul să nu lase goluri până la următoarea interogare)"""
+        if len(timestamps) == 0:
+            return False
+        timestamps = np.asarray(timestamps, dtype='datetime64[s]')
+        detail_x = date_la_numere(timestamps)
+        detail_y = np.asarray(plot_values, dtype=np.float64)
+        lo, hi = detail_x[0], detail_x[-1]
+        selected = decimeaza_serie(detail_x, detail_y, self.target_points(), self.decimation)
+        left = self._overview_x < lo
+        right = self._overview_x > hi
+        self._set_plot_data(np.concatenate((self._overview_x[left], detail_x[selected], self._overview_x[right])),
+                            np.concatenate((self._overview_y[left], detail_y[selected], self._overview_y[right])))
+        
+        # Hover-ul citește valorile originale: detaliul înlocuiește aceeași porțiune din seria de bază
+        i0 = int(np.searchsorted(self._full_x, lo, side='left'))
+        i1 = int(np.searchsorted(self._full_x, hi, side='right'))
+        self.timestamps = np.concatenate((self._base_timestamps[:i0], timestamps, self._base_timestamps[i1:]))
+        self.values = np.concatenate((self._base_values[:i0], np.asarray(values, dtype=np.float64),
+                                      self._base_values[i1:]))
+        self.hover_x = np.concatenate((self._full_x[:i0], detail_x, self._full_x[i1:]))
+        
+        self.detail_range = (lo, hi)
+        self.detail_resolution = resolution
+        detail_text = 'rezoluție completă' if not resolution else f'medii la {resolution // 60} min'
+        self.title.set_text(f'{self._base_title} | 🔍 Detaliu: {detail_text}')
+        self.hide_hover()
+        return True
+    
+    def show_overview(self):
+        """Revine la seria de ansamblu (ex: după "Home" din toolbar); True dacă s-a schimbat ceva"""
+        if self.detail_range is None:
+            return False
+        self._set_plot_data(self._overview_x, self._overview_y)
+        self.timestamps, self.values = self._base_timestamps, self._base_values
+        self.hover_x = self._full_x
+        self.detail_range = None
+        self.detail_resolution = None
+        self.title.set_text(self._base_title)
+        self.hide_hover()
+        return True
+    
+    # === MODUL LIVE (BLITTING) ===
+    def start_live(self, window_seconds=LIVE_WINDOW_SECONDS):
+        """Linia (și umplerea) devin artiste animate: o desenare completă salvează fundalul,
+        iar fiecare cadru nou doar restaurează fundalul și redesenează linia (blit)."""
+        self.live = True
+        self._live_window = window_seconds / 86400.0
+        self.line.set_data(self._full_x, self._full_y)
+        self.line.set_animated(True)
+        if self.fill is not None:
+            self.fill.set_animated(True)
+        # Limite fixe (fără autoscale) - se mută explicit doar când seria iese din ele
+        self.ax.set_xlim(self.ax.get_xlim())
+        self.ax.set_ylim(self.ax.get_ylim())
+        if self._draw_cid is None:
+            self._draw_cid = self.figure.canvas.mpl_connect('draw_event', self._on_draw)
+    
+    def stop_live(self):
+        if not self.live:
+            return
+        self.live = False
+        self.line.set_animated(False)
+        if self.fill is not None:
+            self.fill.set_animated(False)
+        if self._draw_cid is not None:
+            self.figure.canvas.mpl_disconnect(self._draw_cid)
+            self._draw_cid = None
+        self._background = None
+    
+    def _on_draw(self, event):
+        """După fiecare desenare completă: salvează fundalul (fără artistele animate) și le adaugă peste"""
+        if not self.live:
+            return
+        self._background = self.figure.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+    
+    def _draw_animated(self):
+        if self.fill is not None:
+            self.ax.draw_artist(self.fill)
+        self.ax.draw_artist(self.line)
+    
+    def append_live(self, timestamps, values):
+        """Adaugă citirile noi la linie (fereastră glisantă de lungime fixă - cost constant pe cadru).
+        Returnează True dacă axele s-au mutat/extins și e nevoie de o desenare completă."""
+        timestamps = np.asarray(timestamps, dtype='datetime64[s]')
+        new_x = date_la_numere(timestamps)
+        new_y = np.asarray(values, dtype=np.float64)
+        last_x = self._full_x[-1] if len(self._full_x) else None
+        if last_x is not None:
+            # Citirile deja prezente (ex: sosite în timpul încărcării inițiale) se ignoră
+            keep = new_x > last_x
+            new_x, new_y, timestamps = new_x[keep], new_y[keep], timestamps[keep]
+        if len(new_x) == 0:
+            return False
+        
+        full_x = np.concatenate((self._full_x, new_x))
+        full_y = np.concatenate((self._full_y, new_y))
+        dropped = int(np.searchsorted(full_x, full_x[-1] - self._live_window, side='left'))
+        self._full_x, self._full_y = full_x[dropped:], full_y[dropped:]
+        self.timestamps = np.concatenate((self.timestamps, timestamps))[dropped:]
+        self.values = np.concatenate((self.values, new_y))[dropped:]
+        self._base_timestamps, self._base_values = self.timestamps, self.values
+        self.hover_x = self._full_x
+        self.line.set_data(self._full_x, self._full_y)
+        
+        redraw = False
+        # Axa X urmărește citirile noi doar dacă ultimul punct era vizibil (nu și după un zoom în trecut)
+        x0, x1 = self.ax.get_xlim()
+        if last_x is None or last_x <= x1 < self._full_x[-1]:
+            width = x1 - x0
+            right = self._full_x[-1] + width * LIVE_RIGHT_MARGIN
+            self.ax.set_xlim(right - width, right)
+            redraw = True
+        # Axa Y se extinde doar când o valoare nouă iese din limite
+        y0, y1 = self.ax.get_ylim()
+        low, high = np.nanmin(new_y), np.nanmax(new_y)
+        if low < y0 or high > y1:
+            pad = 0.05 * max(high - low, y1 - y0, 1e-9)
+            self.ax.set_ylim(min(y0, low - pad), max(y1, high + pad))
+            redraw = True
+        
+        if self.fill is not None:
+            self.fill.remove()
+            self.fill = self.ax.fill_between(self._full_x, self._full_y, alpha=0.3, color=self.line.get_color(),
+                                             zorder=2, animated=True)
+        return redraw
+    
+    def blit(self):
+        """Cadru live ieftin: fundalul salvat + doar artistele animate"""
+        canvas = self.figure.canvas
+        if self._background is None:
+            canvas.draw_idle()
+            return
+        canvas.restore_region(self._background)
+        self._draw_animated()
+        canvas.blit(self.ax.bbox)
+    
+    def target_points(self):
+        """Numărul de puncte de desenat: lățimea zonei de desen în pixeli"""
+        return max(100, int(self.ax.bbox.width))
+    
+    def nearest_index(self, x):
+        """Indexul punctului cel mai apropiat de x (număr de zi matplotlib) - O(log n)"""
+        xs = self.hover_x
+        if len(xs) == 0:
+            return None
+        i = int(np.searchsorted(xs, x))
+        if i == 0:
+            return 0
+        if i == len(xs):
+            return len(xs) - 1
+        return i if xs[i] - x < x - xs[i - 1] else i - 1
+    
+    def show_hover(self, idx):
+        """Mută adnotarea de hover pe punctul idx (valoarea originală, nu cea netezită).
+        Întoarce False dacă adnotarea era deja pe acest punct (nu e nevoie de redesenare)."""
+        if idx == self._hover_idx and self.hover_annotation.get_visible():
+            return False
+        self._hover_idx = idx
+        info = self.info
+        closest_time = self.timestamps[idx].item()  # datetime64[s] -> datetime
+        closest_value = self.values[idx]
+        
+        # Format frumos pentru hover cu ora exactă - COINCIDENȚĂ EXACTĂ
+        time_str = closest_time.strftime("%d/%m/%Y %H:%M:%S")
+        hover_text = f'📅 {time_str}\n{info["icon"]} {closest_value:.1f}{info["unit"]}\n🕐 Ora exactă: {closest_time.strftime("%H:%M:%S")}\n🎯 COINCIDENȚĂ EXACTĂ'
+        
+        # COINCIDENȚĂ EXACTĂ: Adaugă informații despre eliminarea toleranțelor
+        if self.param in ['lumina', 'calitate_aer']:
+            hover_text += f'\n🎯 Matching precis (fără toleranțe)'
+        
+        annotation = self.hover_annotation
+        annotation.set_text(hover_text)
+        annotation.xy = (self.hover_x[idx], closest_value)
+        annotation.get_bbox_patch().set_edgecolor(info['color'])
+        annotation.arrow_patch.set_color(info['color'])
+        annotation.set_visible(True)
+        return True
+    
+    def hide_hover(self):
+        """Ascunde adnotarea de hover; întoarce True dacă era vizibilă (trebuie redesenat)"""
+        self._hover_idx = None
+        if not self.hover_annotation.get_visible():
+            return False
+        self.hover_annotation.set_visible(False)
+        return True
+
 class ChartsWindow:
+    # Culori și informații pentru fiecare parametru - COINCIDENȚĂ EXACTĂ
+    PARAM_INFO = {
+        'temperatura': {'color': '#E74C3C', 'unit': '°C', 'label': 'Temperatură', 'icon': '🌡️'},
+        'umiditate': {'color': '#3498DB', 'unit': '%', 'label': 'Umiditate', 'icon': '💧'},
+        'lumina': {'color': '#F39C12', 'unit': ' lux', 'label': 'Lumină (EXACTĂ)', 'icon': '💡'},
+        'calitate_aer': {'color': '#27AE60', 'unit': ' AQI', 'label': 'Calitate Aer (EXACTĂ)', 'icon': '🌬️'}
+    }
+    
+    @classmethod
+    def headless(cls, sensor_manager=None):
+        """Instanță fără fereastră Tk - doar accesul la date și construcția figurilor (benchmark, export)"""
+        charts = cls.__new__(cls)
+        charts.parent = None
+        charts.sensor_manager = sensor_manager
+        charts.window = None
+        charts.current_canvas = None
+        charts.current_figure = None
+        charts.renderer = None
+        charts.current_series = None
+        charts.current_period = None
+        charts._series_cache = {}
+        charts._stats_cache = {}
+        charts.data_resolution = 0
+        return charts
+    
     def __init__(self, parent, sensor_manager):
         self.parent = parent
         self.sensor_manager = sensor_manager
@@ -1804,13 +3986,45 @@ class ChartsWindow:
         self.window.title("📈 Istoric Grafic - Analiză Avansată Parametri (Coincidență Exactă)")
         self.window.geometry("1400x900")
         self.window.configure(bg="#f0f0f0")
-        self.window.protocol("WM_DELETE_WINDOW", self.window.destroy)
+        self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
         self.window.transient(parent)  # Fereastră modală
         
-        # Variabile pentru grafic
+        # Variabile pentru grafic - figura/canvas-ul se creează o singură dată (vezi ChartRenderer)
         self.current_canvas = None
         self.current_figure = None
-        self.hover_annotation = None
+        self.renderer = None
+        self.toolbar = None
+        self.toolbar_frame = None
+        self.current_param = None
+        # Seria graficului curent (ChartSeries) - refolosită de statisticile detaliate și de exportul CSV
+        self.current_series = None
+        self.current_period = None
+        # Cache per perioadă (ore -> ChartSeries cu toți parametrii) - schimbarea parametrului nu interoghează BD
+        self._series_cache = {}
+        # Statisticile calculate (perioadă, parametru) -> (versiunea seriei, SeriesStats)
+        self._stats_cache = {}
+        
+        # Detaliu la zoom: interogarea rulează pe un thread de fundal, rezultatul vine printr-o coadă
+        self._zoom_after = None
+        self._zoom_generation = 0
+        self._zoom_results = queue.Queue()
+        
+        # Hover limitat la HOVER_MAX_FPS (vezi on_hover)
+        self._hover_after = None
+        self._hover_event = None
+        self._last_hover = 0.0
+        
+        # Pregătirea graficului (interogare, netezire, decimare, statistici) rulează pe un thread de fundal;
+        # rezultatul vine printr-o coadă, iar cererile depășite de o schimbare ulterioară se abandonează
+        self._chart_generation = 0
+        self._chart_results = queue.Queue()
+        self._chart_poll_after = None
+        
+        # Modul live: citirile noi sosesc din thread-ul de achiziție într-o coadă, golită la fiecare cadru
+        self.live_active = False
+        self._live_after = None
+        self._live_queue = queue.Queue()
+        self.data_resolution = 0  # 0 = date brute, altfel rezoluția rollup-ului în secunde
         
         # Titlu principal
         title_label = tk.Label(self.window, text="📈 Analiză Grafică Avansată - Evoluția Parametrilor (Coincidență Exactă)", 
@@ -1861,7 +4075,7 @@ class ChartsWindow:
         
         self.period_var = tk.StringVar(value="Ultima oră")
         period_options = [
-            "Ultima oră", "Ultimele 3 ore", "Ultimele 6 ore", 
+            LIVE_PERIOD, "Ultima oră", "Ultimele 3 ore", "Ultimele 6 ore", 
             "Ultima zi", "Ultimele 3 zile", "Ultima săptămână", "Toate datele"
         ]
         period_dropdown = ttk.Combobox(row1_frame, textvariable=self.period_var,
@@ -1891,10 +4105,21 @@ class ChartsWindow:
                 font=("Arial", 14)).pack(side="left", padx=10)
         
         # Smoothing
-        self.smooth_var = tk.BooleanVar(value=False)
-        smooth_check = tk.Checkbutton(row2_frame, text="🌊 Netezire", variable=self.smooth_var,
-                                    bg="#f0f0f0", font=("Arial", 10), command=self.on_parameter_change)
-        smooth_check.pack(side="left", padx=5)
+        tk.Label(row2_frame, text="🌊 Netezire:", bg="#f0f0f0",
+                font=("Arial", 10)).pack(side="left", padx=(5, 2))
+        self.smooth_var = tk.StringVar(value=NETEZIRE_FARA)
+        smooth_dropdown = ttk.Combobox(row2_frame, textvariable=self.smooth_var,
+                                       values=[NETEZIRE_FARA] + list(FILTRE_NETEZIRE),
+                                       state="readonly", width=17)
+        smooth_dropdown.pack(side="left", padx=2)
+        smooth_dropdown.bind("<<ComboboxSelected>>", self.on_parameter_change)
+        
+        # Fereastra filtrului (puncte, impar)
+        self.smooth_window_var = tk.IntVar(value=NETEZIRE_FEREASTRA_IMPLICITA)
+        smooth_window = tk.Spinbox(row2_frame, from_=3, to=51, increment=2, width=3,
+                                   textvariable=self.smooth_window_var, state="readonly",
+                                   command=self.on_parameter_change)
+        smooth_window.pack(side="left", padx=(2, 5))
         
         # Grid
         self.grid_var = tk.BooleanVar(value=True)
@@ -1913,7 +4138,7 @@ class ChartsWindow:
         row3_frame.pack(fill="x", pady=10)
         
         # Butoane de acțiune
-        refresh_btn = tk.Button(row3_frame, text="🔄 Actualizează", command=self.on_parameter_change,
+        refresh_btn = tk.Button(row3_frame, text="🔄 Actualizează", command=self.refresh_chart,
                                bg="#3498DB", fg="white", font=("Arial", 10, "bold"), width=12)
         refresh_btn.pack(side="left", padx=5)
         
@@ -1929,11 +4154,20 @@ class ChartsWindow:
                                   bg="#E67E22", fg="white", font=("Arial", 10, "bold"), width=12)
         reset_zoom_btn.pack(side="left", padx=5)
         
+        # Indicator de încărcare - vizibil cât timp graficul se pregătește în fundal
+        self.progress = ttk.Progressbar(row3_frame, mode="indeterminate", length=150)
+        self.loading_label = tk.Label(row3_frame, text="⏳ Se încarcă datele...", bg="#f0f0f0",
+                                      fg="#7F8C8D", font=("Arial", 10, "italic"))
+        
         # === CONTAINERUL PENTRU GRAFIC ===
         # Frame pentru grafic cu scroll dacă e necesar
         self.chart_container = tk.Frame(self.window, bg="#f0f0f0", relief="sunken", bd=2)
         self.chart_container.pack(fill="both", expand=True, padx=20, pady=10)
         
+        # Mesajele (fără date, parametru dezactivat) se afișează în locul canvas-ului, fără a-l distruge
+        self.message_label = tk.Label(self.chart_container, text="", font=("Arial", 14),
+                                      bg="#f0f0f0", fg="#7F8C8D", justify="center")
+        
         # === PANOUL DE STATISTICI ===
         self.stats_frame = tk.LabelFrame(self.window, text="📈 Statistici în Timp Real (Coincidență Exactă)", 
                                        bg="#f0f0f0", font=("Arial", 10, "bold"), padx=10, pady=5)
@@ -1947,49 +4181,456 @@ class ChartsWindow:
         self.create_chart()
     
     def get_data_for_period(self, hours=1):
-        """Obține datele din baza de date pentru perioada specificată - OPTIMIZAT"""
+        """Obține datele din baza de date pentru perioada specificată - OPTIMIZAT
+        
+        Pentru perioadele lungi se alege cel mai grosier rollup care dă încă suficiente
+        puncte (CHART_MIN_POINTS); perioadele scurte folosesc datele brute.
+        Returnează un ChartSeries (coloane NumPy tipizate, fără parsare de text); rezoluția e în
+        series.resolution - metoda nu modifică starea ferestrei, deci poate rula pe thread-ul de fundal.
+        """
         try:
-            if hours == -1:  # Toate datele
-                cursor.execute("""
-                    SELECT timestamp, temperatura, umiditate, lumina, calitate_aer, zgomot
-                    FROM sensor_data 
-                    ORDER BY timestamp DESC
-                    LIMIT 5000
+            now_epoch = int(time.time())
+            
+            # Perioade scurte: direct din buffer-ul circular al SensorManager (fără BD)
+            if hours != -1 and self.sensor_manager is not None:
+                series = self._get_buffered_data(now_epoch - hours * 3600)
+                if series is not None:
+                    return series
+            
+            if hours == -1:
+                # Începutul istoricului din rollup-ul orar (interogare pe cheia primară)
+                cursor = db.execute(f"SELECT MIN(bucket_epoch) FROM {ROLLUP_RESOLUTIONS[0][1]}")
+                start_epoch = cursor.fetchone()[0]
+            else:
+                start_epoch = now_epoch - hours * 3600
+            
+            if start_epoch is not None:
+                resolution, table = alege_rezolutie(now_epoch - start_epoch)
+                if table is not None:
+                    series = self._get_rollup_data(table, resolution, start_epoch)
+                    if series is not None:
+                        return series
+            
+            # Modul deadband: seria în trepte se reconstruiește din rândurile salvate
+            if SENSOR_STORAGE_MODE == 'deadband':
+                return self._get_deadband_data(hours, now_epoch)
+            
+            # Interogări sargabile: range scan pe idx_sensor_data_epoch, fără funcții pe coloană
+            if hours == -1:  # Toate datele (cele mai noi 5000, în ordine cronologică)
+                cursor = db.execute("""
+                    SELECT timestamp_epoch, temperatura, umiditate, lumina, calitate_aer, zgomot
+                    FROM (
+                        SELECT timestamp_epoch, temperatura, umiditate, lumina, calitate_aer, zgomot
+                        FROM sensor_data 
+                        WHERE timestamp_epoch IS NOT NULL
+                        ORDER BY timestamp_epoch DESC
+                        LIMIT 5000
+                    )
+                    ORDER BY timestamp_epoch ASC
                 """)
             else:
-                cursor.execute("""
-                    SELECT timestamp, temperatura, umiditate, lumina, calitate_aer, zgomot
+                start_epoch = int(time.time()) - hours * 3600
+                cursor = db.execute("""
+                    SELECT timestamp_epoch, temperatura, umiditate, lumina, calitate_aer, zgomot
                     FROM sensor_data 
-                    WHERE datetime(timestamp) >= datetime('now', '-{} hours')
-                    ORDER BY timestamp ASC
-                """.format(hours))
+                    WHERE timestamp_epoch >= ?
+                    ORDER BY timestamp_epoch ASC
+                """, (start_epoch,))
             
-            return cursor.fetchall()
+            return ChartSeries.from_rows(cursor.fetchall())
         except Exception as e:
             print(f"Eroare la citirea datelor: {e}")
-            return []
+            return ChartSeries.empty()
+    
+    def _get_deadband_data(self, hours, now_epoch, max_points=5000):
+        """Datele brute pentru modul deadband, reconstruite pe grila de citire (aceleași rânduri ca în modul complet).
+        Pentru "Toate datele" se folosesc cele mai noi max_points rânduri salvate, pe o grilă rărită."""
+        columns = "timestamp_epoch, temperatura, umiditate, lumina, calitate_aer, zgomot"
+        step = SENSOR_SAMPLE_INTERVAL
+        if hours == -1:
+            cursor = db.execute(f"""
+                SELECT {columns} FROM (
+                    SELECT {columns} FROM sensor_data
+                    WHERE timestamp_epoch > 0
+                    ORDER BY timestamp_epoch DESC
+                    LIMIT ?
+                )
+                ORDER BY timestamp_epoch ASC
+            """, (max_points,))
+            rows = cursor.fetchall()
+            if not rows:
+                return ChartSeries.empty()
+            start_epoch = rows[0][0]
+            step = max(step, -(-(now_epoch - start_epoch) // max_points))
+        else:
+            return self._get_deadband_range(now_epoch - hours * 3600, now_epoch)
+        
+        return self._reconstruct_deadband_rows(rows, start_epoch, now_epoch, step)
+    
+    def _get_deadband_range(self, start_epoch, end_epoch):
+        """Seria deadband reconstruită pe intervalul [start_epoch, end_epoch] (range scan pe index)"""
+        columns = "timestamp_epoch, temperatura, umiditate, lumina, calitate_aer, zgomot"
+        # Ultimul rând dinaintea perioadei dă valoarea de la început (un singur seek pe index)
+        cursor = db.execute(f"""
+            SELECT {columns} FROM sensor_data
+            WHERE timestamp_epoch > 0 AND timestamp_epoch < ?
+            ORDER BY timestamp_epoch DESC
+            LIMIT 1
+        """, (start_epoch,))
+        rows = cursor.fetchall()
+        cursor = db.execute(f"""
+            SELECT {columns} FROM sensor_data
+            WHERE timestamp_epoch BETWEEN ? AND ?
+            ORDER BY timestamp_epoch ASC
+        """, (start_epoch, end_epoch))
+        rows += cursor.fetchall()
+        if not rows:
+            return ChartSeries.empty()
+        return self._reconstruct_deadband_rows(rows, start_epoch, end_epoch, SENSOR_SAMPLE_INTERVAL)
+    
+    def _reconstruct_deadband_rows(self, rows, start_epoch, end_epoch, step):
+        """Rândurile salvate -> seria în trepte, direct pe coloane"""
+        stored = np.array(rows, dtype=np.float64)  # NULL -> nan
+        epochs, values = reconstruieste_serie_trepte(stored[:, 0], stored[:, 1:], start_epoch, end_epoch, step)
+        return ChartSeries.from_matrix(epochs, values)
+    
+    def _get_buffered_data(self, start_epoch):
+        """Citirile din buffer-ul în memorie, copiate pe coloane direct din vederea fără copiere
+        (reluat dacă între timp a sosit o citire - toate coloanele vin din aceleași citiri).
+        Returnează None dacă buffer-ul nu acoperă toată perioada (ex: aplicația abia a pornit)."""
+        zgomot = float(self.sensor_manager.current_data['zgomot'])
+        def columns(window):
+            series = {param: window[param].astype(np.float64) for param in CHART_COLUMNS if param != 'zgomot'}
+            series['zgomot'] = np.full(len(window), zgomot)
+            return window['epoch'].copy(), series
+        result = self.sensor_manager.recent_readings.read(start_epoch, columns, complete=True)
+        if result is None:
+            return None
+        return ChartSeries(*result)
+    
+    def _get_rollup_data(self, table, resolution, start_epoch, end_epoch=None):
+        """Citește mediile pe bucket din rollup, ca ChartSeries cu rezoluția rollup-ului.
+        Returnează None dacă rollup-ul nu acoperă perioada (ex: backfill-ul nu a fost rulat)."""
+        cursor = db.execute(f"SELECT MIN(bucket_epoch) FROM {table}")
+        rollup_start = cursor.fetchone()[0]
+        cursor = db.execute("SELECT MIN(timestamp_epoch) FROM sensor_data WHERE timestamp_epoch > 0")
+        raw_start = cursor.fetchone()[0]
+        
+        if rollup_start is None or (raw_start is not None and rollup_start > max(start_epoch, raw_start) + resolution):
+            print(f"⚠️ {table} nu acoperă perioada - folosesc datele brute "
+                  f"(rulează: python APLICATIA_FUNCTIONALA.py --backfill-rollups)")
+            return None
+        
+        averages = ", ".join(f"{p}_sum / {p}_count" for p in ROLLUP_PARAMS)
+        cursor = db.execute(f"""
+            SELECT bucket_epoch, {averages}, NULL
+            FROM {table}
+            WHERE bucket_epoch BETWEEN ? AND ?
+            ORDER BY bucket_epoch ASC
+        """, ((start_epoch // resolution) * resolution, end_epoch if end_epoch is not None else 2 ** 62))
+        return ChartSeries.from_rows(cursor.fetchall(), resolution)
+    
+    def get_data_for_range(self, start_epoch, end_epoch, resolution=0, table=None):
+        """Datele pentru intervalul [start_epoch, end_epoch] la rezoluția cerută (0 = brute), ca ChartSeries.
+        Rulează și pe thread-uri de fundal (conexiunea BD e per thread)."""
+        if table is not None:
+            series = self._get_rollup_data(table, resolution, start_epoch, end_epoch)
+            if series is not None:
+                return series
+        if SENSOR_STORAGE_MODE == 'deadband':
+            return self._get_deadband_range(start_epoch, end_epoch)
+        # Range scan pe idx_sensor_data_epoch
+        cursor = db.execute("""
+            SELECT timestamp_epoch, temperatura, umiditate, lumina, calitate_aer, zgomot
+            FROM sensor_data
+            WHERE timestamp_epoch BETWEEN ? AND ?
+            ORDER BY timestamp_epoch ASC
+        """, (start_epoch, end_epoch))
+        return ChartSeries.from_rows(cursor.fetchall())
+    
+    def get_series_for_period(self, hours=1, refresh=True, store=True):
+        """ChartSeries pentru perioadă, din cache-ul ferestrei.
+        Fără refresh (ex: doar s-a schimbat parametrul) nu se face nicio interogare. Cu refresh se aduc
+        doar rândurile mai noi decât ultimul din cache și se elimină cele ieșite din fereastra glisantă.
+        Thread-ul de fundal cere store=False: seria intră în cache abia în _store_series, pe thread-ul Tk
+        și doar pentru generația curentă - o cerere depășită nu poate suprascrie cache-ul."""
+        series = self._series_cache.get(hours)
+        if series is None or len(series) == 0:
+            series = self.get_data_for_period(hours)
+        elif refresh:
+            series = self._refresh_series(series, hours)
+        if store:
+            self._store_series(hours, series)
+        return series
+    
+    def _store_series(self, hours, series):
+        """Seria devine cea din cache pentru perioadă și dă rezoluția afișată (doar pe thread-ul Tk)"""
+        self._series_cache[hours] = series
+        self.data_resolution = series.resolution
+    
+    def _refresh_series(self, series, hours):
+        """Coada nouă (de la ultimul rând din cache, cu CHART_CACHE_OVERLAP_SECONDS suprapunere) lipită de serie"""
+        now_epoch = int(time.time())
+        resolution = series.resolution
+        tail_start = int(series.epochs[-1]) - CHART_CACHE_OVERLAP_SECONDS
+        window_start = now_epoch - hours * 3600 if hours != -1 else int(series.epochs[0])
+        if resolution:
+            # Bucket-ul curent din rollup e încă parțial - se re-citește întreg
+            tail_start -= tail_start % resolution
+            window_start -= window_start % resolution
+        if window_start >= tail_start:
+            return self.get_data_for_period(hours)  # Nimic din cache nu mai e în fereastră
+        try:
+            tail = None
+            if not resolution and self.sensor_manager is not None:
+                tail = self._get_buffered_data(tail_start)
+            if tail is None:
+                tail = self.get_data_for_range(tail_start, now_epoch, resolution, dict(ROLLUP_RESOLUTIONS).get(resolution))
+        except Exception as e:
+            print(f"⚠️ Eroare la actualizarea datelor din cache: {e}")
+            return series
+        if tail.resolution != resolution:
+            return self.get_data_for_period(hours)  # Rollup-ul nu mai acoperă perioada - citire completă
+        return series.append_tail(tail, tail_start, window_start)
     
     def on_parameter_change(self, event=None):
         """Actualizează graficul când se schimbă orice opțiune"""
         self.create_chart()
     
-    def smooth_data(self, values, window_size=5):
-        """Aplică netezire cu medie mobilă"""
+    def refresh_chart(self):
+        """Butonul "Actualizează": aduce și citirile noi pentru perioada curentă"""
+        self.create_chart(refresh=True)
+    
+    def smooth_data(self, values, window_size=NETEZIRE_FEREASTRA_IMPLICITA, method="Medie mobilă"):
+        """Aplică filtrul de netezire ales (vezi FILTRE_NETEZIRE) - vectorizat, întoarce un array NumPy"""
         if len(values) < window_size:
             return values
+        return FILTRE_NETEZIRE[method](values, window_size)
+    
+    def _smoothing_options(self):
+        """(filtru, fereastră) din controale sau None fără netezire - citit pe thread-ul Tk"""
+        method = self.smooth_var.get()
+        if method not in FILTRE_NETEZIRE:
+            return None
+        return method, self.smooth_window_var.get()
+    
+    def build_figure(self, timestamps, values, param, period_text, chart_type="Linie",
+                     show_ranges=True, show_grid=True, smooth=False):
+        """Construiește o figură nouă a graficului, fără nicio dependență de Tk
+        (folosită de benchmark pe backend-ul Agg). Returnează (figure, ax, line, info)."""
+        info = self.PARAM_INFO.get(param, {'color': '#2C3E50', 'unit': '', 'label': param, 'icon': '📊'})
+        plot_values = self.smooth_data(values) if smooth else values
+        renderer = ChartRenderer()
+        line = renderer.update(timestamps, values, plot_values, info, param, period_text, chart_type=chart_type,
+                               show_ranges=show_ranges, show_grid=show_grid, data_resolution=self.data_resolution)
+        return renderer.figure, renderer.ax, line, info
+    
+    def _ensure_chart_canvas(self):
+        """Creează o singură dată figura, canvas-ul Tk, toolbar-ul și evenimentele de hover"""
+        if self.renderer is not None:
+            return
+        self.renderer = ChartRenderer()
+        self.current_figure = self.renderer.figure
+        
+        # Toolbar pentru zoom, pan, etc.
+        from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
+        self.current_canvas = FigureCanvasTkAgg(self.current_figure, self.chart_container)
+        self.toolbar_frame = tk.Frame(self.chart_container, bg="#f0f0f0")
+        self.toolbar = NavigationToolbar2Tk(self.current_canvas, self.toolbar_frame)
+        self.toolbar.update()
+        
+        # Conectează evenimentele hover (o singură dată - funcțiile citesc datele curente din renderer)
+        self.current_canvas.mpl_connect('motion_notify_event', self.on_hover)
+        self.current_canvas.mpl_connect('axes_leave_event', self.on_leave)
+        
+        # Zoom/pan din toolbar -> detaliu pentru intervalul vizibil
+        self.renderer.ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+    
+    def _on_xlim_changed(self, ax):
+        """Debounce: interogarea pornește doar după ce limitele nu s-au mai schimbat ZOOM_DEBOUNCE_MS"""
+        if self._zoom_after is not None:
+            self.window.after_cancel(self._zoom_after)
+        self._zoom_after = self.window.after(ZOOM_DEBOUNCE_MS, self._request_zoom_detail)
+    
+    def _request_zoom_detail(self):
+        """Pornește aducerea datelor detaliate pentru intervalul vizibil (sau revine la ansamblu)"""
+        self._zoom_after = None
+        renderer = self.renderer
+        if renderer is None or self.current_param is None or self.live_active:
+            return  # În modul live seria e deja la rezoluție completă
+        x0, x1 = renderer.ax.get_xlim()
+        span = renderer.overview_span()
+        if span is None:
+            return
+        if x0 <= span[0] and x1 >= span[1]:
+            self._zoom_generation += 1  # Rezultatele încă în drum nu mai sunt relevante
+            if renderer.show_overview():
+                self.current_canvas.draw_idle()
+            return
+        
+        # Numerele de zi ale graficului provin din ore locale naive -> epoch prin ora locală
+        start = mdates.num2date(max(x0, span[0])).replace(tzinfo=None)
+        end = mdates.num2date(min(x1, span[1])).replace(tzinfo=None)
+        start_epoch, end_epoch = int(start.timestamp()), int(end.timestamp()) + 1
+        resolution, table = alege_rezolutie_detaliu(end_epoch - start_epoch)
+        if not renderer.needs_detail(x0, x1, resolution):
+            return
         
-        smoothed = []
-        for i in range(len(values)):
-            start = max(0, i - window_size // 2)
-            end = min(len(values), i + window_size // 2 + 1)
-            smoothed.append(np.mean(values[start:end]))
-        return smoothed
+        # O jumătate de interval în plus pe fiecare parte - pan-ul mic nu mai cere o nouă interogare
+        margin = (end_epoch - start_epoch) // 2
+        self._zoom_generation += 1
+        worker = threading.Thread(
+            target=self._fetch_zoom_detail,
+            args=(self._zoom_generation, start_epoch - margin, end_epoch + margin, resolution, table,
+                  self.current_param, self._smoothing_options()),
+            daemon=True)
+        worker.start()
+        self.window.after(ZOOM_POLL_MS, self._poll_zoom_detail)
+    
+    # === MODUL LIVE ===
+    def _start_live(self):
+        """Abonează fereastra la citirile noi și pornește bucla de cadre (LIVE_FPS)"""
+        self.live_active = True
+        self.renderer.start_live(LIVE_WINDOW_SECONDS)
+        # Citirile sosite cât timp seria se pregătea în fundal vin din buffer-ul în memorie
+        if len(self.current_series):
+            window = self.sensor_manager.recent_readings.window(int(self.current_series.epochs[-1]) + 1)
+            if len(window):
+                self.renderer.append_live(epoci_la_ora_locala(window['epoch']),
+                                          window[self.current_param].astype(np.float64))
+        self.sensor_manager.subscribe(self._on_live_reading)
+        self._live_after = self.window.after(int(1000 / LIVE_FPS), self._live_frame)
+    
+    def _stop_live(self):
+        if not self.live_active:
+            return
+        self.live_active = False
+        if self._live_after is not None:
+            self.window.after_cancel(self._live_after)
+            self._live_after = None
+        self.sensor_manager.unsubscribe(self._on_live_reading)
+        while not self._live_queue.empty():
+            self._live_queue.get_nowait()
+        if self.renderer is not None:
+            self.renderer.stop_live()
+    
+    def _on_live_reading(self, epoch, values):
+        """Thread-ul de achiziție: doar pune citirea în coadă (Tk nu e thread-safe)"""
+        self._live_queue.put((epoch, values))
+    
+    def _live_frame(self):
+        """Un cadru live: citirile sosite de la cadrul anterior se adaugă la linie, apoi blit.
+        Fără citiri noi, cadrul nu desenează nimic - CPU-ul rămâne constant cât fereastra e deschisă."""
+        self._live_after = None
+        if not self.live_active or self.renderer is None:
+            return
+        readings = []
+        while True:
+            try:
+                readings.append(self._live_queue.get_nowait())
+            except queue.Empty:
+                break
+        if readings:
+            timestamps = epoci_la_ora_locala([epoch for epoch, _ in readings])
+            values = np.array([reading[self.current_param] for _, reading in readings], dtype=np.float64)
+            if self.renderer.append_live(timestamps, values):
+                self.current_canvas.draw_idle()  # Axele s-au mutat - desenare completă + fundal nou
+            else:
+                self.renderer.blit()
+            # Statisticile ferestrei live vin gata calculate din SensorManager - fără interogări
+            stats = self.sensor_manager.live_stats.current.get(self.current_param, {}).get(LIVE_WINDOW_SECONDS)
+            if stats is not None:
+                self.stats_label.config(text=self.statistics_text(
+                    stats, self.PARAM_INFO[self.current_param], self.current_param))
+        self._live_after = self.window.after(int(1000 / LIVE_FPS), self._live_frame)
+    
+    def _fetch_zoom_detail(self, generation, start_epoch, end_epoch, resolution, table, param, smoothing):
+        """Thread de fundal: range query pe index, direct în coloane NumPy; Tk nu e atins de aici"""
+        try:
+            series = self.get_data_for_range(start_epoch, end_epoch, resolution, table)
+            timestamps, values = series.valid(param)
+            plot_values = values
+            if smoothing is not None:
+                plot_values = self.smooth_data(values, smoothing[1], smoothing[0])
+            self._zoom_results.put((generation, timestamps, values, plot_values, series.resolution))
+        except Exception as e:
+            print(f"⚠️ Eroare la citirea detaliului pentru zoom: {e}")
+            self._zoom_results.put((generation, None, None, None, None))
+        finally:
+            db.close()  # Conexiunea acestui thread
+    
+    def _poll_zoom_detail(self):
+        """Pe thread-ul Tk: aplică ultimul rezultat sosit; cele depășite (alt zoom, alt parametru) se ignoră"""
+        if self.renderer is None:
+            return
+        try:
+            generation, timestamps, values, plot_values, resolution = self._zoom_results.get_nowait()
+        except queue.Empty:
+            self.window.after(ZOOM_POLL_MS, self._poll_zoom_detail)
+            return
+        if generation != self._zoom_generation or timestamps is None:
+            return
+        if self.renderer.show_detail(timestamps, values, plot_values, resolution):
+            self.current_canvas.draw_idle()
+    
+    def _show_message(self, text, fg="#7F8C8D", font=("Arial", 14)):
+        """Ascunde graficul (fără să-l distrugă) și afișează un mesaj în locul lui"""
+        if self.current_canvas is not None:
+            self.toolbar_frame.pack_forget()
+            self.current_canvas.get_tk_widget().pack_forget()
+        self.message_label.config(text=text, fg=fg, font=font)
+        if not self.message_label.winfo_manager():
+            self.message_label.pack(expand=True)
     
-    def create_chart(self):
-        """Creează graficul îmbunătățit cu culori vii și ore exacte - COINCIDENȚĂ EXACTĂ"""
-        # Curăță containerul anterior
-        for widget in self.chart_container.winfo_children():
-            widget.destroy()
+    def _show_chart(self):
+        """Afișează din nou canvas-ul persistent (după un mesaj sau la prima desenare)"""
+        self.message_label.pack_forget()
+        if not self.toolbar_frame.winfo_manager():
+            self.toolbar_frame.pack(fill="x", pady=(0, 5))
+            self.current_canvas.get_tk_widget().pack(fill="both", expand=True)
+    
+    def on_hover(self, event):
+        """Hover limitat la HOVER_MAX_FPS: evenimentele dintre două cadre doar înlocuiesc ultimul
+        eveniment, procesat la următorul cadru (poziția finală a mouse-ului nu se pierde)"""
+        self._hover_event = event
+        if self._hover_after is not None:
+            return  # Un cadru e deja programat și va folosi ultimul eveniment
+        wait = self._last_hover + 1.0 / HOVER_MAX_FPS - time.perf_counter()
+        if wait > 0:
+            self._hover_after = self.window.after(int(wait * 1000) + 1, self._process_hover)
+        else:
+            self._process_hover()
+    
+    def _process_hover(self):
+        """Afișează valoarea celui mai apropiat punct (adnotarea persistentă a renderer-ului)"""
+        self._hover_after = None
+        self._last_hover = time.perf_counter()
+        event = self._hover_event
+        renderer = self.renderer
+        if renderer is None or event is None or event.inaxes != renderer.ax or event.xdata is None:
+            return
+        if not renderer.line.contains(event)[0]:
+            return
+        # Căutare binară pe momentele sortate - fără conversii de dată și fără parcurgerea seriei
+        closest_idx = renderer.nearest_index(event.xdata)
+        if closest_idx is not None and renderer.show_hover(closest_idx):
+            self.current_canvas.draw_idle()
+    
+    def on_leave(self, event):
+        if self._hover_after is not None:
+            self.window.after_cancel(self._hover_after)
+            self._hover_after = None
+        if self.renderer is not None and self.renderer.hide_hover():
+            self.current_canvas.draw_idle()
+    
+    def create_chart(self, refresh=False):
+        """Actualizează graficul persistent cu culori vii și ore exacte - COINCIDENȚĂ EXACTĂ
+        (figura, canvas-ul și toolbar-ul se creează o singură dată; la fiecare schimbare
+        se actualizează doar artistele afectate). Datele vin din cache-ul pe perioadă: se
+        interoghează doar la schimbarea perioadei, în modul live sau la refresh explicit.
+        Interogarea, netezirea, decimarea și statisticile rulează pe un thread de fundal
+        (_prepare_chart); pe thread-ul Tk rămâne doar actualizarea artistelor (_apply_chart)."""
+        self._stop_live()
         
         # Determină parametrul și perioada
         param_text = self.param_var.get()
@@ -1997,16 +4638,16 @@ class ChartsWindow:
         
         # Verifică dacă zgomotul e selectat (nu ar trebui să fie disponibil)
         if param == 'zgomot':
+            self._cancel_chart_request()  # Un grafic încă în pregătire nu mai trebuie afișat
             # Afișează mesaj de eroare
-            error_label = tk.Label(self.chart_container, 
-                                 text="🔇 ZGOMOT DEZACTIVAT\n\nAcest parametru nu este disponibil pentru analiză cu COINCIDENȚĂ EXACTĂ.", 
-                                 font=("Arial", 16, "bold"), bg="#f0f0f0", fg="#E74C3C", justify="center")
-            error_label.pack(expand=True)
+            self._show_message("🔇 ZGOMOT DEZACTIVAT\n\nAcest parametru nu este disponibil pentru analiză cu COINCIDENȚĂ EXACTĂ.",
+                               fg="#E74C3C", font=("Arial", 16, "bold"))
             self.stats_label.config(text="❌ Parametru dezactivat - selectează alt parametru pentru COINCIDENȚĂ EXACTĂ")
             return
         
         period_text = self.period_var.get()
         period_hours = {
+            LIVE_PERIOD: 1,
             "Ultima oră": 1,
             "Ultimele 3 ore": 3,
             "Ultimele 6 ore": 6,
@@ -2016,279 +4657,193 @@ class ChartsWindow:
             "Toate datele": -1
         }
         hours = period_hours.get(period_text, 1)
+        refresh = refresh or period_text != self.current_period or period_text == LIVE_PERIOD
+        self.current_period = period_text
+        
+        # Opțiunile se citesc aici (variabilele Tk nu se ating din alt thread)
+        self._ensure_chart_canvas()
+        request = {
+            'hours': hours,
+            'refresh': refresh,
+            'param': param,
+            'period_text': period_text,
+            'smoothing': self._smoothing_options(),
+            'points': self.renderer.target_points(),
+            'decimation': self.renderer.decimation,
+        }
         
-        # Obține datele
-        data = self.get_data_for_period(hours)
+        # O nouă generație: rezultatul oricărei cereri anterioare încă în lucru va fi ignorat
+        self._chart_generation += 1
+        self._show_loading()
+        worker = threading.Thread(target=self._prepare_chart, args=(self._chart_generation, request), daemon=True)
+        worker.start()
+        if self._chart_poll_after is None:
+            self._chart_poll_after = self.window.after(CHART_POLL_MS, self._poll_chart)
+    
+    def _prepare_chart(self, generation, request):
+        """Thread de fundal: datele (din cache sau BD), netezirea, decimarea și textul statisticilor.
+        Se oprește devreme dacă între timp a fost cerut alt grafic; Tk nu e atins de aici."""
+        try:
+            series = self.get_series_for_period(request['hours'], request['refresh'], store=False)
+            if generation != self._chart_generation:
+                return  # Cerere depășită - nu mai are rost netezirea și decimarea
+            
+            # Pregătește datele pentru grafic (doar rândurile cu valoare pentru parametru)
+            param = request['param']
+            timestamps, values = series.valid(param)
+            result = {'series': series, 'request': request, 'prepared': None, 'stats_text': None}
+            if len(timestamps):
+                # Aplică netezire dacă e selectată
+                plot_values = values
+                smoothing = request['smoothing']
+                if smoothing is not None:
+                    plot_values = self.smooth_data(values, smoothing[1], smoothing[0])
+                if generation != self._chart_generation:
+                    return
+                result['prepared'] = ChartRenderer.prepare(timestamps, values, plot_values,
+                                                           request['points'], request['decimation'])
+                info = self.PARAM_INFO.get(param, {'color': '#2C3E50', 'unit': '', 'label': param, 'icon': '📊'})
+                stats = self.get_statistics(request['period_text'], param, series)
+                result['stats_text'] = self.statistics_text(stats, info, param)
+            self._chart_results.put((generation, result))
+        except Exception as e:
+            print(f"❌ Eroare la pregătirea graficului: {e}")
+            self._chart_results.put((generation, None))
+        finally:
+            db.close()  # Conexiunea acestui thread
+    
+    def _poll_chart(self):
+        """Pe thread-ul Tk: aplică rezultatul cererii curente; cele depășite se aruncă"""
+        self._chart_poll_after = None
+        if self.renderer is None:
+            return
+        results = []
+        while True:
+            try:
+                results.append(self._chart_results.get_nowait())
+            except queue.Empty:
+                break
+        current = [result for generation, result in results if generation == self._chart_generation]
+        if not current:
+            self._chart_poll_after = self.window.after(CHART_POLL_MS, self._poll_chart)
+            return
+        self._hide_loading()
+        self._apply_chart(current[-1])
+    
+    def _cancel_chart_request(self):
+        """Abandonează graficul în pregătire (rezultatul lui va fi ignorat) și oprește verificarea"""
+        self._chart_generation += 1
+        if self._chart_poll_after is not None:
+            self.window.after_cancel(self._chart_poll_after)
+            self._chart_poll_after = None
+        self._hide_loading()
+    
+    def _show_loading(self):
+        if not self.progress.winfo_manager():
+            self.progress.pack(side="left", padx=(15, 5))
+            self.loading_label.pack(side="left")
+            self.progress.start(15)
+    
+    def _hide_loading(self):
+        if self.progress.winfo_manager():
+            self.progress.stop()
+            self.progress.pack_forget()
+            self.loading_label.pack_forget()
+    
+    def _apply_chart(self, result):
+        """Pe thread-ul Tk: doar actualizarea artistelor cu datele deja pregătite"""
+        if result is None:
+            self._show_message("❌ Eroare la procesarea datelor pentru COINCIDENȚĂ EXACTĂ", fg="#E74C3C")
+            return
+        request, series = result['request'], result['series']
+        param, period_text = request['param'], request['period_text']
+        self.current_series = series
+        self._store_series(request['hours'], series)  # _poll_chart aplică doar generația curentă
         
-        if not data:
+        if len(series) == 0:
             # Afișează mesaj dacă nu există date
-            no_data_label = tk.Label(self.chart_container, 
-                                   text=f"📭 Nu există date pentru {param} în perioada selectată\n\n💡 Încearcă o perioadă mai mare sau verifică funcționarea senzorilor\n🎯 Sistem cu COINCIDENȚĂ EXACTĂ", 
-                                   font=("Arial", 14), bg="#f0f0f0", fg="#7F8C8D", justify="center")
-            no_data_label.pack(expand=True)
+            self._show_message(f"📭 Nu există date pentru {param} în perioada selectată\n\n💡 Încearcă o perioadă mai mare sau verifică funcționarea senzorilor\n🎯 Sistem cu COINCIDENȚĂ EXACTĂ")
             self.stats_label.config(text="📭 Nu există date pentru analiza statistică cu COINCIDENȚĂ EXACTĂ")
             return
         
-        # Pregătește datele pentru grafic
-        timestamps = []
-        values = []
-        
-        # Mapare nume parametru la index în rezultat
-        param_index = {
-            'temperatura': 1,
-            'umiditate': 2,
-            'lumina': 3,
-            'calitate_aer': 4,
-            'zgomot': 5  # Nu va fi folosit
-        }
-        
-        index = param_index.get(param, 1)
-        
-        for row in data:
-            try:
-                timestamp = datetime.strptime(row[0], "%Y-%m-%d %H:%M:%S")
-                timestamps.append(timestamp)
-                values.append(float(row[index]))
-            except (ValueError, TypeError) as e:
-                print(f"Eroare la procesarea datelor: {e}")
-                continue
-        
-        if not timestamps:
-            error_label = tk.Label(self.chart_container, text="❌ Eroare la procesarea datelor pentru COINCIDENȚĂ EXACTĂ", 
-                                 font=("Arial", 14), bg="#f0f0f0", fg="#E74C3C")
-            error_label.pack(expand=True)
+        prepared = result['prepared']
+        if prepared is None:
+            self._show_message("❌ Eroare la procesarea datelor pentru COINCIDENȚĂ EXACTĂ", fg="#E74C3C")
             return
         
-        # === CREAREA GRAFICULUI AVANSAT CU CERINȚELE SPECIALE ===
-        # Configurare matplotlib pentru aspect profesional
-        plt.style.use('seaborn-v0_8-whitegrid')
-        
-        # Creează figura cu dimensiuni mari
-        self.current_figure, ax = plt.subplots(figsize=(16, 8))
-        self.current_figure.patch.set_facecolor('#f8f9fa')
-        
-        # Culori și informații pentru fiecare parametru - COINCIDENȚĂ EXACTĂ
-        param_info = {
-            'temperatura': {'color': '#E74C3C', 'unit': '°C', 'label': 'Temperatură', 'icon': '🌡️'},
-            'umiditate': {'color': '#3498DB', 'unit': '%', 'label': 'Umiditate', 'icon': '💧'},
-            'lumina': {'color': '#F39C12', 'unit': ' lux', 'label': 'Lumină (EXACTĂ)', 'icon': '💡'},
-            'calitate_aer': {'color': '#27AE60', 'unit': ' AQI', 'label': 'Calitate Aer (EXACTĂ)', 'icon': '🌬️'}
-        }
-        
-        info = param_info.get(param, {'color': '#2C3E50', 'unit': '', 'label': param, 'icon': '📊'})
-        
-        # Aplică netezire dacă e selectată
-        plot_values = values
-        if self.smooth_var.get():
-            plot_values = self.smooth_data(values)
-        
-        # === CERINȚA SPECIALĂ: DESENEAZĂ RANGE-URILE CU CULORI VII ===
-        if self.ranges_var.get() and param in OPTIMAL_RANGES:
-            ranges = OPTIMAL_RANGES[param]
-            optimal_min, optimal_max = ranges['optimal']
-            acceptable_min, acceptable_max = ranges['acceptable']
-            
-            # CERINȚA SPECIALĂ: Verde mai viu pentru zona optimală
-            ax.axhspan(optimal_min, optimal_max, alpha=0.3, color='#00FF00', 
-                      label=f'🎯 Zona optimală ({optimal_min}-{optimal_max})', zorder=1)
-            
-            # CERINȚA SPECIALĂ: Portocaliu în loc de galben pentru zona acceptabilă
-            if acceptable_min < optimal_min:
-                ax.axhspan(acceptable_min, optimal_min, alpha=0.25, color='#FF8C00', 
-                          label=f'⚠️ Zona acceptabilă ({acceptable_min}-{acceptable_max})', zorder=1)
-            if acceptable_max > optimal_max:
-                ax.axhspan(optimal_max, acceptable_max, alpha=0.25, color='#FF8C00', zorder=1)
-        
-        # === CERINȚA SPECIALĂ: DESENEAZĂ GRAFICUL (DOAR 2 TIPURI) ===
-        chart_type = self.chart_type_var.get()
-        
-        if chart_type == "Linie":
-            line, = ax.plot(timestamps, plot_values, color=info['color'], linewidth=2.5, 
-                           label=f"{info['icon']} {info['label']}", zorder=3)
-        elif chart_type == "Zonă umplută":
-            line, = ax.plot(timestamps, plot_values, color=info['color'], linewidth=2, zorder=3)
-            ax.fill_between(timestamps, plot_values, alpha=0.3, color=info['color'], zorder=2)
-        
-        # === CERINȚA SPECIALĂ: ORE EXACTE SUB FIECARE PUNCT ===
-        # Afișează orele exacte sub punctele principale
-        if len(timestamps) <= 50:  # Pentru a nu aglomera
-            for i, (timestamp, value) in enumerate(zip(timestamps, values)):
-                # Afișează ora exactă sub fiecare punct
-                hour_text = timestamp.strftime("%H:%M")
-                ax.annotate(hour_text, 
-                           xy=(timestamp, value), 
-                           xytext=(0, -25), 
-                           textcoords='offset points',
-                           ha='center', va='top',
-                           fontsize=8, 
-                           color='#2C3E50',
-                           rotation=45,
-                           alpha=0.7)
-        else:
-            # Pentru multe puncte, afișează doar la intervale
-            step = max(1, len(timestamps) // 20)
-            for i in range(0, len(timestamps), step):
-                timestamp = timestamps[i]
-                value = values[i]
-                hour_text = timestamp.strftime("%H:%M")
-                ax.annotate(hour_text, 
-                           xy=(timestamp, value), 
-                           xytext=(0, -25), 
-                           textcoords='offset points',
-                           ha='center', va='top',
-                           fontsize=8, 
-                           color='#2C3E50',
-                           rotation=45,
-                           alpha=0.7)
-        
-        # === ADAUGĂ HOVER INTERACTIV ===
-        def on_hover(event):
-            if event.inaxes == ax and line.contains(event)[0]:
-                # Găsește punctul cel mai apropiat
-                if len(timestamps) > 0:
-                    # Convertește coordonatele mouse-ului
-                    x_mouse = mdates.num2date(event.xdata) if event.xdata else None
-                    
-                    if x_mouse:
-                        # Găsește indexul cel mai apropiat
-                        diffs = [abs((ts - x_mouse).total_seconds()) for ts in timestamps]
-                        closest_idx = diffs.index(min(diffs))
-                        
-                        # Actualizează sau creează adnotarea
-                        if hasattr(self, 'hover_annotation') and self.hover_annotation:
-                            self.hover_annotation.remove()
-                        
-                        closest_time = timestamps[closest_idx]
-                        closest_value = values[closest_idx]  # Valoarea originală, nu netezită
-                        
-                        # Format frumos pentru hover cu ora exactă - COINCIDENȚĂ EXACTĂ
-                        time_str = closest_time.strftime("%d/%m/%Y %H:%M:%S")
-                        hover_text = f'📅 {time_str}\n{info["icon"]} {closest_value:.1f}{info["unit"]}\n🕐 Ora exactă: {closest_time.strftime("%H:%M:%S")}\n🎯 COINCIDENȚĂ EXACTĂ'
-                        
-                        # COINCIDENȚĂ EXACTĂ: Adaugă informații despre eliminarea toleranțelor
-                        if param in ['lumina', 'calitate_aer']:
-                            hover_text += f'\n🎯 Matching precis (fără toleranțe)'
-                        
-                        self.hover_annotation = ax.annotate(
-                            hover_text,
-                            xy=(closest_time, closest_value), xycoords='data',
-                            xytext=(20, 20), textcoords='offset points',
-                            bbox=dict(boxstyle='round,pad=0.8', fc='white', ec=info['color'], alpha=0.9),
-                            arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0', color=info['color']),
-                            fontsize=10, fontweight='bold', zorder=10
-                        )
-                        self.current_figure.canvas.draw_idle()
-        
-        def on_leave(event):
-            if hasattr(self, 'hover_annotation') and self.hover_annotation:
-                self.hover_annotation.remove()
-                self.hover_annotation = None
-                self.current_figure.canvas.draw_idle()
-        
-        # Conectează evenimentele hover
-        self.current_figure.canvas.mpl_connect('motion_notify_event', on_hover)
-        self.current_figure.canvas.mpl_connect('axes_leave_event', on_leave)
-        
-        # === FORMATARE GRAFIC PROFESIONAL ===
-        # COINCIDENȚĂ EXACTĂ: Titlu actualizat cu informații despre eliminarea toleranțelor
-        title_text = f'{info["icon"]} Evoluția - {info["label"]} ({period_text}) - COINCIDENȚĂ EXACTĂ'
-        if param in ['lumina', 'calitate_aer']:
-            title_text += f' | Matching precis obligatoriu'
-        
-        ax.set_title(title_text, fontsize=16, fontweight='bold', pad=20)
-        ax.set_xlabel('📅 Timp (🕐 ore exacte afișate)', fontsize=12, fontweight='bold')
-        ax.set_ylabel(f'{info["icon"]} {info["label"]} ({info["unit"]})', fontsize=12, fontweight='bold')
-        
-        # Grid personalizabil
-        if self.grid_var.get():
-            ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.8)
-        
-        # Legendă frumoasă
-        ax.legend(loc='upper left', framealpha=0.9, fancybox=True, shadow=True)
-        
-        # Formatare axa timpului inteligentă
-        if len(timestamps) > 50:
-            ax.xaxis.set_major_locator(mdates.HourLocator(interval=max(1, len(timestamps)//20)))
-        elif len(timestamps) > 20:
-            ax.xaxis.set_major_locator(mdates.MinuteLocator(interval=max(5, len(timestamps)//10)))
-        
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M\n%d/%m'))
-        
-        # Rotează etichele pentru citire mai bună
-        plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
-        
-        # CERINȚA SPECIALĂ: Ajustează marginile pentru a face loc orelor exacte
-        plt.tight_layout(pad=4.0)  # Mai mult spațiu pentru orele de jos
-        
-        # === ADAUGĂ GRAFICUL ÎN TKINTER ===
-        self.current_canvas = FigureCanvasTkAgg(self.current_figure, self.chart_container)
-        self.current_canvas.draw()
-        
-        # Toolbar pentru zoom, pan, etc.
-        from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
-        toolbar_frame = tk.Frame(self.chart_container, bg="#f0f0f0")
-        toolbar_frame.pack(fill="x", pady=(0, 5))
-        
-        toolbar = NavigationToolbar2Tk(self.current_canvas, toolbar_frame)
-        toolbar.update()
-        
-        # Canvas-ul propriu-zis
-        self.current_canvas.get_tk_widget().pack(fill="both", expand=True)
-        
-        # === ACTUALIZEAZĂ STATISTICILE ===
-        self.update_statistics(values, info, period_text, param)
+        info = self.PARAM_INFO.get(param, {'color': '#2C3E50', 'unit': '', 'label': param, 'icon': '📊'})
+        
+        # === ACTUALIZAREA GRAFICULUI PERSISTENT ===
+        self.current_param = param
+        self._zoom_generation += 1  # Detaliul cerut pentru graficul anterior nu se mai aplică
+        self.renderer.update(prepared['timestamps'], prepared['values'], prepared['y'], info, param, period_text,
+                             chart_type=self.chart_type_var.get(), show_ranges=self.ranges_var.get(),
+                             show_grid=self.grid_var.get(), data_resolution=series.resolution, prepared=prepared)
+        self._show_chart()
+        self.toolbar.update()  # "Home" din toolbar = noua vedere completă
+        if period_text == LIVE_PERIOD and self.sensor_manager is not None:
+            self._start_live()
+        self.current_canvas.draw_idle()
+        
+        # === ACTUALIZEAZĂ STATISTICILE (calculate deja pe thread-ul de fundal) ===
+        self.stats_label.config(text=result['stats_text'])
     
-    def update_statistics(self, values, param_info, period, param_name):
+    def get_statistics(self, period_text, param, series):
+        """SeriesStats memorat per (perioadă, parametru, versiunea seriei) - panoul și fereastra de
+        statistici detaliate îl refolosesc; se recalculează doar când seria din cache s-a schimbat.
+        Seriile din rollup (perioadele lungi, "Toate datele") se agregă direct în SQLite: un singur
+        rând-sumar, cu număr/min/max/medie exacte pe citirile brute, nu pe mediile afișate."""
+        key = (period_text, param)
+        cached = self._stats_cache.get(key)
+        if cached is not None and cached[0] == series.version:
+            return cached[1]
+        stats = None
+        if series.resolution and len(series) and param in ROLLUP_PARAMS:
+            try:
+                stats = statistici_sql(param, int(series.epochs[0]), int(series.epochs[-1]), series.resolution)
+            except Exception as e:
+                print(f"⚠️ Eroare la agregarea statisticilor în BD: {e}")
+        if stats is None:
+            stats = SeriesStats(series.valid(param)[1], param)
+        self._stats_cache[key] = (series.version, stats)
+        return stats
+    
+    def update_statistics(self, stats, param_info, period, param_name):
         """Actualizează panoul de statistici cu informații detaliate - COINCIDENȚĂ EXACTĂ"""
-        if not values:
-            self.stats_label.config(text="📭 Nu există date pentru statistici cu COINCIDENȚĂ EXACTĂ")
-            return
-        
-        min_val = min(values)
-        max_val = max(values)
-        avg_val = np.mean(values)
-        median_val = np.median(values)
-        std_val = np.std(values)
-        
-        # Calculează trendul
-        if len(values) > 1:
-            trend_slope = (values[-1] - values[0]) / len(values)
-            if trend_slope > 0.1:
-                trend = "📈 Creștere"
-            elif trend_slope < -0.1:
-                trend = "📉 Scădere"
-            else:
-                trend = "➡️ Stabil"
+        self.stats_label.config(text=self.statistics_text(stats, param_info, param_name))
+    
+    def statistics_text(self, stats, param_info, param_name):
+        """Textul panoului de statistici (din SeriesStats) - fără Tk, folosit și pe thread-ul de fundal"""
+        if stats.count == 0:
+            return "📭 Nu există date pentru statistici cu COINCIDENȚĂ EXACTĂ"
+        
+        # Trendul (panta regresiei pe măsurătoare)
+        if stats.count > 1:
+            trend = {1: "📈 Creștere", -1: "📉 Scădere", 0: "➡️ Stabil"}[stats.trend]
         else:
             trend = "➡️ Insuficiente date"
         
-        # Calculează valorile în range-ul optimal
-        if param_name in OPTIMAL_RANGES:
-            optimal_min, optimal_max = OPTIMAL_RANGES[param_name]['optimal']
-            optimal_count = sum(1 for v in values if optimal_min <= v <= optimal_max)
-            optimal_percent = (optimal_count / len(values)) * 100
-        else:
-            optimal_percent = 0
+        # Procentul de valori în range-ul optimal
+        optimal_percent = stats.percent(stats.optimal_count)
         
         # COINCIDENȚĂ EXACTĂ: Adaugă informații despre eliminarea toleranțelor
         exact_info = ""
         if param_name in ['lumina', 'calitate_aer']:
             exact_info = f" | 🎯 Coincidență EXACTĂ (fără toleranțe artificiale)"
         
-        stats_text = (f"📊 {len(values)} măsurători | "
-                     f"Min: {min_val:.1f}{param_info['unit']} | "
-                     f"Max: {max_val:.1f}{param_info['unit']} | "
-                     f"Media: {avg_val:.1f}{param_info['unit']} | "
-                     f"Mediana: {median_val:.1f}{param_info['unit']} | "
-                     f"Deviația: {std_val:.1f} | "
+        stats_text = (f"📊 {stats.count} măsurători | "
+                     f"Min: {stats.min:.1f}{param_info['unit']} | "
+                     f"Max: {stats.max:.1f}{param_info['unit']} | "
+                     f"Media: {stats.mean:.1f}{param_info['unit']} | "
+                     f"Mediana: {stats.median:.1f}{param_info['unit']} | "
+                     f"Deviația: {stats.std:.1f} | "
                      f"Trend: {trend} | "
                      f"🎯 În zona optimală: {optimal_percent:.1f}% | "
                      f"🎨 Culori îmbunătățite | 🕐 Ore exacte afișate{exact_info}")
-        
-        self.stats_label.config(text=stats_text)
+        return stats_text
     
     def export_chart(self):
-        """Exportă graficul ca PNG cu calitate înaltă"""
+        """Exportă graficul ca PNG cu calitate înaltă sau datele afișate ca CSV"""
         try:
             if self.current_figure:
                 from tkinter import filedialog
@@ -2300,12 +4855,17 @@ class ChartsWindow:
                 
                 filename = filedialog.asksaveasfilename(
                     defaultextension=".png",
-                    filetypes=[("PNG files", "*.png"), ("All files", "*.*")],
+                    filetypes=[("PNG files", "*.png"), ("CSV files", "*.csv"), ("All files", "*.*")],
                     initialdir=".",
                     initialname=f"grafic_{param}_coincidenta_exacta{suffix}_{timestamp}.png"
                 )
                 
-                if filename:
+                if filename and filename.lower().endswith('.csv') and self.current_series is not None:
+                    # Aceleași coloane ca graficul - fără o nouă interogare sau parsare
+                    self.current_series.to_csv(filename)
+                    print(f"✅ Date exportate CSV: {filename}")
+                    self.stats_label.config(text=f"✅ Date exportate CSV: {filename}")
+                elif filename:
                     self.current_figure.savefig(filename, dpi=300, bbox_inches='tight', 
                                               facecolor='white', edgecolor='none')
                     print(f"✅ Grafic exportat cu succes cu COINCIDENȚĂ EXACTĂ: {filename}")
@@ -2327,21 +4887,17 @@ class ChartsWindow:
         # Obține datele curente
         period_text = self.period_var.get()
         period_hours = {
-            "Ultima oră": 1, "Ultimele 3 ore": 3, "Ultimele 6 ore": 6,
+            LIVE_PERIOD: 1, "Ultima oră": 1, "Ultimele 3 ore": 3, "Ultimele 6 ore": 6,
             "Ultima zi": 24, "Ultimele 3 zile": 72, "Ultima săptămână": 168, "Toate datele": -1
         }
         hours = period_hours.get(period_text, 1)
-        data = self.get_data_for_period(hours)
-        
-        if not data:
-            return
+        # Seria din cache (a graficului curent, dacă e aceeași perioadă) - fără re-interogare și re-parsare
+        series = self.get_series_for_period(hours, refresh=period_text == LIVE_PERIOD)
         
-        # Extrage valorile
-        param_index = {'temperatura': 1, 'umiditate': 2, 'lumina': 3, 'calitate_aer': 4}
-        index = param_index.get(param, 1)
-        values = [float(row[index]) for row in data if row[index] is not None]
+        # Statisticile deja calculate pentru panou (aceeași serie) - altfel o singură trecere acum
+        stats = self.get_statistics(period_text, param, series)
         
-        if not values:
+        if stats.count == 0:
             return
         
         # Creează fereastra de statistici
@@ -2361,11 +4917,8 @@ class ChartsWindow:
                                               font=("Consolas", 10))
         text_widget.pack(fill="both", expand=True)
         
-        # Calculează statistici avansate
-        min_val, max_val = min(values), max(values)
-        mean_val, median_val = np.mean(values), np.median(values)
-        std_val, var_val = np.std(values), np.var(values)
-        q25, q75 = np.percentile(values, [25, 75])
+        min_val, max_val = stats.min, stats.max
+        std_val = stats.std
         
         # Afișează statisticile
         param_info = {
@@ -2389,30 +4942,29 @@ class ChartsWindow:
         text_widget.insert(tk.END, "=" * 70 + "\n\n")
         
         text_widget.insert(tk.END, f"📈 STATISTICI DE BAZĂ:\n")
-        text_widget.insert(tk.END, f"   📊 Numărul de măsurători: {len(values)}\n")
+        text_widget.insert(tk.END, f"   📊 Numărul de măsurători: {stats.count}\n")
         text_widget.insert(tk.END, f"   📉 Valoarea minimă: {min_val:.2f}{info['unit']}\n")
         text_widget.insert(tk.END, f"   📈 Valoarea maximă: {max_val:.2f}{info['unit']}\n")
-        text_widget.insert(tk.END, f"   🎯 Media aritmetică: {mean_val:.2f}{info['unit']}\n")
-        text_widget.insert(tk.END, f"   📊 Mediana: {median_val:.2f}{info['unit']}\n")
+        text_widget.insert(tk.END, f"   🎯 Media aritmetică: {stats.mean:.2f}{info['unit']}\n")
+        text_widget.insert(tk.END, f"   📊 Mediana: {stats.median:.2f}{info['unit']}\n")
         text_widget.insert(tk.END, f"   📐 Amplitudinea: {max_val - min_val:.2f}{info['unit']}\n\n")
         
         text_widget.insert(tk.END, f"📊 STATISTICI AVANSATE:\n")
         text_widget.insert(tk.END, f"   📏 Deviația standard: {std_val:.2f}{info['unit']}\n")
-        text_widget.insert(tk.END, f"   📐 Variația: {var_val:.2f}\n")
-        text_widget.insert(tk.END, f"   📊 Cuartila 25%: {q25:.2f}{info['unit']}\n")
-        text_widget.insert(tk.END, f"   📊 Cuartila 75%: {q75:.2f}{info['unit']}\n")
-        text_widget.insert(tk.END, f"   📏 Intervalul intercuartilic: {q75 - q25:.2f}{info['unit']}\n\n")
-        
-        # Analiză trend
-        if len(values) > 1:
-            trend_slope = (values[-1] - values[0]) / len(values)
+        text_widget.insert(tk.END, f"   📐 Variația: {stats.variance:.2f}\n")
+        text_widget.insert(tk.END, f"   📊 Cuartila 25%: {stats.q25:.2f}{info['unit']}\n")
+        text_widget.insert(tk.END, f"   📊 Cuartila 75%: {stats.q75:.2f}{info['unit']}\n")
+        text_widget.insert(tk.END, f"   📏 Intervalul intercuartilic: {stats.q75 - stats.q25:.2f}{info['unit']}\n\n")
+        
+        # Analiză trend (panta regresiei liniare)
+        if stats.count > 1:
             text_widget.insert(tk.END, f"📈 ANALIZA TENDINȚELOR:\n")
-            text_widget.insert(tk.END, f"   📊 Schimbarea totală: {values[-1] - values[0]:.2f}{info['unit']}\n")
-            text_widget.insert(tk.END, f"   📈 Schimbarea pe măsurătoare: {trend_slope:.3f}{info['unit']}\n")
+            text_widget.insert(tk.END, f"   📊 Schimbarea totală: {stats.change:.2f}{info['unit']}\n")
+            text_widget.insert(tk.END, f"   📈 Schimbarea pe măsurătoare: {stats.slope:.3f}{info['unit']}\n")
             
-            if trend_slope > 0.1:
+            if stats.trend > 0:
                 text_widget.insert(tk.END, f"   🔺 Tendință: CREȘTERE semnificativă\n")
-            elif trend_slope < -0.1:
+            elif stats.trend < 0:
                 text_widget.insert(tk.END, f"   🔻 Tendință: SCĂDERE semnificativă\n")
             else:
                 text_widget.insert(tk.END, f"   ➡️ Tendință: STABIL (variații minore)\n")
@@ -2425,17 +4977,17 @@ class ChartsWindow:
             optimal_min, optimal_max = ranges['optimal']
             acceptable_min, acceptable_max = ranges['acceptable']
             
-            optimal_count = sum(1 for v in values if optimal_min <= v <= optimal_max)
-            acceptable_count = sum(1 for v in values if acceptable_min <= v <= acceptable_max)
-            critical_count = len(values) - acceptable_count
+            optimal_count = stats.optimal_count
+            acceptable_count = stats.acceptable_count
+            critical_count = stats.critical_count
             
             text_widget.insert(tk.END, f"🎯 ANALIZA RANGE-URILOR (CULORI ÎMBUNĂTĂȚITE + COINCIDENȚĂ EXACTĂ):\n")
             text_widget.insert(tk.END, f"   🟢 Zona optimală - VERDE VIU ({optimal_min}-{optimal_max}{info['unit']}):\n")
-            text_widget.insert(tk.END, f"      📊 {optimal_count} măsurători ({optimal_count/len(values)*100:.1f}%)\n")
+            text_widget.insert(tk.END, f"      📊 {optimal_count} măsurători ({stats.percent(optimal_count):.1f}%)\n")
             text_widget.insert(tk.END, f"   🟠 Zona acceptabilă - PORTOCALIU ({acceptable_min}-{acceptable_max}{info['unit']}):\n")
-            text_widget.insert(tk.END, f"      📊 {acceptable_count} măsurători ({acceptable_count/len(values)*100:.1f}%)\n")
+            text_widget.insert(tk.END, f"      📊 {acceptable_count} măsurători ({stats.percent(acceptable_count):.1f}%)\n")
             text_widget.insert(tk.END, f"   🔴 Zona critică (în afara {acceptable_min}-{acceptable_max}{info['unit']}):\n")
-            text_widget.insert(tk.END, f"      📊 {critical_count} măsurători ({critical_count/len(values)*100:.1f}%)\n\n")
+            text_widget.insert(tk.END, f"      📊 {critical_count} măsurători ({stats.percent(critical_count):.1f}%)\n\n")
         
         # COINCIDENȚĂ EXACTĂ: Secțiune specială
         if param in ['lumina', 'calitate_aer']:
@@ -2464,9 +5016,9 @@ class ChartsWindow:
         # Recomandări
         text_widget.insert(tk.END, f"💡 RECOMANDĂRI (COINCIDENȚĂ EXACTĂ):\n")
         if param in OPTIMAL_RANGES:
-            if optimal_count / len(values) > 0.8:
+            if optimal_count / stats.count > 0.8:
                 text_widget.insert(tk.END, f"   ✅ Excelent! Parametrul este în zona optimală >80% din timp.\n")
-            elif acceptable_count / len(values) > 0.7:
+            elif acceptable_count / stats.count > 0.7:
                 text_widget.insert(tk.END, f"   ⚠️ Acceptabil. Încearcă să optimizezi pentru zona verde vie.\n")
             else:
                 text_widget.insert(tk.END, f"   🚨 Atenție! Parametrul este prea des în zona critică.\n")
@@ -2513,8 +5065,15 @@ class ChartsWindow:
         try:
             if self.current_figure:
                 plt.close(self.current_figure)
+            if self._zoom_after is not None:
+                self.window.after_cancel(self._zoom_after)
+            if self._hover_after is not None:
+                self.window.after_cancel(self._hover_after)
+            self._cancel_chart_request()
+            self._stop_live()
             if self.current_canvas:
                 self.current_canvas.get_tk_widget().destroy()
+            self.renderer = None
             print("🎯 ChartsWindow închis cu COINCIDENȚĂ EXACTĂ")
         except Exception as e:
             print(f"⚠️ Eroare la curățarea resurselor grafice: {e}")
@@ -2620,12 +5179,7 @@ class VotingWindow:
             return 0  # Zgomotul nu poate fi votat
             
         try:
-            cursor.execute("""
-                SELECT id FROM votes 
-                WHERE parameter_name = ? AND user_id = ?
-                ORDER BY id DESC 
-                LIMIT 5
-            """, (param_name, self.user_id))
+            cursor = db.execute(SQL_VOTURI_RECENTE, (param_name, self.user_id))
             
             recent_votes = cursor.fetchall()
             
@@ -2677,7 +5231,7 @@ class VotingWindow:
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         message = f"Optimizare manuală {param_name}: {current_value:.1f} → {optimal_value:.1f}"
         
-        cursor.execute("""
+        db.execute("""
             INSERT INTO feedback (timestamp, temperatura, lumina, umiditate, calitate_aer, zgomot, mesaj, user_id)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """, (
@@ -2690,7 +5244,7 @@ class VotingWindow:
             message,
             self.user_id
         ))
-        conn.commit()
+        db.commit()
         
         # Status message
         self.status_label.config(text=f"✅ {param_name.title()} optimizat cu succes!", fg="green")
@@ -2989,12 +5543,7 @@ class VotingWindow:
     
     def get_voting_status_color(self, status):
         """Returnează culoarea pentru status în pagina de votare"""
-        if status == "optimal":
-            return "#2ECC71"  # Verde
-        elif status == "acceptable":
-            return "#E67E22"  # Portocaliu
-        else:
-            return "#E74C3C"  # Roșu
+        return ZONE_COLORS.get(status, ZONE_COLORS['critical'])
     
     def get_parameter_unit(self, param):
         """Returnează unitatea pentru parametru"""
@@ -3031,7 +5580,7 @@ class VotingWindow:
                     # Salvează comentariul doar la primul parametru
                     saved_comment = comment if index == 0 else ""
                     
-                    cursor.execute("""
+                    db.execute("""
                         INSERT INTO votes (timestamp, parameter_name, vote_value, comment, user_id)
                         VALUES (?, ?, ?, ?, ?)
                     """, (timestamp, param, vote_value, saved_comment, self.user_id))
@@ -3051,7 +5600,7 @@ class VotingWindow:
                             vote_text = f"Voturi: {self.vote_counts[param]}/5"
                             self.vote_labels[param].config(text=vote_text)
 
-            conn.commit()
+            db.commit()
 
             # Resetează slider-ele și câmpul comentariu DOAR pentru parametrii activi
             for param in self.parameters:
@@ -3072,14 +5621,7 @@ class VotingWindow:
             return
             
         try:
-            cursor.execute("""
-                SELECT AVG(vote_value) FROM (
-                    SELECT vote_value FROM votes
-                    WHERE parameter_name = ? AND user_id = ?
-                    ORDER BY id DESC
-                    LIMIT 5
-                )
-            """, (param, self.user_id))
+            cursor = db.execute(SQL_MEDIE_VOTURI_RECENTE, (param, self.user_id))
             
             result = cursor.fetchone()
             if result and result[0] is not None:
@@ -3143,7 +5685,7 @@ class VotingWindow:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             message = f"{action}: Media={average:.2f}, Schimbare={change_amount:.2f} unități, Ținta={target_value:.1f}"
 
-            cursor.execute("""
+            db.execute("""
                 INSERT INTO feedback (timestamp, temperatura, lumina, umiditate, calitate_aer, zgomot, mesaj, user_id)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """, (
@@ -3156,7 +5698,7 @@ class VotingWindow:
                 message,
                 self.user_id
             ))
-            conn.commit()
+            db.commit()
             print(f"✅ Feedback salvat pentru {param} cu COINCIDENȚĂ EXACTĂ")
 
         except Exception as e:
@@ -3315,6 +5857,12 @@ class VotingWindow:
         self.window.destroy()
 # === SECȚIUNEA FINALĂ: EXECUȚIE PRINCIPALĂ ===
 if __name__ == "__main__":
+    # Comandă de întreținere: reconstruiește tabelele rollup pentru o bază de date existentă
+    if "--backfill-rollups" in sys.argv:
+        migreaza_epoch_sensor_data()
+        backfill_rollups()
+        sys.exit(0)
+    
     try:
         # === BANNER DE START ÎMBUNĂTĂȚIT ===
         print("=" * 80)
@@ -3428,9 +5976,15 @@ if __name__ == "__main__":
         
         # Verifică baza de date
         try:
-            cursor.execute("SELECT COUNT(*) FROM users")
+            cursor = db.execute("SELECT COUNT(*) FROM users")
             user_count = cursor.fetchone()[0]
             print(f"   ✅ Baza de date: {user_count} utilizatori înregistrați")
+            probleme = verifica_planuri_interogari()
+            if probleme:
+                for nume, pasi in probleme.items():
+                    print(f"   ⚠️ Interogarea {nume} nu folosește indexurile: {'; '.join(pasi)}")
+            else:
+                print(f"   ✅ Planuri de interogare: {len(INTEROGARI_INDEXATE)} interogări pe indexuri (fără scanări complete)")
         except Exception as e:
             print(f"   ❌ Eroare baza de date: {e}")
         
@@ -3520,6 +6074,9 @@ if __name__ == "__main__":
         # Înregistrează handler-ul pentru Ctrl+C înainte de a porni aplicația
         signal.signal(signal.SIGINT, signal_handler)
         
+        # Completează epoch-ul pentru datele vechi în fundal (istoricul rămâne disponibil)
+        start_epoch_migration()
+        
         # === PORNIREA APLICAȚIEI ===
         print("🎬 PORNIRE APLICAȚIE...")
         print("=" * 80)
@@ -3557,10 +6114,11 @@ if __name__ == "__main__":
         print("⏳ Se efectuează cleanup-ul...")
         
         try:
+            sensor_writer.stop()
             if RASPBERRY_PI:
                 GPIO.cleanup()
                 print("✅ GPIO cleanup realizat")
-            conn.close()
+            db.close_all()
             print("✅ Baza de date închisă")
         except Exception as e:
             print(f"⚠️ Eroare la cleanup: {e}")
@@ -3637,9 +6195,10 @@ if __name__ == "__main__":
                 except Exception as gpio_err:
                     print(f"⚠️ GPIO cleanup eșuat: {gpio_err}")
             
-            # Cleanup baza de date
+            # Cleanup baza de date (întâi citirile rămase în coada writer-ului)
             try:
-                conn.close()
+                sensor_writer.stop()
+                db.close_all()
                 print("✅ Conexiune bază de date închisă final")
             except Exception as db_err:
                 print(f"⚠️ BD cleanup eșuat: {db_err}")
@@ -0,0 +1,538 @@
+"""
+Suită de benchmark pentru căile critice ale aplicației - rulează fără Tk și fără hardware.
+
+Măsoară:
+  - conversiile tensiune → lux/AQI (scalar vs vectorizat, cu verificarea egalității)
+  - un ciclu de achiziție simulat (SensorManager._record_cycle)
+  - debitul de inserare în sensor_data prin SensorDataWriter (inclusiv rollup-urile)
+  - ChartsWindow.get_data_for_period pe baze de date cu 10k / 1M / 10M rânduri
+    (plus reîmprospătarea incrementală a cache-ului pe perioadă, get_series_for_period,
+    și statisticile perioadei, get_statistics - agregate SQL pe rollup pentru perioadele lungi)
+  - ChartsWindow.smooth_data / filtrele de netezire și decimarea LTTB / min-max
+  - construcția și randarea figurii graficului (ChartsWindow.build_figure) pe backend-ul Agg,
+    respectiv actualizarea pe loc a figurii persistente (ChartRenderer.update)
+  - planurile interogărilor pe voturi și feedback (INTEROGARI_INDEXATE) pe tabele din ce în ce mai mari:
+    EXPLAIN QUERY PLAN nu trebuie să conțină scanări complete - altfel rularea se termină cu eroare
+
+Rezultatele se scriu într-un fișier JSON; cu --comparare se raportează regresiile față de o rulare anterioară.
+Baza de date folosită este una temporară. Dacă FEEDBACK_DB_PATH e setată (ex: o bază creată cu
+generator_istoric.py), interogările se măsoară pe datele existente, iar secțiunile care scriu sunt sărite.
+
+Utilizare:
+    python benchmark_aplicatie.py [--dimensiuni 10000,1000000,10000000] [--doar conversii,interogari]
+                                  [--iesire benchmark_rezultate.json] [--comparare rulare_veche.json]
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime
+
+# Baza de date temporară și backend-ul Agg se setează ÎNAINTE de importul aplicației
+_TEMP_DIR = None
+if "FEEDBACK_DB_PATH" not in os.environ:
+    _TEMP_DIR = tempfile.mkdtemp(prefix="benchmark_aplicatie_")
+    os.environ["FEEDBACK_DB_PATH"] = os.path.join(_TEMP_DIR, "benchmark.db")
+
+import matplotlib
+matplotlib.use("Agg")
+# Fonturile implicite nu au emoji-urile din titluri - avertismentele ar acoperi rezultatele
+warnings.filterwarnings("ignore", message="Glyph .* missing from font")
+import matplotlib.pyplot as plt
+import numpy as np
+
+with contextlib.redirect_stdout(open(os.devnull, "w")):
+    import APLICATIA_FUNCTIONALA as app
+
+SECTIUNI = ['conversii', 'achizitie', 'inserare', 'interogari', 'netezire', 'decimare', 'grafic', 'planuri']
+PERIOADE = [1, 24, 168, -1]  # Ore; -1 = "Toate datele"
+NETEZIRE_TINTA_S = 0.001  # Fiecare filtru, fereastra implicită, 100k puncte (pe PC - nu pe Raspberry Pi)
+
+
+@contextlib.contextmanager
+def liniste():
+    """Suprimă mesajele aplicației (print-urile ar domina timpii măsurați)"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def cronometreaza(functie, repetari=3):
+    """Cel mai bun timp din câteva rulări (secunde) și rezultatul ultimei rulări"""
+    cel_mai_bun = float('inf')
+    rezultat = None
+    for _ in range(repetari):
+        start = time.perf_counter()
+        rezultat = functie()
+        cel_mai_bun = min(cel_mai_bun, time.perf_counter() - start)
+    return cel_mai_bun, rezultat
+
+
+# === CONVERSII ===
+def genereaza_tensiuni(n, seed=42):
+    """Tensiuni pe tot domeniul ADS1115 (inclusiv negative) + granițele exacte dintre segmente"""
+    rng = np.random.default_rng(seed)
+    granite = np.array([0.0, 0.05, 0.1, 0.3, 0.8, 1.0, 1.8, 2.5, 4.096])
+    tensiuni = rng.uniform(-4.096, 4.096, size=n)
+    return np.concatenate([granite, -granite, tensiuni])
+
+
+def benchmark_conversii(n=1_000_000, seed=42):
+    """Comparația scalar vs vectorizat pentru conversiile tensiune → lux/AQI"""
+    tensiuni = genereaza_tensiuni(n, seed)
+    variatii = np.random.default_rng(seed).integers(-12, 13, size=len(tensiuni))
+    lista_tensiuni = tensiuni.tolist()
+    lista_variatii = variatii.tolist()
+
+    t_lux_scalar, lux_scalar = cronometreaza(
+        lambda: [app.tensiune_la_lux(t) for t in lista_tensiuni], repetari=1)
+    t_lux_vect, lux_vect = cronometreaza(lambda: app.tensiune_la_lux_vect(tensiuni))
+
+    t_aqi_scalar, aqi_scalar = cronometreaza(
+        lambda: [app.tensiune_la_aqi(t, v) for t, v in zip(lista_tensiuni, lista_variatii)], repetari=1)
+    t_aqi_vect, aqi_vect = cronometreaza(lambda: app.tensiune_la_aqi_vect(tensiuni, variatii))
+
+    return {
+        'n': len(tensiuni),
+        'lux': {
+            'scalar_s': t_lux_scalar,
+            'vectorizat_s': t_lux_vect,
+            'identic': bool(np.array_equal(np.array(lux_scalar), lux_vect)),
+        },
+        'aqi': {
+            'scalar_s': t_aqi_scalar,
+            'vectorizat_s': t_aqi_vect,
+            'identic': bool(np.array_equal(np.array(aqi_scalar), aqi_vect)),
+        },
+    }
+
+
+# === ACHIZIȚIE ===
+def benchmark_achizitie(cicluri=2000):
+    """Durata unui ciclu de înregistrare (monitorizare + ventilatoare + buffer + coada writer-ului)"""
+    with liniste():
+        manager = app.SensorManager()
+        app.sensor_writer.start()
+        durate = []
+        for _ in range(cicluri):
+            start = time.perf_counter()
+            manager._record_cycle()
+            durate.append(time.perf_counter() - start)
+        app.sensor_writer.stop()
+    return {
+        'cicluri': cicluri,
+        'ciclu_median_s': statistics.median(durate),
+        'ciclu_p99_s': float(np.percentile(durate, 99)),
+    }
+
+
+# === INSERARE ===
+def benchmark_inserare(randuri=20000, loturi=(1, app.SENSOR_WRITER_BATCH_SIZE, 1000)):
+    """Debitul SensorDataWriter (executemany + actualizarea rollup-urilor) pentru diferite dimensiuni de lot"""
+    now = int(time.time())
+    rezultate = {}
+    for lot in loturi:
+        writer = app.SensorDataWriter(batch_size=lot, flush_interval=3600, max_queue=randuri + 1)
+        rows = [(datetime.fromtimestamp(now + i).strftime("%Y-%m-%d %H:%M:%S"), now + i,
+                 22.0 + (i % 10) / 10, 50.0, 400, 55, 45) for i in range(randuri)]
+        with liniste():
+            writer.start()
+            start = time.perf_counter()
+            for row in rows:
+                writer.submit(row)
+            writer.flush(timeout=600)
+            durata = time.perf_counter() - start
+            writer.stop()
+        rezultate[f'lot_{lot}'] = {'randuri': randuri, 'total_s': durata, 'randuri_pe_s': randuri / durata}
+    goleste_sensor_data()
+    return rezultate
+
+
+# === INTEROGĂRI ===
+def goleste_sensor_data():
+    """Șterge citirile și rollup-urile din baza temporară"""
+    app.db.execute("DELETE FROM sensor_data")
+    for _, table in app.ROLLUP_RESOLUTIONS:
+        app.db.execute(f"DELETE FROM {table}")
+    app.db.commit()
+
+
+def populeaza_sensor_data(de_la, pana_la, pas=2, bucata=500_000):
+    """Adaugă rândurile de_la..pana_la-1 (numărate înapoi de acum, la pas secunde) cu valori sinusoidale"""
+    acum = int(time.time())
+    sql = """
+        INSERT INTO sensor_data (timestamp, timestamp_epoch, temperatura, umiditate, lumina, calitate_aer, zgomot)
+        VALUES (datetime(?, 'unixepoch', 'localtime'), ?, ?, ?, ?, ?, 45)
+    """
+    rng = np.random.default_rng(de_la)
+    conn = app.db.connection()
+    for inceput in range(de_la, pana_la, bucata):
+        index = np.arange(inceput, min(inceput + bucata, pana_la))
+        epoch = acum - index * pas
+        faza = 2 * np.pi * (epoch % 86400) / 86400
+        temperatura = np.round(22 + 2 * np.sin(faza) + rng.normal(0, 0.2, len(index)), 1)
+        umiditate = np.round(50 + 8 * np.cos(faza) + rng.normal(0, 1, len(index)), 1)
+        lumina = np.clip(np.round(500 * np.sin(faza)), 0, None).astype(int)
+        aer = np.round(60 + 15 * np.sin(faza / 2)).astype(int)
+        with conn:
+            conn.executemany(sql, zip(epoch.tolist(), epoch.tolist(), temperatura.tolist(),
+                                      umiditate.tolist(), lumina.tolist(), aer.tolist()))
+
+
+def benchmark_interogari(dimensiuni, repetari=3):
+    """get_data_for_period pe baze de date din ce în ce mai mari (date brute + rollup-uri)"""
+    goleste_sensor_data()
+    charts = app.ChartsWindow.headless()
+    rezultate = {}
+    existente = 0
+    for dimensiune in sorted(dimensiuni):
+        start = time.perf_counter()
+        populeaza_sensor_data(existente, dimensiune)
+        populare = time.perf_counter() - start
+        existente = dimensiune
+
+        with liniste():
+            start = time.perf_counter()
+            app.backfill_rollups()
+            backfill = time.perf_counter() - start
+
+        rezultate[f'randuri_{dimensiune}'] = {
+            'populare_s': populare,
+            'backfill_rollup_s': backfill,
+            'perioade': masoara_perioade(charts, dimensiune, repetari),
+        }
+    return rezultate
+
+
+def benchmark_interogari_existente(repetari=3):
+    """get_data_for_period pe datele deja existente (bază externă, ex: generator_istoric.py) - doar citire"""
+    randuri = app.db.execute("SELECT COUNT(*) FROM sensor_data").fetchone()[0]
+    charts = app.ChartsWindow.headless()
+    return {f'randuri_{randuri}': {'perioade': masoara_perioade(charts, randuri, repetari)}}
+
+
+def masoara_perioade(charts, dimensiune, repetari):
+    perioade = {}
+    for ore in PERIOADE:
+        with liniste():
+            durata, randuri = cronometreaza(lambda: charts.get_data_for_period(ore), repetari)
+            rezolutie = randuri.resolution
+            # Cache-ul ferestrei: doar coada nouă (reîmprospătare) și schimbarea parametrului (fără BD)
+            charts._series_cache.clear()
+            charts.get_series_for_period(ore)
+            reimprospatare, _ = cronometreaza(lambda: charts.get_series_for_period(ore, refresh=True), repetari)
+            din_cache, serie = cronometreaza(lambda: charts.get_series_for_period(ore, refresh=False), repetari)
+            # Statisticile (agregate în SQLite pentru seriile din rollup), fără memorare
+            def statistici():
+                charts._stats_cache.clear()
+                return charts.get_statistics(ore, 'temperatura', serie)
+            durata_statistici, _ = cronometreaza(statistici, repetari)
+        perioade[f'ore_{ore}'] = {
+            'durata_s': durata,
+            'randuri': len(randuri),
+            'rezolutie_s': rezolutie,
+            'reimprospatare_cache_s': reimprospatare,
+            'din_cache_s': din_cache,
+            'statistici_s': durata_statistici,
+        }
+    print(f"   {dimensiune:>10,} rânduri: " + " | ".join(
+        f"{ore}h {p['durata_s'] * 1000:.1f} ms (cache {p['reimprospatare_cache_s'] * 1000:.1f} ms)"
+        for ore, p in zip(PERIOADE, perioade.values())))
+    return perioade
+
+
+# === NETEZIRE, DECIMARE ȘI GRAFIC ===
+def serie_test(n, seed=7):
+    """Serie de temperatură cu zgomot, la 2 secunde, terminată acum - array-uri ca ChartSeries.valid"""
+    rng = np.random.default_rng(seed)
+    valori = 22 + np.cumsum(rng.normal(0, 0.05, n))
+    epoci = int(time.time()) - 2 * np.arange(n, 0, -1)
+    return app.epoci_la_ora_locala(epoci), valori
+
+
+def benchmark_netezire(dimensiuni=(10_000, 100_000), fereastra=app.NETEZIRE_FEREASTRA_IMPLICITA):
+    """smooth_data (filtrul implicit) și fiecare filtru din FILTRE_NETEZIRE"""
+    charts = app.ChartsWindow.headless()
+    rezultate = {}
+    for n in dimensiuni:
+        _, valori = serie_test(n)
+        durata, _ = cronometreaza(lambda: charts.smooth_data(valori), repetari=1)
+        rezultate[f'puncte_{n}'] = {'durata_s': durata}
+        for filtru in app.FILTRE_NETEZIRE.values():
+            cheie = filtru.__name__.replace('netezire_', '') + '_s'
+            rezultate[f'puncte_{n}'][cheie], _ = cronometreaza(lambda: filtru(valori, fereastra))
+    return rezultate
+
+
+def benchmark_decimare(dimensiuni=(100_000, 1_000_000), puncte=1300):
+    """LTTB și min/max până la ~lățimea axelor în pixeli"""
+    rezultate = {}
+    for n in dimensiuni:
+        rng = np.random.default_rng(11)
+        x = np.arange(n, dtype=np.float64)
+        y = 22 + np.cumsum(rng.normal(0, 0.05, n))
+        lttb, indici_lttb = cronometreaza(lambda: app.decimeaza_lttb(x, y, puncte))
+        minmax, indici_minmax = cronometreaza(lambda: app.decimeaza_minmax(y, puncte))
+        rezultate[f'puncte_{n}'] = {
+            'lttb_s': lttb, 'minmax_s': minmax,
+            'puncte_lttb': len(indici_lttb), 'puncte_minmax': len(indici_minmax),
+        }
+    return rezultate
+
+
+def benchmark_grafic(dimensiuni=(1_000, 10_000)):
+    """Construcția figurii (build_figure), randarea ei pe Agg și actualizarea pe loc a figurii persistente"""
+    charts = app.ChartsWindow.headless()
+    info = charts.PARAM_INFO['temperatura']
+    rezultate = {}
+    for n in dimensiuni:
+        timestamps, valori = serie_test(n)
+        for tip in ("Linie", "Zonă umplută"):
+            def construieste():
+                return charts.build_figure(timestamps, valori, 'temperatura', "Benchmark", chart_type=tip)
+            constructie = float('inf')
+            randare = float('inf')
+            for _ in range(2):
+                start = time.perf_counter()
+                figure, *_ = construieste()
+                constructie = min(constructie, time.perf_counter() - start)
+                start = time.perf_counter()
+                figure.canvas.draw()
+                randare = min(randare, time.perf_counter() - start)
+                plt.close(figure)
+            
+            # Ca în ChartsWindow: aceeași figură, doar datele schimbate (+ randare)
+            renderer = app.ChartRenderer()
+            renderer.update(timestamps, valori, valori, info, 'temperatura', "Benchmark", chart_type=tip)
+            renderer.figure.canvas.draw()
+            alte_valori = valori + 0.5
+            def actualizeaza():
+                renderer.update(timestamps, alte_valori, alte_valori, info, 'temperatura', "Benchmark", chart_type=tip)
+                renderer.figure.canvas.draw()
+            actualizare, _ = cronometreaza(actualizeaza, 2)
+            
+            cheie = 'linie' if tip == "Linie" else 'zona'
+            rezultate[f'puncte_{n}_{cheie}'] = {'constructie_s': constructie, 'randare_s': randare,
+                                                'actualizare_s': actualizare}
+    return rezultate
+
+
+# === PLANURI DE INTEROGARE (VOTURI / FEEDBACK) ===
+UTILIZATORI_TEST = 50
+
+
+def populeaza_voturi_feedback(de_la, pana_la, bucata=200_000):
+    """Adaugă pana_la - de_la voturi și tot atâtea mesaje de feedback (5% din voturi au comentariu,
+    un sfert din feedback e anonim - user_id NULL)"""
+    conn = app.db.connection()
+    with conn:
+        conn.executemany("INSERT OR IGNORE INTO users (username, password) VALUES (?, '')",
+                         [(f"benchmark_{i}",) for i in range(1, UTILIZATORI_TEST + 1)])
+    rng = np.random.default_rng(de_la)
+    for inceput in range(de_la, pana_la, bucata):
+        n = min(bucata, pana_la - inceput)
+        parametri = rng.choice(app.ROLLUP_PARAMS, n).tolist()
+        utilizatori = rng.integers(1, UTILIZATORI_TEST + 1, n).tolist()
+        valori = rng.integers(-3, 4, n).tolist()
+        comentarii = np.where(rng.random(n) < 0.05, "comentariu", "").tolist()
+        anonim = rng.random(n) < 0.25
+        with conn:
+            conn.executemany("""
+                INSERT INTO votes (timestamp, parameter_name, vote_value, comment, user_id)
+                VALUES (datetime('now'), ?, ?, ?, ?)
+            """, zip(parametri, valori, comentarii, utilizatori))
+            conn.executemany("""
+                INSERT INTO feedback (timestamp, temperatura, lumina, umiditate, calitate_aer, zgomot, mesaj, user_id)
+                VALUES (datetime('now'), 22, 500, 50, 60, 45, 'feedback', ?)
+            """, ((None if a else u,) for a, u in zip(anonim.tolist(), utilizatori)))
+
+
+def masoara_planuri(repetari=3):
+    """Pașii problematici din planuri (după ANALYZE - planificatorul decide pe statistici) și timpii interogărilor"""
+    app.db.execute("ANALYZE")
+    probleme = app.verifica_planuri_interogari()
+    rezultate = {'scanari_complete': probleme}
+    for nume, (sql, parametri) in app.INTEROGARI_INDEXATE.items():
+        rezultate[f'{nume}_s'], _ = cronometreaza(lambda: app.db.execute(sql, parametri).fetchall(), repetari)
+    return rezultate
+
+
+def benchmark_planuri(dimensiuni=(1_000, 100_000, 1_000_000)):
+    """INTEROGARI_INDEXATE pe tabele votes/feedback din ce în ce mai mari - timpii trebuie să rămână constanți"""
+    rezultate = {}
+    existente = 0
+    for dimensiune in sorted(dimensiuni):
+        populeaza_voturi_feedback(existente, dimensiune)
+        existente = dimensiune
+        rezultate[f'randuri_{dimensiune}'] = masoara_planuri()
+    return rezultate
+
+
+def benchmark_planuri_existente():
+    """Doar planurile pe baza externă (EXPLAIN QUERY PLAN nu modifică datele; fără ANALYZE)"""
+    randuri = app.db.execute("SELECT COUNT(*) FROM votes").fetchone()[0]
+    return {f'randuri_{randuri}': {'scanari_complete': app.verifica_planuri_interogari()}}
+
+
+# === RAPORTARE ===
+def metrici_plate(rezultate, prefix=""):
+    """Toate timpii (chei terminate în _s) ca dicționar plat cale -> secunde"""
+    metrici = {}
+    for cheie, valoare in rezultate.items():
+        cale = f"{prefix}.{cheie}" if prefix else cheie
+        if isinstance(valoare, dict):
+            metrici.update(metrici_plate(valoare, cale))
+        elif cheie.endswith('_s') and isinstance(valoare, (int, float)):
+            metrici[cale] = valoare
+    return metrici
+
+
+def compara(rezultate, fisier_vechi, prag):
+    """Afișează diferențele față de o rulare anterioară; returnează numărul de regresii peste prag"""
+    with open(fisier_vechi, encoding="utf-8") as f:
+        vechi = metrici_plate(json.load(f)['rezultate'])
+    noi = metrici_plate(rezultate)
+    regresii = 0
+    print(f"\n📈 Comparație cu {fisier_vechi} (prag {prag:.0%}):")
+    for cale in sorted(set(vechi) & set(noi)):
+        if vechi[cale] <= 0:
+            continue
+        raport = noi[cale] / vechi[cale]
+        if raport > 1 + prag:
+            regresii += 1
+            print(f"  ❌ {cale}: {vechi[cale] * 1000:.2f} → {noi[cale] * 1000:.2f} ms (x{raport:.2f})")
+        elif raport < 1 - prag:
+            print(f"  ✅ {cale}: {vechi[cale] * 1000:.2f} → {noi[cale] * 1000:.2f} ms (x{raport:.2f})")
+    print(f"  {regresii} regresii din {len(set(vechi) & set(noi))} metrici comune")
+    return regresii
+
+
+def afiseaza_conversii(rezultate):
+    print(f"   {rezultate['n']:,} tensiuni")
+    for nume in ('lux', 'aqi'):
+        r = rezultate[nume]
+        accelerare = r['scalar_s'] / r['vectorizat_s'] if r['vectorizat_s'] else float('inf')
+        status = "✅ identice" if r['identic'] else "❌ DIFERITE"
+        print(f"   {nume:4s} scalar: {r['scalar_s'] * 1000:9.1f} ms | vectorizat: {r['vectorizat_s'] * 1000:7.1f} ms"
+              f" | x{accelerare:.0f} | {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark headless pentru APLICATIA_FUNCTIONALA")
+    parser.add_argument("--dimensiuni", default="10000,1000000,10000000",
+                        help="Numărul de rânduri sensor_data pentru interogări (listă separată prin virgulă)")
+    parser.add_argument("--conversii", type=int, default=1_000_000, help="Numărul de tensiuni convertite")
+    parser.add_argument("--doar", default=",".join(SECTIUNI), help=f"Secțiunile rulate: {', '.join(SECTIUNI)}")
+    parser.add_argument("--iesire", default="benchmark_rezultate.json", help="Fișierul JSON cu rezultatele")
+    parser.add_argument("--comparare", help="Rezultatele unei rulări anterioare (JSON) pentru detectarea regresiilor")
+    parser.add_argument("--prag", type=float, default=0.25, help="Încetinirea relativă raportată ca regresie")
+    args = parser.parse_args()
+
+    sectiuni = [s.strip() for s in args.doar.split(",") if s.strip()]
+    necunoscute = set(sectiuni) - set(SECTIUNI)
+    if necunoscute:
+        parser.error(f"secțiuni necunoscute: {', '.join(sorted(necunoscute))}")
+
+    # O bază de date primită prin FEEDBACK_DB_PATH nu se modifică: doar secțiunile care citesc
+    baza_externa = _TEMP_DIR is None
+    if baza_externa:
+        sarite = [s for s in ('achizitie', 'inserare') if s in sectiuni]
+        if sarite:
+            print(f"⏭️ Bază de date externă - sar peste secțiunile care scriu: {', '.join(sarite)}")
+        sectiuni = [s for s in sectiuni if s not in sarite]
+
+    print(f"🧪 Benchmark pe {app.DB_PATH}")
+    rezultate = {}
+    erori = 0
+    try:
+        if 'conversii' in sectiuni:
+            print("🔢 Conversii tensiune → lux/AQI...")
+            rezultate['conversii'] = benchmark_conversii(args.conversii)
+            afiseaza_conversii(rezultate['conversii'])
+            if not (rezultate['conversii']['lux']['identic'] and rezultate['conversii']['aqi']['identic']):
+                erori += 1
+        if 'achizitie' in sectiuni:
+            print("🔄 Ciclu de achiziție simulat...")
+            rezultate['achizitie'] = benchmark_achizitie()
+            print(f"   median {rezultate['achizitie']['ciclu_median_s'] * 1e6:.0f} µs / ciclu")
+        if 'inserare' in sectiuni:
+            print("💾 Debit de inserare sensor_data...")
+            rezultate['inserare'] = benchmark_inserare()
+            for lot, r in rezultate['inserare'].items():
+                print(f"   {lot}: {r['randuri_pe_s']:,.0f} rânduri/s")
+        if 'interogari' in sectiuni:
+            print("🔍 get_data_for_period...")
+            if baza_externa:
+                rezultate['interogari'] = benchmark_interogari_existente()
+            else:
+                dimensiuni = [int(d) for d in args.dimensiuni.split(",") if d.strip()]
+                rezultate['interogari'] = benchmark_interogari(dimensiuni)
+        if 'netezire' in sectiuni:
+            print("〰️ smooth_data...")
+            rezultate['netezire'] = benchmark_netezire()
+            for cheie, r in rezultate['netezire'].items():
+                print(f"   {cheie}: smooth_data {r['durata_s'] * 1000:.2f} ms | " + " | ".join(
+                    f"{nume[:-2]} {durata * 1000:.2f} ms" for nume, durata in r.items() if nume != 'durata_s'))
+            lente = [nume[:-2] for nume, durata in rezultate['netezire'].get('puncte_100000', {}).items()
+                     if nume != 'durata_s' and durata > NETEZIRE_TINTA_S]
+            if lente:
+                print(f"   ⚠️ Peste {NETEZIRE_TINTA_S * 1000:.0f} ms la 100k puncte: {', '.join(lente)}")
+        if 'decimare' in sectiuni:
+            print("🔻 Decimare (LTTB / min-max)...")
+            rezultate['decimare'] = benchmark_decimare()
+            for cheie, r in rezultate['decimare'].items():
+                print(f"   {cheie}: LTTB {r['lttb_s'] * 1000:.1f} ms → {r['puncte_lttb']} puncte | "
+                      f"min/max {r['minmax_s'] * 1000:.1f} ms → {r['puncte_minmax']} puncte")
+        if 'grafic' in sectiuni:
+            print("📈 Construcția graficului (Agg)...")
+            rezultate['grafic'] = benchmark_grafic()
+            for cheie, r in rezultate['grafic'].items():
+                print(f"   {cheie}: construcție {r['constructie_s'] * 1000:.0f} ms | randare {r['randare_s'] * 1000:.0f} ms"
+                      f" | actualizare pe loc {r['actualizare_s'] * 1000:.0f} ms")
+        if 'planuri' in sectiuni:
+            print("🗂️ Planuri de interogare pe voturi și feedback...")
+            rezultate['planuri'] = benchmark_planuri_existente() if baza_externa else benchmark_planuri()
+            for cheie, r in rezultate['planuri'].items():
+                timpi = " | ".join(f"{nume[:-2]} {durata * 1000:.2f} ms" for nume, durata in r.items()
+                                   if nume.endswith('_s'))
+                if r['scanari_complete']:
+                    erori += 1
+                    for nume, pasi in r['scanari_complete'].items():
+                        print(f"   ❌ {cheie}: {nume} - {'; '.join(pasi)}")
+                else:
+                    print(f"   ✅ {cheie}: fără scanări complete" + (f" | {timpi}" if timpi else ""))
+    finally:
+        app.db.close_all()
+        if _TEMP_DIR:
+            shutil.rmtree(_TEMP_DIR, ignore_errors=True)
+
+    raport = {
+        'meta': {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'matplotlib': matplotlib.__version__,
+            'sqlite': sqlite3.sqlite_version,
+            'platforma': platform.platform(),
+            'procesoare': os.cpu_count(),
+        },
+        'rezultate': rezultate,
+    }
+    with open(args.iesire, "w", encoding="utf-8") as f:
+        json.dump(raport, f, indent=2, ensure_ascii=False)
+    print(f"\n✅ Rezultate salvate în {args.iesire}")
+
+    if args.comparare:
+        erori += compara(rezultate, args.comparare, args.prag)
+    sys.exit(1 if erori else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Generator de istoric sintetic pentru testarea schemei SQLite la scară reală.
+
+Umple o bază de date compatibilă cu feedback_birou.db (aceeași schemă, creată de
+APLICATIA_FUNCTIONALA.py) cu:
+  - sensor_data: ani de citiri la 2 secunde, cu tipare zilnice, săptămânale și sezoniere
+    (încălzire/ventilație în orele de program, lumină naturală + artificială, calitatea
+    aerului crescând cu ocuparea birourilor) și mici goluri (aplicație oprită)
+  - users: mii de utilizatori (parola "parola123")
+  - votes: sesiuni de vot în zilele lucrătoare, corelate cu valorile senzorilor, cu comentarii
+  - feedback: aplicarea mediilor de vot (cu user_id) și coincidențele atinse (user_id NULL)
+
+Zilele sunt generate în paralel (câte una per task, reproductibil pentru un seed dat) și
+scrise cu executemany în tranzacții mari; la final se reconstruiesc tabelele rollup.
+
+Utilizare:
+    python generator_istoric.py [--db feedback_birou_sintetic.db] [--ani 1] [--utilizatori 2000]
+"""
+import argparse
+import hashlib
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+PARAMETRI = ['temperatura', 'umiditate', 'lumina', 'calitate_aer']
+ZGOMOT_FIX = 45  # Zgomotul e dezactivat în aplicație - valoare fixă
+PAROLA_IMPLICITA = "parola123"
+
+COMENTARII = [
+    "Este prea frig dimineața",
+    "Aerul devine greu după prânz",
+    "Lumina de la geam bate direct în monitor",
+    "Mult mai bine decât săptămâna trecută",
+    "Umiditatea e prea scăzută, ne ustură ochii",
+    "Se poate aerisi mai des?",
+    "Temperatura e perfectă azi",
+    "Prea cald în sala de ședințe",
+    "Lumina e slabă după ora 17",
+    "Miroase a închis",
+    "Ventilația face zgomot",
+    "Totul e în regulă",
+]
+
+
+def _zgomot_filtrat(rng, n, sigma, span):
+    """Zgomot gaussian corelat în timp (filtru exponențial de lungime span eșantioane)"""
+    kernel = np.exp(-np.arange(span) / (span / 4))
+    kernel /= np.sqrt(np.sum(kernel ** 2))
+    alb = rng.normal(0, sigma, n + span - 1)
+    return np.convolve(alb, kernel, mode='valid')
+
+
+def _text_timestamp(epoch):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(epoch))
+
+
+def genereaza_zi(args):
+    """
+    Generează o zi de istoric (rulează în procesele pool-ului).
+    Returnează array-uri NumPy pentru sensor_data și liste de tuple pentru votes/feedback.
+    """
+    (index_zi, start_epoch, interval, seed, primul_user, n_utilizatori,
+     sesiuni_pe_zi, probabilitate_gol, intervale_optime) = args
+    rng = np.random.default_rng([seed, index_zi])
+
+    epoch = np.arange(start_epoch, start_epoch + 86400, interval, dtype=np.int64)
+    n = len(epoch)
+    gmtoff = time.localtime(start_epoch).tm_gmtoff
+    local = epoch + gmtoff
+    ora = (local % 86400) / 3600.0
+    zi_lucratoare = ((local // 86400 + 3) % 7) < 5  # 1970-01-01 a fost joi
+    ocupat = zi_lucratoare & (ora >= 8) & (ora < 18)
+
+    # Sezonul: -1 în ianuarie, +1 în iulie
+    sezon = -np.cos(2 * np.pi * (epoch % 31557600) / 31557600)
+
+    # Încălzirea/ventilația pornește și se oprește treptat (rampă de o oră)
+    rampa = max(1, 3600 // interval)
+    ocupare = np.convolve(ocupat.astype(float), np.ones(rampa) / rampa, mode='same')
+    # Aerul se încarcă lent cât timp biroul e ocupat (constantă de timp ~2 ore)
+    acumulare = np.convolve(ocupat.astype(float), np.exp(-np.arange(4 * rampa) / (2 * rampa)), mode='full')[:n]
+    acumulare /= np.sum(np.exp(-np.arange(4 * rampa) / (2 * rampa)))
+
+    span = max(2, 600 // interval)
+    temperatura = np.round(20.5 + 1.2 * sezon + 2.0 * ocupare + _zgomot_filtrat(rng, n, 0.3, span), 1)
+    umiditate = np.round(np.clip(47 + 7 * sezon - 4 * ocupare + _zgomot_filtrat(rng, n, 1.5, span), 20, 85), 1)
+    durata_zi = 12 + 3 * sezon
+    soare = np.clip(np.sin(np.pi * (ora - (12 - durata_zi / 2)) / durata_zi), 0, None)
+    lumina = np.rint(np.clip(260 * soare + 430 * ocupare + _zgomot_filtrat(rng, n, 15, span), 0, 2000)).astype(np.int64)
+    calitate_aer = np.rint(np.clip(35 + 75 * acumulare + _zgomot_filtrat(rng, n, 6, span), 0, 500)).astype(np.int64)
+
+    # Ocazional aplicația a fost oprită câteva ore
+    pastrat = np.ones(n, dtype=bool)
+    if rng.random() < probabilitate_gol:
+        inceput = rng.integers(0, n)
+        pastrat[inceput:inceput + rng.integers(3600, 6 * 3600) // interval] = False
+
+    senzori = {
+        'epoch': epoch[pastrat],
+        'temperatura': temperatura[pastrat],
+        'umiditate': umiditate[pastrat],
+        'lumina': lumina[pastrat],
+        'calitate_aer': calitate_aer[pastrat],
+    }
+
+    # Sesiuni de vot: doar în orele de program, când aplicația rula
+    voturi = []
+    feedback = []
+    candidati = np.flatnonzero(ocupat & pastrat)
+    if len(candidati) and n_utilizatori:
+        # Câțiva utilizatori votează mult, majoritatea rar (distribuție Zipf)
+        activitate = 1.0 / np.arange(1, n_utilizatori + 1) ** 0.8
+        activitate /= activitate.sum()
+        n_sesiuni = rng.poisson(sesiuni_pe_zi)
+        for i in np.sort(rng.choice(candidati, size=min(n_sesiuni, len(candidati)), replace=False)):
+            timestamp = _text_timestamp(int(epoch[i]))
+            user_id = primul_user + int(rng.choice(n_utilizatori, p=activitate))
+            valori = {p: senzori_p[i] for p, senzori_p in
+                      zip(PARAMETRI, (temperatura, umiditate, lumina, calitate_aer))}
+            comentariu = COMENTARII[rng.integers(len(COMENTARII))] if rng.random() < 0.12 else ""
+            medii = {}
+            for index, param in enumerate(PARAMETRI):
+                minim, maxim = intervale_optime[param]
+                # Vot negativ = valoare prea mică (ex: -3 = foarte frig), pozitiv = prea mare
+                abatere = (valori[param] - (minim + maxim) / 2) / ((maxim - minim) / 2)
+                vot = int(np.clip(np.rint(1.5 * abatere + rng.normal(0, 0.8)), -3, 3))
+                medii[param] = vot
+                voturi.append((timestamp, param, vot, comentariu if index == 0 else "", user_id))
+
+            valori_feedback = (float(valori['temperatura']), int(valori['lumina']), float(valori['umiditate']),
+                               int(valori['calitate_aer']), ZGOMOT_FIX)
+            if rng.random() < 0.2:
+                # Aplicarea mediei de vot (mesajul din VotingWindow.apply_parameter_change)
+                param = max(medii, key=lambda p: abs(medii[p]))
+                media = medii[param] + rng.normal(0, 0.4)
+                if media != 0:
+                    schimbare = abs(media)
+                    crestere = media < 0
+                    tinta = valori[param] + schimbare if crestere else valori[param] - schimbare
+                    actiune = f"{'Crește' if crestere else 'Scade'} {param}"
+                    mesaj = f"{actiune}: Media={media:.2f}, Schimbare={schimbare:.2f} unități, Ținta={tinta:.1f}"
+                    feedback.append((timestamp,) + valori_feedback + (mesaj, user_id))
+                    if rng.random() < 0.7:
+                        # Ținta atinsă mai târziu (mesajul din SensorManager, fără user_id)
+                        atins = _text_timestamp(int(epoch[i]) + int(rng.integers(300, 3600)))
+                        mesaj = f"Coincidență exactă atinsă pentru {param}: {tinta:.1f} (matching precis)"
+                        feedback.append((atins,) + valori_feedback + (mesaj, None))
+
+    return senzori, voturi, feedback
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generează istoric sintetic pentru feedback_birou.db")
+    parser.add_argument("--db", default="feedback_birou_sintetic.db", help="Fișierul bazei de date generate")
+    parser.add_argument("--suprascrie", action="store_true", help="Șterge baza de date dacă există deja")
+    parser.add_argument("--ani", type=float, default=1.0, help="Ani de istoric (1 an la 2s ≈ 15.8M rânduri)")
+    parser.add_argument("--interval", type=int, default=2, help="Secunde între citiri")
+    parser.add_argument("--utilizatori", type=int, default=2000, help="Numărul de utilizatori")
+    parser.add_argument("--sesiuni-pe-zi", type=float, default=300, help="Sesiuni de vot per zi lucrătoare (medie)")
+    parser.add_argument("--probabilitate-gol", type=float, default=0.02, help="Probabilitatea unei opriri într-o zi")
+    parser.add_argument("--tranzactie", type=int, default=1_000_000, help="Rânduri sensor_data per tranzacție")
+    parser.add_argument("--procese", type=int, default=None, help="Procese pentru generare (implicit: toate nucleele)")
+    parser.add_argument("--seed", type=int, default=2024)
+    args = parser.parse_args()
+
+    if os.path.exists(args.db):
+        if not args.suprascrie:
+            parser.error(f"{args.db} există deja - folosește --suprascrie sau alt --db")
+        for sufix in ("", "-wal", "-shm"):
+            if os.path.exists(args.db + sufix):
+                os.remove(args.db + sufix)
+
+    # Schema (inclusiv indexurile și tabelele rollup) vine chiar din aplicație
+    os.environ["FEEDBACK_DB_PATH"] = args.db
+    import APLICATIA_FUNCTIONALA as app
+
+    start = time.time()
+    conn = app.db.connection()
+    conn.execute("PRAGMA synchronous=OFF")  # Doar pe durata generării - fișierul e nou
+
+    # === UTILIZATORI ===
+    parola = hashlib.sha256(PAROLA_IMPLICITA.encode()).hexdigest()
+    with conn:
+        conn.executemany("INSERT INTO users (username, password) VALUES (?, ?)",
+                         ((f"utilizator{i:05d}", parola) for i in range(1, args.utilizatori + 1)))
+    primul_user = conn.execute("SELECT COALESCE(MIN(id), 0) FROM users").fetchone()[0]
+    print(f"👥 {args.utilizatori} utilizatori creați (parola: {PAROLA_IMPLICITA})")
+
+    # === ZILELE DE ISTORIC ===
+    zile = max(1, int(round(args.ani * 365)))
+    sfarsit = int(time.time()) // args.interval * args.interval  # Istoricul se termină acum
+    intervale_optime = {p: app.OPTIMAL_RANGES[p]['optimal'] for p in PARAMETRI}
+    taskuri = [(zi, sfarsit - (zile - zi) * 86400, args.interval, args.seed, primul_user, args.utilizatori,
+                args.sesiuni_pe_zi, args.probabilitate_gol, intervale_optime) for zi in range(zile)]
+    procese = args.procese or multiprocessing.cpu_count()
+    print(f"🔄 Generez {zile} zile (~{zile * 86400 // args.interval:,} citiri) pe {procese} procese...")
+
+    sql_senzori = """
+        INSERT INTO sensor_data (timestamp, timestamp_epoch, temperatura, umiditate, lumina, calitate_aer, zgomot)
+        VALUES (datetime(?, 'unixepoch', 'localtime'), ?, ?, ?, ?, ?, ?)
+    """
+    sql_voturi = "INSERT INTO votes (timestamp, parameter_name, vote_value, comment, user_id) VALUES (?, ?, ?, ?, ?)"
+    sql_feedback = """
+        INSERT INTO feedback (timestamp, temperatura, lumina, umiditate, calitate_aer, zgomot, mesaj, user_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    total = {'sensor_data': 0, 'votes': 0, 'feedback': 0}
+    in_tranzactie = 0
+    pool = multiprocessing.Pool(procese) if procese > 1 else None
+    try:
+        # imap păstrează ordinea zilelor - id-urile rămân cronologice
+        zile_generate = pool.imap(genereaza_zi, taskuri) if pool else map(genereaza_zi, taskuri)
+        conn.execute("BEGIN")
+        for index, (senzori, voturi, feedback) in enumerate(zile_generate, 1):
+            epoch = senzori['epoch'].tolist()
+            conn.executemany(sql_senzori, zip(epoch, epoch, senzori['temperatura'].tolist(),
+                                              senzori['umiditate'].tolist(), senzori['lumina'].tolist(),
+                                              senzori['calitate_aer'].tolist(), [ZGOMOT_FIX] * len(epoch)))
+            conn.executemany(sql_voturi, voturi)
+            conn.executemany(sql_feedback, feedback)
+            total['sensor_data'] += len(epoch)
+            total['votes'] += len(voturi)
+            total['feedback'] += len(feedback)
+
+            in_tranzactie += len(epoch)
+            if in_tranzactie >= args.tranzactie:
+                conn.execute("COMMIT")
+                conn.execute("BEGIN")
+                in_tranzactie = 0
+            if index % 10 == 0 or index == zile:
+                ritm = total['sensor_data'] / (time.time() - start)
+                print(f"   📅 {index}/{zile} zile | {total['sensor_data']:,} citiri | "
+                      f"{total['votes']:,} voturi | {ritm:,.0f} rânduri/s")
+        conn.execute("COMMIT")
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    conn.execute("PRAGMA synchronous=NORMAL")
+    print(f"✅ Date generate în {time.time() - start:.0f}s: " + ", ".join(f"{k}={v:,}" for k, v in total.items()))
+
+    # === ROLLUP-URI ===
+    app.backfill_rollups(app.db, processes=procese)
+    app.db.close_all()
+    print(f"🎉 Baza de date sintetică este gata: {args.db} ({os.path.getsize(args.db) / 1e6:,.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Verificare rapidă a planurilor de interogare pentru voturi și feedback - fără Tk și fără hardware.
+
+Creează o bază de date temporară, adaugă câteva mii de voturi și mesaje de feedback, rulează ANALYZE
+(planificatorul decide apoi pe statistici, ca pe o bază reală care a crescut) și verifică prin
+EXPLAIN QUERY PLAN că nicio interogare din INTEROGARI_INDEXATE nu face o scanare completă de tabel.
+Se termină cu codul 1 dacă un plan nu folosește indexurile. Timpii pe tabele mari (până la 1M rânduri)
+sunt măsurați separat: python benchmark_aplicatie.py --doar planuri
+
+Utilizare:
+    python verifica_planuri.py [--randuri 5000]
+"""
+import argparse
+import contextlib
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+# Baza de date temporară se setează ÎNAINTE de importul aplicației
+_TEMP_DIR = tempfile.mkdtemp(prefix="verifica_planuri_")
+os.environ["FEEDBACK_DB_PATH"] = os.path.join(_TEMP_DIR, "planuri.db")
+
+with contextlib.redirect_stdout(open(os.devnull, "w")):
+    import APLICATIA_FUNCTIONALA as app
+
+UTILIZATORI = 20
+
+
+def populeaza(randuri, seed=1):
+    """Voturi (5% cu comentariu) și feedback (un sfert anonim - user_id NULL) de la UTILIZATORI utilizatori"""
+    rng = random.Random(seed)
+    conn = app.db.connection()
+    with conn:
+        conn.executemany("INSERT OR IGNORE INTO users (username, password) VALUES (?, '')",
+                         [(f"planuri_{i}",) for i in range(1, UTILIZATORI + 1)])
+        conn.executemany("""
+            INSERT INTO votes (timestamp, parameter_name, vote_value, comment, user_id)
+            VALUES (datetime('now'), ?, ?, ?, ?)
+        """, [(rng.choice(app.ROLLUP_PARAMS), rng.randint(-3, 3),
+               "comentariu" if rng.random() < 0.05 else "", rng.randint(1, UTILIZATORI))
+              for _ in range(randuri)])
+        conn.executemany("""
+            INSERT INTO feedback (timestamp, temperatura, lumina, umiditate, calitate_aer, zgomot, mesaj, user_id)
+            VALUES (datetime('now'), 22, 500, 50, 60, 45, 'feedback', ?)
+        """, [(None if rng.random() < 0.25 else rng.randint(1, UTILIZATORI),) for _ in range(randuri)])
+
+
+def verifica(eticheta):
+    """Afișează rezultatul verificării; returnează numărul de interogări cu scanări complete"""
+    probleme = app.verifica_planuri_interogari()
+    for nume, pasi in probleme.items():
+        print(f"❌ {eticheta}: {nume} - {'; '.join(pasi)}")
+    if not probleme:
+        print(f"✅ {eticheta}: {len(app.INTEROGARI_INDEXATE)} interogări pe indexuri")
+    return len(probleme)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifică planurile interogărilor pe voturi și feedback")
+    parser.add_argument("--randuri", type=int, default=5000, help="Voturi și mesaje de feedback adăugate")
+    args = parser.parse_args()
+
+    erori = 0
+    try:
+        erori += verifica("tabele goale")
+        populeaza(args.randuri)
+        app.db.execute("ANALYZE")
+        erori += verifica(f"{args.randuri} rânduri după ANALYZE")
+    finally:
+        app.db.close_all()
+        shutil.rmtree(_TEMP_DIR, ignore_errors=True)
+    sys.exit(1 if erori else 0)
+
+
+if __name__ == "__main__":
+    main()
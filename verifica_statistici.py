@@ -0,0 +1,71 @@
+"""
+Verificare rapidă a estimatorului P² (P2Quantile) față de np.percentile - fără Tk și fără hardware.
+
+Până la 5 valori P² trebuie să dea exact np.percentile (interpolare liniară); de la a 6-a valoare
+markerii se ajustează și rezultatul devine o estimare, care trebuie să rămână între minim și maxim.
+Estimatorul e folosit de agregatul SQL P2_QUANTILE și de cuartilele statisticilor live
+(LiveWindowStats), deci și de ferestrele care au exact 5 citiri.
+Se termină cu codul 1 la prima abatere.
+
+Utilizare:
+    python verifica_statistici.py [--serii 200]
+"""
+import argparse
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+
+# Baza de date temporară se setează ÎNAINTE de importul aplicației (importul creează schema)
+_TEMP_DIR = tempfile.mkdtemp(prefix="verifica_statistici_")
+os.environ["FEEDBACK_DB_PATH"] = os.path.join(_TEMP_DIR, "statistici.db")
+
+import numpy as np
+
+with contextlib.redirect_stdout(open(os.devnull, "w")):
+    import APLICATIA_FUNCTIONALA as app
+
+CUANTILE = (0.0, 0.25, 0.5, 0.75, 1.0)
+
+
+def verifica_p2(serii, seed=0):
+    """Numărul de abateri pentru n = 1..6 valori (exact până la 5, între min și max la 6)"""
+    rng = np.random.default_rng(seed)
+    abateri = 0
+    for n in range(1, 7):
+        for _ in range(serii):
+            # Și valori întregi repetate (lumină / AQI), nu doar valori distincte
+            valori = rng.normal(22, 2, n) if rng.random() < 0.5 else rng.integers(0, 5, n).astype(float)
+            for p in CUANTILE:
+                estimator = app.P2Quantile(p)
+                for valoare in valori:
+                    estimator.add(valoare)
+                if n <= 5:
+                    corect = np.isclose(estimator.value, np.percentile(valori, p * 100))
+                else:
+                    corect = valori.min() <= estimator.value <= valori.max()
+                if not corect:
+                    abateri += 1
+                    print(f"❌ n={n} p={p}: P² {estimator.value} | np.percentile "
+                          f"{np.percentile(valori, p * 100)} | valori {valori.tolist()}")
+    return abateri
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifică estimatorul P² față de np.percentile")
+    parser.add_argument("--serii", type=int, default=200, help="Serii aleatoare pentru fiecare n")
+    args = parser.parse_args()
+
+    try:
+        abateri = verifica_p2(args.serii)
+    finally:
+        app.db.close_all()
+        shutil.rmtree(_TEMP_DIR, ignore_errors=True)
+    if not abateri:
+        print(f"✅ P²: exact pentru n ≤ 5, în [min, max] pentru n = 6 ({args.serii} serii × {len(CUANTILE)} cuantile)")
+    sys.exit(1 if abateri else 0)
+
+
+if __name__ == "__main__":
+    main()